@@ -0,0 +1,82 @@
+"""Mede o custo de arranque (tempo e memória) de um worker.
+
+Cada medição roda num processo Python novo, para capturar o custo real de
+importação a frio. Uso:
+
+    python benchmarks/arranque_worker.py --repeticoes 10
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Código executado no processo filho: importa o alvo e reporta tempo e pico de RSS
+_SONDA = """
+import json, sys, time
+t0 = time.perf_counter()
+{importacao}
+importacao = time.perf_counter() - t0
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+except ImportError:
+    rss_kb = None
+print(json.dumps({{
+    "importacao_s": importacao,
+    "rss_mb": rss_kb / 1024 if rss_kb else None,
+    "graficos_carregados": any(m in sys.modules for m in ("matplotlib", "plotly")),
+}}))
+"""
+
+CENARIOS = {
+    "worker (cli)": "import distributed_aco.cli",
+    "cli + gráficos": "import distributed_aco.cli, distributed_aco.plotting as p; p._pyplot(); p._plotly()",
+}
+
+
+def medir(importacao: str) -> dict:
+    inicio = time.perf_counter()
+    saida = subprocess.run([sys.executable, "-c", _SONDA.format(importacao=importacao)],
+                           cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+    dados = json.loads(saida.strip().splitlines()[-1])
+    dados["processo_s"] = time.perf_counter() - inicio
+    return dados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    resultado = {}
+    for nome, importacao in CENARIOS.items():
+        amostras = [medir(importacao) for _ in range(args.repeticoes)]
+        rss = [a["rss_mb"] for a in amostras if a["rss_mb"] is not None]
+        resultado[nome] = {
+            "importacao_s": statistics.median(a["importacao_s"] for a in amostras),
+            "processo_s": statistics.median(a["processo_s"] for a in amostras),
+            "rss_mb": statistics.median(rss) if rss else None,
+            "graficos_carregados": amostras[0]["graficos_carregados"],
+        }
+
+    if args.json:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+        return
+    print(f"{'cenário':<16} {'importação':>11} {'processo':>10} {'pico RSS':>10}  gráficos")
+    for nome, r in resultado.items():
+        rss = f"{r['rss_mb']:.1f} MB" if r["rss_mb"] is not None else "n/d"
+        print(f"{nome:<16} {r['importacao_s'] * 1000:>9.0f}ms {r['processo_s'] * 1000:>8.0f}ms "
+              f"{rss:>10}  {'sim' if r['graficos_carregados'] else 'não'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compara os backends do laço quente do ACO (python, numpy, numba).
+
+Mede o tempo médio de uma iteração do ``ACOEngine`` em instâncias
+aleatórias e confere que todos os backends chegam à mesma matriz de
+feromônio. Uso:
+
+    python benchmarks/kernels.py --cidades 100 500 --iteracoes 5 --busca-local
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distributed_aco.core.aco_engine import ACOEngine  # noqa: E402
+from distributed_aco.core.cidade import Cidade  # noqa: E402
+from distributed_aco.core.kernels import BACKENDS, NUMBA_DISPONIVEL  # noqa: E402
+
+
+def medir(cidades, backend: str, iteracoes: int, formigas: int, busca_local: bool) -> dict:
+    engine = ACOEngine("bench", cidades, formigas, seed=0, backend=backend, busca_local=busca_local)
+    engine.executar_iteracao()  # aquecimento (compilação do Numba)
+    inicio = time.perf_counter()
+    for _ in range(iteracoes):
+        engine.executar_iteracao(incluir_feromonios=False)
+    return {"iteracao_s": (time.perf_counter() - inicio) / iteracoes,
+            "melhor": engine.melhor_distancia, "feromonios": engine.feromonios}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cidades", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--formigas", type=int, default=20)
+    parser.add_argument("--iteracoes", type=int, default=3)
+    parser.add_argument("--busca-local", action="store_true", help="aplica 2-opt a cada rota")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    backends = [b for b in BACKENDS if b != "numba" or NUMBA_DISPONIVEL]
+    rng = np.random.default_rng(0)
+    resultado = {}
+    for n in args.cidades:
+        cidades = [Cidade(i, x, y) for i, (x, y) in enumerate(rng.random((n, 2)) * 1000)]
+        medidas = {b: medir(cidades, b, args.iteracoes, args.formigas, args.busca_local) for b in backends}
+        ref = medidas["python"]
+        resultado[n] = {b: {"iteracao_s": m["iteracao_s"],
+                            "aceleracao": ref["iteracao_s"] / m["iteracao_s"],
+                            "identico": bool(np.array_equal(m["feromonios"], ref["feromonios"]))}
+                        for b, m in medidas.items()}
+
+    if args.json:
+        print(json.dumps(resultado, indent=2))
+        return
+    print(f"{'cidades':>7} {'backend':<8} {'iteração':>10} {'aceleração':>11}  idêntico")
+    for n, medidas in resultado.items():
+        for b, m in medidas.items():
+            print(f"{n:>7} {b:<8} {m['iteracao_s'] * 1000:>8.1f}ms {m['aceleracao']:>10.1f}x  "
+                  f"{'sim' if m['identico'] else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compara o lote vetorizado com um ``ACOEngine`` por instância.
+
+Gera muitas instâncias pequenas aleatórias (uma rota por veículo) e mede o
+tempo total e a distância média de cada abordagem. Uso:
+
+    python benchmarks/lote.py --instancias 500 --min 10 --max 50 --iteracoes 30
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distributed_aco.core.aco_engine import ACOEngine  # noqa: E402
+from distributed_aco.core.cidade import Cidade  # noqa: E402
+from distributed_aco.core.lote import resolver_lote  # noqa: E402
+
+
+def por_instancia(instancias, backend: str, iteracoes: int, formigas: int) -> list:
+    distancias = []
+    for k, cidades in enumerate(instancias):
+        engine = ACOEngine("bench", cidades, formigas, seed=k, backend=backend)
+        for _ in range(iteracoes):
+            engine.executar_iteracao(incluir_feromonios=False)
+        distancias.append(engine.melhor_distancia)
+    return distancias
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instancias", type=int, default=200)
+    parser.add_argument("--min", type=int, default=10, help="menor instância (cidades)")
+    parser.add_argument("--max", type=int, default=50, help="maior instância (cidades)")
+    parser.add_argument("--formigas", type=int, default=20)
+    parser.add_argument("--iteracoes", type=int, default=30)
+    parser.add_argument("--backends", nargs="+", default=["numpy"],
+                        help="backends do ACOEngine usados como referência")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    instancias = [[Cidade(i, x, y) for i, (x, y) in
+                   enumerate(rng.random((int(rng.integers(args.min, args.max + 1)), 2)) * 100)]
+                  for _ in range(args.instancias)]
+
+    medidas = {}
+    inicio = time.perf_counter()
+    lote = [d for _, d in resolver_lote(instancias, args.iteracoes, args.formigas, seed=0)]
+    medidas["lote"] = (time.perf_counter() - inicio, lote)
+    for backend in args.backends:
+        inicio = time.perf_counter()
+        distancias = por_instancia(instancias, backend, args.iteracoes, args.formigas)
+        medidas[f"engine/{backend}"] = (time.perf_counter() - inicio, distancias)
+
+    tempo_lote = medidas["lote"][0]
+    resultado = {nome: {"tempo_s": t, "por_instancia_ms": 1000 * t / args.instancias,
+                        "distancia_media": float(np.mean(d)), "lote_mais_rapido": t / tempo_lote}
+                 for nome, (t, d) in medidas.items()}
+    if args.json:
+        print(json.dumps(resultado, indent=2))
+        return
+    print(f"{'abordagem':<14} {'total':>8} {'por inst.':>10} {'dist. média':>12} {'lote é':>8}")
+    for nome, r in resultado.items():
+        print(f"{nome:<14} {r['tempo_s']:>7.2f}s {r['por_instancia_ms']:>8.1f}ms "
+              f"{r['distancia_media']:>12.1f} {r['lote_mais_rapido']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
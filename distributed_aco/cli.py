@@ -1,27 +1,189 @@
-"""CLI: python -m distributed_aco.cli --mode coordenador|trabalhador ..."""
+"""CLI: python -m distributed_aco.cli --mode coordenador|trabalhador|sintonia|subcoordenador ..."""
 import argparse, sys, random, string
 
+from distributed_aco.core.aco_engine import PRECISOES
+from distributed_aco.core.convergencia import CriterioParada
+from distributed_aco.core.decomposicao import MODOS as MODOS_DECOMPOSICAO
+from distributed_aco.core.kernels import BACKENDS
+from distributed_aco.core.partida_quente import PartidaQuente
+from distributed_aco.core.tsplib import carregar_tsplib
 from distributed_aco.network.coordinator import Coordinator
+from distributed_aco.network.relay import Relay
+from distributed_aco.network.sharing import SharingPolicy
+from distributed_aco.network.topology import TOPOLOGIAS
+from distributed_aco.network.tuner import TuningCoordinator
 from distributed_aco.network.worker import Worker
+from distributed_aco.profiling import MODOS as MODOS_PERFIL, Perfilador, parse_janela
 
 def _rand_id(k=5):
     return "".join(random.choices(string.ascii_uppercase, k=k))
 
 def main():
     parser = argparse.ArgumentParser(description="Distributed ACO for TSP")
-    parser.add_argument("--mode", choices=["coordenador", "trabalhador"], required=True)
+    parser.add_argument("--mode", choices=["coordenador", "trabalhador", "sintonia", "subcoordenador"],
+                        required=True)
     parser.add_argument("--id", help="worker id (auto if omitted)")
     parser.add_argument("--host", default="localhost")
     parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--porta-local", type=int, default=8001,
+                        help="subcoordenador: porta onde os workers do grupo se conectam "
+                             "(--host/--port apontam para o nó superior)")
     parser.add_argument("--ants", type=int, default=20)
-    parser.add_argument("--iters", type=int, default=100)
+    parser.add_argument("--jobs-dir",
+                        help="coordenador: processa continuamente os jobs (*.json) deste diretório")
+    parser.add_argument("--instancia",
+                        help="coordenador: arquivo TSPLIB (.tsp) a resolver no lugar do exemplo embutido")
+    parser.add_argument("--iters", type=int, default=100,
+                        help="máximo de iterações (0 = sem limite, exige outro critério de parada)")
+    parser.add_argument("--precisao", choices=list(PRECISOES), default="float64",
+                        help="coordenador: precisão das matrizes nos workers e na rede "
+                             "(float32 usa metade da memória e da banda; inteira arredonda "
+                             "as distâncias como a TSPLIB)")
+    parser.add_argument("--busca-local", action="store_true",
+                        help="coordenador: os workers aplicam 2-opt à rota de cada formiga")
+    parser.add_argument("--backend", choices=BACKENDS, default="python",
+                        help="trabalhador: implementação do laço quente (numba cai para numpy "
+                             "se não estiver instalado)")
+    parser.add_argument("--threads", type=int, default=1,
+                        help="trabalhador: threads que constroem as formigas em paralelo "
+                             "(requer --backend numpy ou numba)")
+
+    hetero = parser.add_argument_group("workers heterogêneos")
+    hetero.add_argument("--sem-balanceamento", action="store_true",
+                        help="não redistribui formigas conforme a velocidade medida de cada worker")
+    hetero.add_argument("--diversificar", action="store_true",
+                        help="atribui alpha/beta diferentes a cada worker")
+
+    coop = parser.add_argument_group("cooperação entre workers")
+    coop.add_argument("--cooperacao", choices=["media", "ilhas"], default="media",
+                      help="media: média das matrizes de feromônio; ilhas: troca apenas rotas de elite")
+    coop.add_argument("--peso-feromonio", type=float, default=0.1,
+                      help="modo media: peso da matriz global misturada em cada worker")
+    coop.add_argument("--intervalo-feromonio", type=int, default=1,
+                      help="modo media: envia a matriz global a cada N iterações")
+    coop.add_argument("--sempre-enviar-feromonio", action="store_true",
+                      help="modo media: reenvia a matriz mesmo se ela não mudou")
+    coop.add_argument("--topologia", choices=TOPOLOGIAS, default="anel",
+                      help="topologia de migração do modo ilhas")
+    coop.add_argument("--vizinhos", type=int, default=2,
+                      help="vizinhos sorteados por migração na topologia aleatoria")
+    coop.add_argument("--intervalo-migracao", type=int, default=5,
+                      help="iterações entre migrações")
+    coop.add_argument("--elite", type=int, default=3,
+                      help="rotas de elite enviadas por migração")
+    coop.add_argument("--pipeline", type=int, default=0, metavar="N",
+                      help="coordenador: os workers iteram sem esperar a rodada, até N iterações "
+                           "à frente da última atualização global incorporada (0 = lock-step)")
+
+    quente = parser.add_argument_group("partida a quente (instâncias recorrentes)")
+    quente.add_argument("--rota-inicial",
+                        help="coordenador: rota anterior (resultado .json de um job ou lista de ids); "
+                             "cidades novas são inseridas e as removidas, descartadas")
+    quente.add_argument("--feromonios-iniciais",
+                        help="coordenador: snapshot .npz de feromônio de uma execução anterior")
+    quente.add_argument("--reforco-inicial", type=float, default=1.0,
+                        help="as arestas da rota inicial começam com (1 + R) vezes o feromônio")
+    quente.add_argument("--salvar-feromonios",
+                        help="coordenador: grava a matriz de feromônio final neste .npz")
+
+    decomp = parser.add_argument_group("decomposição espacial (instâncias muito grandes)")
+    decomp.add_argument("--decomposicao", choices=MODOS_DECOMPOSICAO,
+                        help="divide as cidades em grupos (grade ou kmeans), resolve cada grupo "
+                             "num worker e costura as sub-rotas")
+    decomp.add_argument("--tamanho-cluster", type=int, default=200,
+                        help="cidades por grupo (aproximado)")
+    decomp.add_argument("--iters-cluster", type=int, default=50,
+                        help="iterações do ACO em cada grupo")
+
+    parada = parser.add_argument_group("critérios de parada antecipada")
+    parada.add_argument("--paciencia", type=int,
+                        help="para após N iterações sem melhora do melhor global")
+    parada.add_argument("--alvo", type=float,
+                        help="para ao atingir uma rota deste comprimento ou menor")
+    parada.add_argument("--tempo-max", type=float,
+                        help="orçamento de tempo de parede em segundos")
+    parada.add_argument("--ramificacao-min", type=float,
+                        help="para quando o fator de ramificação λ do feromônio cair a este valor (ex.: 2.0)")
+
+    sintonia = parser.add_argument_group("modo sintonia")
+    sintonia.add_argument("--instancias",
+                          help="diretório de instâncias (.tsp/.json); cada subdiretório é uma classe")
+    sintonia.add_argument("--configs", type=int, default=20,
+                          help="número de configurações sorteadas")
+    sintonia.add_argument("--orcamento", type=int, default=50,
+                          help="iterações do ACO por avaliação")
+    sintonia.add_argument("--repeticoes", type=int, default=1,
+                          help="avaliações de cada instância (com sementes diferentes)")
+    sintonia.add_argument("--busca", choices=["corrida", "aleatoria"], default="corrida",
+                          help="corrida elimina configurações ruins cedo; aleatoria avalia todas")
+    sintonia.add_argument("--saida", default="sintonia.json",
+                          help="arquivo com a melhor configuração por classe")
+    sintonia.add_argument("--seed", type=int)
+
+    perfil = parser.add_argument_group("perfilamento")
+    perfil.add_argument("--profile", action="store_true",
+                        help="executa o nó sob um perfilador e grava o resultado ao sair")
+    perfil.add_argument("--profile-mode", choices=MODOS_PERFIL, default="cprofile",
+                        help="cprofile (.pstats) ou amostragem (.collapsed)")
+    perfil.add_argument("--profile-dir", default=".",
+                        help="diretório de saída dos perfis")
+    perfil.add_argument("--profile-iters", metavar="INI:FIM",
+                        help="perfila apenas as iterações INI..FIM (ex.: 10:20)")
 
     args = parser.parse_args()
+    try:
+        janela_perfil = parse_janela(args.profile_iters)
+    except ValueError as e:
+        parser.error(f"--profile-iters: {e}")
     if args.mode == "coordenador":
-        Coordinator(port=args.port, max_iters=args.iters).start()
+        criterio = CriterioParada(paciencia=args.paciencia, alvo=args.alvo,
+                                  tempo_max=args.tempo_max, ramificacao_min=args.ramificacao_min)
+        if args.iters <= 0 and not criterio.ativo:
+            parser.error("--iters 0 requer --paciencia, --alvo, --tempo-max ou --ramificacao-min")
+        partida = None
+        if args.rota_inicial or args.feromonios_iniciais:
+            partida = PartidaQuente(args.rota_inicial, args.feromonios_iniciais, args.reforco_inicial)
+        node_id = "coordenador"
+        no = Coordinator(port=args.port, max_iters=args.iters, criterio=criterio,
+                         jobs_dir=args.jobs_dir, balancear=not args.sem_balanceamento,
+                         diversificar=args.diversificar, cooperacao=args.cooperacao,
+                         topologia=args.topologia, vizinhos=args.vizinhos,
+                         intervalo_migracao=args.intervalo_migracao, tamanho_elite=args.elite,
+                         compartilhamento=SharingPolicy(args.peso_feromonio, args.intervalo_feromonio,
+                                                        not args.sempre_enviar_feromonio),
+                         precisao=args.precisao, busca_local=args.busca_local,
+                         cidades=carregar_tsplib(args.instancia) if args.instancia else None,
+                         decomposicao=args.decomposicao, tamanho_cluster=args.tamanho_cluster,
+                         iters_cluster=args.iters_cluster, partida_quente=partida,
+                         salvar_feromonios=args.salvar_feromonios, pipeline=args.pipeline)
+        executar = no.start
+    elif args.mode == "sintonia":
+        if not args.instancias:
+            parser.error("--mode sintonia requer --instancias")
+        node_id = "coordenador"
+        no = TuningCoordinator(args.instancias, port=args.port, num_configs=args.configs,
+                               orcamento=args.orcamento, repeticoes=args.repeticoes,
+                               corrida=args.busca == "corrida", saida=args.saida, seed=args.seed)
+        executar = no.start
+    elif args.mode == "subcoordenador":
+        node_id = args.id or f"sub-{_rand_id()}"
+        no = Relay(node_id, host=args.host, port_superior=args.port, port=args.porta_local,
+                   balancear=not args.sem_balanceamento)
+        executar = no.start
+    else:
+        if args.threads > 1 and args.backend == "python":
+            parser.error("--threads > 1 requer --backend numpy ou numba")
+        node_id = args.id or _rand_id()
+        no = Worker(node_id, host=args.host, port=args.port, ants=args.ants, backend=args.backend,
+                    num_threads=args.threads)
+        executar = no.loop
+
+    if args.profile:
+        perfilador = Perfilador(node_id, modo=args.profile_mode, diretorio=args.profile_dir,
+                                janela=janela_perfil)
+        perfilador.executar(no, executar)
     else:
-        wid = args.id or _rand_id()
-        Worker(wid, host=args.host, port=args.port, ants=args.ants).loop()
+        executar()
 
 if __name__ == "__main__":
     main()
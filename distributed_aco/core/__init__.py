@@ -1,5 +1,6 @@
 from .cidade import Cidade
 from .formiga import Formiga
 from .aco_engine import ACOEngine
+from .convergencia import CriterioParada, fator_ramificacao
 
-__all__ = ["Cidade", "Formiga", "ACOEngine"]
+__all__ = ["Cidade", "Formiga", "ACOEngine", "CriterioParada", "fator_ramificacao"]
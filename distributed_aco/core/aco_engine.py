@@ -1,11 +1,24 @@
 from __future__ import annotations
-import random, math
-from typing import List, Dict
+import random, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 
 import numpy as np
 
 from .cidade import Cidade
 from .formiga import Formiga
+from .kernels import (KERNELS, calcular_pesos, comprimentos_numpy, dois_opt,
+                      escolher_indice, resolver_backend)
+from .partida_quente import reforcar_rota
+
+# precisão -> (dtype das distâncias, dtype de heurística e feromônio).
+# ``inteira`` arredonda as distâncias ao inteiro mais próximo, como a
+# função ``nint`` da TSPLIB (EUC_2D), e usa float32 nas demais matrizes.
+PRECISOES = {
+    "float64": (np.float64, np.float64),
+    "float32": (np.float32, np.float32),
+    "inteira": (np.int32, np.float32),
+}
 
 class ACOEngine:
     """Algoritmo de Colônia de Formigas (ACO) para TSP, autocontido.
@@ -21,7 +34,16 @@ class ACOEngine:
                  beta: float = 2.0,
                  rho: float = 0.1,
                  Q: float = 100.0,
-                 seed: int | None = None) -> None:
+                 seed: int | None = None,
+                 tamanho_elite: int = 3,
+                 precisao: str = "float64",
+                 backend: str = "python",
+                 busca_local: bool = False,
+                 num_threads: int = 1) -> None:
+        if precisao not in PRECISOES:
+            raise ValueError(f"Precisão desconhecida: {precisao!r} (use {', '.join(PRECISOES)})")
+        if num_threads > 1 and backend == "python":
+            raise ValueError("num_threads > 1 requer o backend numpy ou numba")
 
         self.node_id = node_id
         self.cidades = cidades
@@ -30,41 +52,73 @@ class ACOEngine:
 
         self.alpha, self.beta, self.rho, self.Q = alpha, beta, rho, Q
         self.rng = random.Random(seed)
+        self.precisao = precisao
+        # python (referência), numpy ou numba: ver distributed_aco.core.kernels
+        self.backend = resolver_backend(backend)
+        self.busca_local = busca_local
+        # Modo paralelo: a colônia é dividida em blocos fixos, um por thread,
+        # cada um com seu próprio gerador derivado de ``seed``. O resultado
+        # depende de (seed, num_threads), não da ordem de execução.
+        self.num_threads = max(1, num_threads)
+        self._pool = ThreadPoolExecutor(self.num_threads, thread_name_prefix=f"aco-{node_id}") \
+            if self.num_threads > 1 else None
+        self._rngs_blocos = [np.random.default_rng(s)
+                             for s in np.random.SeedSequence(seed).spawn(self.num_threads)]
+        tipo_real = PRECISOES[precisao][1]
 
         self.distancias = self._calcular_distancias()
         self.heuristica = np.divide(1.0, self.distancias,
-                                    out=np.zeros_like(self.distancias),
+                                    out=np.zeros(self.distancias.shape, dtype=tipo_real),
                                     where=self.distancias != 0)
-        self.feromonios = np.ones_like(self.distancias) * 0.1
+        self.feromonios = np.full(self.distancias.shape, 0.1, dtype=tipo_real)
 
         self.melhor_caminho: List[int] = []
         self.melhor_distancia: float = float("inf")
         self.iteracao_atual = 0
         self.historico_melhores: List[float] = []
+        # Melhores rotas distintas já vistas (distância, caminho), para migração
+        self.tamanho_elite = tamanho_elite
+        self.elite: List[Tuple[float, List[int]]] = []
 
     # -----------------------------------------------------------------
     def _calcular_distancias(self) -> np.ndarray:
-        dist = np.zeros((self.num_cidades, self.num_cidades))
-        for i in range(self.num_cidades):
-            for j in range(self.num_cidades):
-                if i != j:
-                    dist[i, j] = self.cidades[i].distancia_para(self.cidades[j])
-        return dist
+        xs = np.array([c.x for c in self.cidades], dtype=np.float64)
+        ys = np.array([c.y for c in self.cidades], dtype=np.float64)
+        dist = np.hypot(xs[:, None] - xs[None, :], ys[:, None] - ys[None, :])
+        if self.precisao == "inteira":
+            dist = np.floor(dist + 0.5)
+        return dist.astype(PRECISOES[self.precisao][0])
 
     # -----------------------------------------------------------------
-    def executar_iteracao(self) -> Dict:
-        formigas = [Formiga(i, self.rng.randrange(self.num_cidades))
-                    for i in range(self.num_formigas)]
+    def executar_iteracao(self, incluir_feromonios: bool = True) -> Dict:
+        inicio = time.perf_counter()
+        pesos = calcular_pesos(self.feromonios, self.heuristica, self.alpha, self.beta)
 
-        for ant in formigas:
-            self._construir_solucao(ant)
+        if self._pool is not None:
+            rotas, comprimentos = self._construir_em_paralelo(pesos)
+        elif self.backend == "python":
+            inicios = [self.rng.randrange(self.num_cidades) for _ in range(self.num_formigas)]
+            rotas, comprimentos = self._construir_rotas(inicios, pesos)
+        else:
+            inicios = [self.rng.randrange(self.num_cidades) for _ in range(self.num_formigas)]
+            # um sorteio por passo de cada formiga, na mesma ordem da referência
+            passos = self.num_cidades - 1
+            uniformes = np.array([self.rng.random() for _ in range(self.num_formigas * passos)])
+            construir = KERNELS[self.backend][0]
+            rotas, comprimentos = construir(pesos, self.distancias, np.array(inicios, dtype=np.int64),
+                                            uniformes.reshape(self.num_formigas, passos))
+        if self.busca_local:
+            rotas, comprimentos = self._aplicar_busca_local(rotas, comprimentos)
 
-        self._atualizar_feromonios(formigas)
+        self._atualizar_feromonios(rotas, comprimentos)
 
-        melhor_formiga = min(formigas, key=lambda f: f.distancia_total)
-        if melhor_formiga.distancia_total < self.melhor_distancia:
-            self.melhor_distancia = melhor_formiga.distancia_total
-            self.melhor_caminho = melhor_formiga.caminho[:-1]
+        if self.backend != "python":
+            rotas, comprimentos = rotas.tolist(), comprimentos.tolist()
+        idx = min(range(len(rotas)), key=comprimentos.__getitem__)
+        if comprimentos[idx] < self.melhor_distancia:
+            self.melhor_distancia = comprimentos[idx]
+            self.melhor_caminho = rotas[idx]
+        self._atualizar_elite(list(zip(comprimentos, rotas)))
 
         self.iteracao_atual += 1
         self.historico_melhores.append(self.melhor_distancia)
@@ -74,55 +128,192 @@ class ACOEngine:
             "iteracao": self.iteracao_atual,
             "melhor_distancia": self.melhor_distancia,
             "melhor_caminho": self.melhor_caminho,
-            "media_iteracao": sum(a.distancia_total for a in formigas) / len(formigas),
-            "feromonios": self.feromonios.tolist(),
+            "media_iteracao": sum(comprimentos) / len(comprimentos),
+            "feromonios": self.feromonios.copy() if incluir_feromonios else [],
+            "elite": [{"distancia": d, "caminho": c} for d, c in self.elite],
+            "num_formigas": self.num_formigas,
+            "tempo_iteracao": time.perf_counter() - inicio,
         }
 
     # -----------------------------------------------------------------
-    def _construir_solucao(self, ant: Formiga) -> None:
+    def _construir_rotas(self, inicios: List[int], pesos: np.ndarray) -> Tuple[List[List[int]], List[float]]:
+        """Backend de referência: uma ``Formiga`` por vez, passo a passo."""
+        formigas = [Formiga(i, c) for i, c in enumerate(inicios)]
+        for ant in formigas:
+            self._construir_solucao(ant, pesos)
+        return [f.caminho[:-1] for f in formigas], [f.distancia_total for f in formigas]
+
+    def _construir_em_paralelo(self, pesos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Constrói cada bloco da colônia numa thread e junta as rotas na ordem dos blocos.
+
+        Os kernels liberam a GIL (NumPy nas operações vetoriais, Numba com
+        ``nogil``), então os blocos rodam de fato em paralelo.
+        """
+        construir = KERNELS[self.backend][0]
+        n = self.num_cidades
+
+        def bloco(rng: np.random.Generator, m: int):
+            inicios = rng.integers(n, size=m, dtype=np.int64)
+            return construir(pesos, self.distancias, inicios, rng.random((m, n - 1)))
+
+        tamanhos = [len(b) for b in np.array_split(np.arange(self.num_formigas), self.num_threads)]
+        futuros = [self._pool.submit(bloco, rng, m)
+                   for rng, m in zip(self._rngs_blocos, tamanhos) if m]
+        partes = [f.result() for f in futuros]
+        return (np.concatenate([p[0] for p in partes]),
+                np.concatenate([p[1] for p in partes]))
+
+    def fechar(self) -> None:
+        """Encerra o pool de threads do modo paralelo (se houver)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _construir_solucao(self, ant: Formiga, pesos: np.ndarray | None = None) -> None:
         while len(ant.visitadas) < self.num_cidades:
-            nxt = self._selecionar_proxima_cidade(ant)
-            dist = self.distancias[ant.cidade_atual, nxt]
+            nxt = self._selecionar_proxima_cidade(ant, pesos)
+            # float(): o comprimento da rota é acumulado em precisão dupla
+            dist = float(self.distancias[ant.cidade_atual, nxt])
             ant.visitar(nxt, dist)
 
-        dist_retorno = self.distancias[ant.cidade_atual, ant.caminho[0]]
+        dist_retorno = float(self.distancias[ant.cidade_atual, ant.caminho[0]])
         ant.finalizar_tour(dist_retorno)
 
-    def _selecionar_proxima_cidade(self, ant: Formiga) -> int:
+    def _selecionar_proxima_cidade(self, ant: Formiga, pesos: np.ndarray | None = None) -> int:
         disponiveis = [i for i in range(self.num_cidades) if ant.pode_visitar(i)]
         if not disponiveis:
             return ant.caminho[0]
 
+        if pesos is None:
+            pesos = calcular_pesos(self.feromonios, self.heuristica, self.alpha, self.beta)
+        linha = pesos[ant.cidade_atual]
+        r = self.rng.random()
+
         probs = []
-        total = 0.0
+        total = linha.dtype.type(0)
         for j in disponiveis:
-            tau = self.feromonios[ant.cidade_atual, j]
-            eta = self.heuristica[ant.cidade_atual, j]
-            p = (tau ** self.alpha) * (eta ** self.beta)
+            p = linha[j]
             probs.append(p)
             total += p
 
         if total == 0:
-            return self.rng.choice(disponiveis)
+            return disponiveis[escolher_indice(r, len(disponiveis))]
 
+        # o sorteio é comparado no dtype dos pesos, como nos kernels
+        limiar = linha.dtype.type(r)
         probs = [p / total for p in probs]
-        r = self.rng.random()
-        cumul = 0.0
+        cumul = linha.dtype.type(0)
         for idx, p in enumerate(probs):
             cumul += p
-            if r <= cumul:
+            if limiar <= cumul:
                 return disponiveis[idx]
         return disponiveis[-1] # pragma: no cover
     # -----------------------------------------------------------------
-    def _atualizar_feromonios(self, formigas: List[Formiga]) -> None:
+    def _aplicar_busca_local(self, rotas, comprimentos):
+        """Aplica 2-opt à rota de cada formiga e recalcula os comprimentos."""
+        distancias = self.distancias.astype(np.float64, copy=False)
+        if self.backend == "python":
+            rotas = [dois_opt(r, distancias) for r in rotas]
+            return rotas, [self._comprimento(r) for r in rotas]
+        dois_opt_kernel = KERNELS[self.backend][2]
+        mapear = self._pool.map if self._pool is not None else map
+        rotas = np.array(list(mapear(lambda r: dois_opt_kernel(r, distancias), rotas)), dtype=np.int64)
+        return rotas, comprimentos_numpy(distancias, rotas)
+
+    def _comprimento(self, rota: List[int]) -> float:
+        total = 0.0
+        for i in range(len(rota)):
+            total += float(self.distancias[rota[i], rota[(i + 1) % len(rota)]])
+        return total
+
+    def _atualizar_feromonios(self, rotas, comprimentos) -> None:
+        if self.backend != "python":
+            depositar = KERNELS[self.backend][1]
+            depositar(self.feromonios, rotas, comprimentos, self.rho, self.Q)
+            return
         self.feromonios *= (1 - self.rho)
-        for ant in formigas:
-            delta = self.Q / ant.distancia_total
-            for i in range(len(ant.caminho) - 1):
-                a, b = ant.caminho[i], ant.caminho[i + 1]
+        for rota, comprimento in zip(rotas, comprimentos):
+            delta = self.Q / comprimento
+            for i in range(len(rota)):
+                a, b = rota[i], rota[(i + 1) % len(rota)]
                 self.feromonios[a, b] += delta
                 self.feromonios[b, a] += delta
 
+    # -----------------------------------------------------------------
+    def _atualizar_elite(self, candidatas: List[Tuple[float, List[int]]]) -> None:
+        vistas = set()
+        elite = []
+        for dist, caminho in sorted(self.elite + candidatas, key=lambda c: c[0]):
+            chave = tuple(caminho)
+            if chave in vistas:
+                continue
+            vistas.add(chave)
+            elite.append((dist, caminho))
+            if len(elite) == self.tamanho_elite:
+                break
+        self.elite = elite
+
+    def reforcar_rotas(self, rotas: List[Dict], peso: float = 1.0) -> None:
+        """Deposita feromônio nas arestas de rotas de elite vindas de outras ilhas.
+
+        Cada rota é ``{"distancia": d, "caminho": [...]}`` (caminho aberto).
+        Uma rota melhor que a local passa a ser a melhor rota do engine.
+        """
+        for rota in rotas:
+            caminho, dist = rota["caminho"], rota["distancia"]
+            if len(caminho) != self.num_cidades or dist <= 0:
+                continue
+            origem = np.asarray(caminho)
+            destino = np.roll(origem, -1)
+            delta = peso * self.Q / dist
+            self.feromonios[origem, destino] += delta
+            self.feromonios[destino, origem] += delta
+            if dist < self.melhor_distancia:
+                self.melhor_distancia = dist
+                self.melhor_caminho = list(caminho)
+        self._atualizar_elite([(r["distancia"], list(r["caminho"])) for r in rotas
+                               if len(r["caminho"]) == self.num_cidades])
+
+    def aquecer(self, caminho: List[int] | None = None, feromonios=None,
+                reforco: float = 1.0) -> None:
+        """Partida a quente (ver :mod:`.partida_quente`), antes da primeira iteração.
+
+        ``feromonios`` substitui a matriz inicial; ``caminho`` (índices, já
+        reparado) passa a ser a melhor rota e tem suas arestas reforçadas.
+        """
+        if feromonios is not None:
+            feromonios = np.asarray(feromonios)
+            if feromonios.shape != self.feromonios.shape:
+                raise ValueError(f"Matriz inicial {feromonios.shape} incompatível com {self.feromonios.shape}")
+            self.feromonios[...] = feromonios
+        if caminho is None:
+            return
+        caminho = [int(c) for c in caminho]
+        if sorted(caminho) != list(range(self.num_cidades)):
+            raise ValueError("A rota inicial deve visitar cada cidade exatamente uma vez")
+        reforcar_rota(self.feromonios, caminho, reforco)
+        self.melhor_caminho = caminho
+        self.melhor_distancia = self._comprimento(caminho)
+        self._atualizar_elite([(self.melhor_distancia, caminho)])
+
+    # -----------------------------------------------------------------
+    def ajustar_parametros(self, **params) -> None:
+        """Altera ``num_formigas``, ``alpha``, ``beta``, ``rho`` ou ``Q`` entre iterações."""
+        for nome, valor in params.items():
+            if nome not in ("num_formigas", "alpha", "beta", "rho", "Q"):
+                raise ValueError(f"Parâmetro desconhecido: {nome}")
+            setattr(self, nome, int(valor) if nome == "num_formigas" else float(valor))
+
     # -----------------------------------------------------------------
     def integrar_feromonio_externo(self, externo, peso: float = 0.1) -> None:
-        self.feromonios = (1 - peso) * self.feromonios + peso * externo
+        """Mistura ``externo`` à matriz local: ``(1 - peso) τ + peso τ_ext``.
+
+        Opera no próprio buffer de ``feromonios`` (sem alocar outra matriz n×n),
+        usando ``τ_ext + (1 - peso) (τ - τ_ext)``.
+        """
+        externo = np.asarray(externo, dtype=self.feromonios.dtype)
+        if externo.shape != self.feromonios.shape:
+            raise ValueError(f"Matriz externa {externo.shape} incompatível com {self.feromonios.shape}")
+        self.feromonios -= externo
+        self.feromonios *= (1 - peso)
+        self.feromonios += externo
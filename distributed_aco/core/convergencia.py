@@ -0,0 +1,89 @@
+"""Critérios de parada e medidas de convergência do ACO.
+
+Independente de rede: o coordenador consulta um :class:`CriterioParada`
+ao fim de cada iteração, mas a mesma lógica serve a um ``ACOEngine`` local.
+"""
+from __future__ import annotations
+import time
+from typing import Optional
+
+import numpy as np
+
+MOTIVO_LIMITE_ITERACOES = "limite de iterações atingido"
+
+
+def fator_ramificacao(feromonios: np.ndarray, lambda_: float = 0.05) -> float:
+    """Fator de ramificação λ médio (Dorigo & Gambardella).
+
+    Para cada cidade ``i`` conta as arestas com
+    ``τ_ij >= τ_min_i + λ (τ_max_i - τ_min_i)``; a média dessas contagens
+    cai para ~2 quando a colônia estagnou numa única rota.
+    """
+    tau = np.asarray(feromonios, dtype=float)
+    n = tau.shape[0]
+    if n < 2:
+        return 0.0
+    fora_diag = ~np.eye(n, dtype=bool)
+    tau_max = np.where(fora_diag, tau, -np.inf).max(axis=1)
+    tau_min = np.where(fora_diag, tau, np.inf).min(axis=1)
+    limiar = tau_min + lambda_ * (tau_max - tau_min)
+    ramos = ((tau >= limiar[:, None]) & fora_diag).sum(axis=1)
+    return float(ramos.mean())
+
+
+class CriterioParada:
+    """Decide quando uma otimização deve terminar antes de ``max_iters``.
+
+    Todos os critérios são opcionais (``None`` desativa):
+
+    * ``paciencia``        – iterações consecutivas sem melhora do melhor global;
+    * ``alvo``             – comprimento de rota considerado suficiente;
+    * ``tempo_max``        – orçamento de tempo de parede, em segundos;
+    * ``ramificacao_min``  – estagnação: fator de ramificação λ do feromônio
+      menor ou igual a este valor.
+    """
+
+    def __init__(self,
+                 paciencia: int | None = None,
+                 alvo: float | None = None,
+                 tempo_max: float | None = None,
+                 ramificacao_min: float | None = None,
+                 lambda_ramificacao: float = 0.05) -> None:
+        self.paciencia = paciencia
+        self.alvo = alvo
+        self.tempo_max = tempo_max
+        self.ramificacao_min = ramificacao_min
+        self.lambda_ramificacao = lambda_ramificacao
+        self.iniciar()
+
+    @property
+    def ativo(self) -> bool:
+        return any(c is not None for c in
+                   (self.paciencia, self.alvo, self.tempo_max, self.ramificacao_min))
+
+    def iniciar(self) -> None:
+        """Zera o estado; chamar no início de cada execução."""
+        self._inicio = time.monotonic()
+        self._melhor = float("inf")
+        self.iteracoes_sem_melhora = 0
+
+    def verificar(self, melhor_distancia: float,
+                  feromonios: Optional[np.ndarray] = None) -> Optional[str]:
+        """Registra o fim de uma iteração e devolve o motivo de parada, se houver."""
+        if melhor_distancia < self._melhor:
+            self._melhor = melhor_distancia
+            self.iteracoes_sem_melhora = 0
+        else:
+            self.iteracoes_sem_melhora += 1
+
+        if self.alvo is not None and self._melhor <= self.alvo:
+            return f"alvo {self.alvo:.2f} atingido"
+        if self.paciencia is not None and self.iteracoes_sem_melhora >= self.paciencia:
+            return f"sem melhora há {self.iteracoes_sem_melhora} iterações"
+        if self.tempo_max is not None and time.monotonic() - self._inicio >= self.tempo_max:
+            return f"orçamento de tempo de {self.tempo_max:.0f}s esgotado"
+        if self.ramificacao_min is not None and feromonios is not None:
+            fator = fator_ramificacao(feromonios, self.lambda_ramificacao)
+            if fator <= self.ramificacao_min:
+                return f"estagnação (fator de ramificação {fator:.2f})"
+        return None
@@ -0,0 +1,242 @@
+"""Decomposição espacial de instâncias grandes do TSP.
+
+A instância é dividida em grupos de cidades próximas (grade ou k-means),
+cada grupo é resolvido como um TSP pequeno e independente, e as sub-rotas
+são costuradas na ordem de uma rota pelos centróides dos grupos. Um 2-opt
+em janelas deslizantes conserta as emendas e os arredores.
+
+Tudo aqui trabalha com índices na lista de cidades da instância inteira.
+"""
+from __future__ import annotations
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aco_engine import ACOEngine
+from .cidade import Cidade
+from .kernels import dois_opt_numpy
+
+MODOS = ("grade", "kmeans")
+
+
+def coordenadas(cidades: Sequence[Cidade]) -> np.ndarray:
+    """Matriz ``(n, 2)`` com as coordenadas das cidades."""
+    return np.array([(c.x, c.y) for c in cidades], dtype=np.float64)
+
+
+def comprimento_rota(xy: np.ndarray, rota: Sequence[int]) -> float:
+    """Comprimento euclidiano da rota fechada ``rota``."""
+    pontos = xy[np.asarray(rota)]
+    return float(np.hypot(*(np.roll(pontos, -1, axis=0) - pontos).T).sum())
+
+
+def _distancias(xy: np.ndarray) -> np.ndarray:
+    return np.hypot(xy[:, None, 0] - xy[None, :, 0], xy[:, None, 1] - xy[None, :, 1])
+
+
+# ---------------------------------------------------------------------
+#  Particionamento
+# ---------------------------------------------------------------------
+def particionar_grade(xy: np.ndarray, tamanho_max: int) -> List[np.ndarray]:
+    """Grade regular com ~``tamanho_max`` cidades por célula.
+
+    Células vazias são descartadas; células com mais de ``2 * tamanho_max``
+    cidades (regiões densas) são divididas ao meio pela mediana do eixo mais
+    longo até caberem.
+    """
+    n = len(xy)
+    lado = max(1, math.ceil(math.sqrt(n / tamanho_max)))
+    minimo = xy.min(axis=0)
+    extensao = np.maximum(xy.max(axis=0) - minimo, 1e-12)
+    celula = np.minimum((lado * (xy - minimo) / extensao).astype(np.int64), lado - 1)
+    chave = celula[:, 0] * lado + celula[:, 1]
+    ordem = np.argsort(chave, kind="stable")
+    cortes = np.flatnonzero(np.diff(chave[ordem])) + 1
+    grupos = []
+    for grupo in np.split(ordem, cortes):
+        grupos.extend(_dividir_pela_mediana(xy, grupo, 2 * tamanho_max))
+    return grupos
+
+
+def _dividir_pela_mediana(xy: np.ndarray, grupo: np.ndarray, limite: int) -> List[np.ndarray]:
+    if len(grupo) <= limite:
+        return [grupo]
+    pontos = xy[grupo]
+    eixo = int(np.argmax(np.ptp(pontos, axis=0)))
+    ordem = grupo[np.argsort(pontos[:, eixo], kind="stable")]
+    meio = len(ordem) // 2
+    return _dividir_pela_mediana(xy, ordem[:meio], limite) + _dividir_pela_mediana(xy, ordem[meio:], limite)
+
+
+def particionar_kmeans(xy: np.ndarray, tamanho_max: int, iteracoes: int = 20,
+                       seed: Optional[int] = None) -> List[np.ndarray]:
+    """k-means (Lloyd) com ``k = ceil(n / tamanho_max)`` grupos.
+
+    Um centróide que fica sem cidades é movido para a cidade mais distante
+    do seu centróide atual.
+    """
+    n = len(xy)
+    k = max(1, math.ceil(n / tamanho_max))
+    rng = np.random.default_rng(seed)
+    centroides = xy[rng.choice(n, size=k, replace=False)].copy()
+    rotulos = np.full(n, -1, dtype=np.int64)
+    for _ in range(iteracoes):
+        novos, dist = _mais_proximo(xy, centroides)
+        for vazio in np.flatnonzero(np.bincount(novos, minlength=k) == 0):
+            longe = int(np.argmax(dist))
+            novos[longe], dist[longe] = vazio, 0.0
+        if np.array_equal(novos, rotulos):
+            break
+        rotulos = novos
+        contagem = np.bincount(rotulos, minlength=k)
+        for eixo in range(2):
+            centroides[:, eixo] = np.bincount(rotulos, weights=xy[:, eixo], minlength=k) / contagem
+    ordem = np.argsort(rotulos, kind="stable")
+    return np.split(ordem, np.flatnonzero(np.diff(rotulos[ordem])) + 1)
+
+
+def _mais_proximo(xy: np.ndarray, centroides: np.ndarray,
+                  bloco: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """Centróide mais próximo de cada ponto, em blocos para limitar a memória."""
+    rotulos = np.empty(len(xy), dtype=np.int64)
+    dist = np.empty(len(xy))
+    for inicio in range(0, len(xy), bloco):
+        parte = xy[inicio:inicio + bloco]
+        d2 = ((parte[:, None, :] - centroides[None, :, :]) ** 2).sum(axis=2)
+        rotulos[inicio:inicio + bloco] = np.argmin(d2, axis=1)
+        dist[inicio:inicio + bloco] = d2[np.arange(len(parte)), rotulos[inicio:inicio + bloco]]
+    return rotulos, dist
+
+
+def particionar(cidades: Sequence[Cidade], modo: str = "kmeans", tamanho_max: int = 200,
+                seed: Optional[int] = None) -> List[np.ndarray]:
+    """Divide as cidades em grupos; cada grupo é um array de índices."""
+    xy = coordenadas(cidades)
+    if modo == "grade":
+        return particionar_grade(xy, tamanho_max)
+    if modo == "kmeans":
+        return particionar_kmeans(xy, tamanho_max, seed=seed)
+    raise ValueError(f"Modo de decomposição desconhecido: {modo!r} (use {', '.join(MODOS)})")
+
+
+# ---------------------------------------------------------------------
+#  Subproblemas
+# ---------------------------------------------------------------------
+def resolver_subproblema(cidades: List[Cidade], parametros: Dict, iteracoes: int,
+                         seed: Optional[int] = None, **opcoes) -> Tuple[List[int], float]:
+    """Roda um ``ACOEngine`` sobre ``cidades`` e devolve (rota em índices locais, distância).
+
+    ``opcoes`` são repassadas ao engine (``backend``, ``num_threads``...).
+    """
+    if len(cidades) <= 3:
+        rota = list(range(len(cidades)))
+        return rota, comprimento_rota(coordenadas(cidades), rota) if cidades else 0.0
+    params = dict(parametros)
+    num_formigas = int(params.pop("num_formigas", 20))
+    engine = ACOEngine("subproblema", cidades, num_formigas, seed=seed, **params, **opcoes)
+    try:
+        for _ in range(iteracoes):
+            engine.executar_iteracao(incluir_feromonios=False)
+    finally:
+        engine.fechar()
+    return engine.melhor_caminho, engine.melhor_distancia
+
+
+# ---------------------------------------------------------------------
+#  Costura e refinamento
+# ---------------------------------------------------------------------
+def ordenar_grupos(xy: np.ndarray, grupos: List[np.ndarray]) -> List[int]:
+    """Ordem de visita dos grupos: rota pelos centróides (vizinho mais próximo + 2-opt)."""
+    if len(grupos) <= 3:
+        return list(range(len(grupos)))
+    centroides = np.array([xy[g].mean(axis=0) for g in grupos])
+    d = _distancias(centroides)
+    ordem, livre = [0], np.ones(len(grupos), dtype=bool)
+    livre[0] = False
+    for _ in range(len(grupos) - 1):
+        proximo = int(np.argmin(np.where(livre, d[ordem[-1]], np.inf)))
+        ordem.append(proximo)
+        livre[proximo] = False
+    return [int(g) for g in dois_opt_numpy(ordem, d)]
+
+
+def costurar(xy: np.ndarray, subrotas: List[Sequence[int]]) -> List[int]:
+    """Une as sub-rotas (já na ordem de visita) numa rota só.
+
+    Cada sub-rota fechada é aberta na aresta e no sentido que minimizam
+    ``d(saída anterior, entrada) + d(saída, próximo grupo) - d(aresta cortada)``;
+    o "próximo grupo" é representado pelo seu centróide.
+    """
+    subrotas = [np.asarray(s, dtype=np.int64) for s in subrotas if len(s)]
+    centroides = [xy[s].mean(axis=0) for s in subrotas]
+    rota: List[int] = []
+    for k, sub in enumerate(subrotas):
+        if len(sub) == 1:
+            rota.extend(int(c) for c in sub)
+            continue
+        # o último grupo fecha a rota: sai perto do início
+        if k + 1 < len(subrotas):
+            seguinte = centroides[k + 1]
+        else:
+            seguinte = xy[rota[0]] if rota else centroides[0]
+        pontos = xy[sub]
+        prox = np.roll(pontos, -1, axis=0)                # cidade i+1 de cada aresta (i, i+1)
+        aresta = np.hypot(*(prox - pontos).T)
+        ate_prox = np.hypot(*(prox - seguinte).T)
+        ate_atual = np.hypot(*(pontos - seguinte).T)
+        if rota:
+            anterior = xy[rota[-1]]
+            entra_prox = np.hypot(*(prox - anterior).T)
+            entra_atual = np.hypot(*(pontos - anterior).T)
+        else:
+            entra_prox = entra_atual = np.zeros(len(sub))
+        # sentido direto: entra em i+1, percorre, sai em i; inverso: entra em i, sai em i+1
+        direto = entra_prox + ate_atual - aresta
+        inverso = entra_atual + ate_prox - aresta
+        i_d, i_i = int(np.argmin(direto)), int(np.argmin(inverso))
+        if direto[i_d] <= inverso[i_i]:
+            trecho = np.roll(sub, -(i_d + 1))
+        else:
+            trecho = np.roll(sub[::-1], -(len(sub) - 1 - i_i))
+        rota.extend(int(c) for c in trecho)
+    return rota
+
+
+def refinar_janelas(xy: np.ndarray, rota: Sequence[int], janela: int = 50,
+                    passadas: int = 2) -> List[int]:
+    """2-opt em janelas deslizantes de ``janela`` posições (sobrepostas pela metade).
+
+    Cada janela é um caminho com as pontas fixas, então o resto da rota não
+    muda; o custo é linear no número de cidades. A última janela termina
+    sempre no fim da rota, e uma janela extra atravessa a emenda entre a
+    última cidade e a primeira.
+    """
+    rota = np.asarray(rota, dtype=np.int64).copy()
+    n = len(rota)
+    if n < 4:
+        return rota.tolist()
+    janela = min(janela, n)
+    passo = max(1, janela // 2)
+    inicios = list(range(0, n - janela + 1, passo))
+    if inicios[-1] != n - janela:
+        inicios.append(n - janela)
+    local = np.arange(janela)
+
+    def refinar(r: np.ndarray, inicio: int) -> None:
+        trecho = r[inicio:inicio + janela]
+        nova = dois_opt_numpy(local, _distancias(xy[trecho]), aberta=True)
+        r[inicio:inicio + janela] = trecho[nova]
+
+    for _ in range(passadas):
+        antes = rota.copy()
+        for inicio in inicios:
+            refinar(rota, inicio)
+        # a emenda fica no meio da janela: gira, refina e desfaz o giro
+        giro = janela // 2
+        girada = np.roll(rota, giro)
+        refinar(girada, 0)
+        rota = np.roll(girada, -giro)
+        if np.array_equal(antes, rota):
+            break
+    return rota.tolist()
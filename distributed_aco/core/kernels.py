@@ -0,0 +1,285 @@
+"""Kernels do laço quente do ACO: construção de rotas, depósito e 2-opt.
+
+Há três implementações com o mesmo resultado bit a bit, dada a mesma
+sequência de sorteios:
+
+* ``python`` – a referência, escalar, dentro do próprio ``ACOEngine``;
+* ``numpy``  – vetorizada sobre as formigas (todas dão o passo ``s`` juntas);
+* ``numba``  – laços escalares compilados com ``numba.njit``, se instalado.
+
+Para serem idênticas, todas seguem as mesmas regras:
+
+* o peso ``τ^α · η^β`` de cada aresta é calculado uma vez por iteração
+  (:func:`calcular_pesos`);
+* cada passo consome um sorteio uniforme; o limiar da roleta é esse sorteio
+  convertido ao dtype dos pesos, e as somas acumuladas são sequenciais;
+* o comprimento das rotas e os ganhos do 2-opt são somados em float64;
+* o depósito soma ``Q / L`` convertido ao dtype do feromônio, formiga a
+  formiga, na ordem das arestas.
+"""
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    import numba # type: ignore
+except ImportError:  # pragma: no cover - depende do ambiente
+    numba = None
+
+NUMBA_DISPONIVEL = numba is not None
+BACKENDS = ("python", "numpy", "numba")
+
+# Ganho mínimo para aceitar um movimento 2-opt (evita ciclos por arredondamento)
+EPS_2OPT = 1e-10
+
+
+def resolver_backend(nome: str) -> str:
+    """Valida ``nome``; ``numba`` cai para ``numpy`` se o Numba não estiver instalado."""
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {nome!r} (use {', '.join(BACKENDS)})")
+    if nome == "numba" and not NUMBA_DISPONIVEL:
+        print("⚠️ Numba não instalado; usando o backend numpy (pip install numba).")
+        return "numpy"
+    return nome
+
+
+def calcular_pesos(feromonios: np.ndarray, heuristica: np.ndarray,
+                   alpha: float, beta: float) -> np.ndarray:
+    """Matriz ``τ^α · η^β`` usada pela roleta de todas as formigas da iteração."""
+    return (feromonios ** alpha) * (heuristica ** beta)
+
+
+def escolher_indice(r: float, total) -> int:
+    """Roleta com peso total nulo: escolha uniforme entre ``total`` candidatas."""
+    return min(int(r * total), total - 1)
+
+
+# ---------------------------------------------------------------------
+#  NumPy
+# ---------------------------------------------------------------------
+def construir_rotas_numpy(pesos: np.ndarray, distancias: np.ndarray, inicios: np.ndarray,
+                          uniformes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Constrói as rotas de todas as formigas, um passo de cada vez.
+
+    ``uniformes`` tem forma ``(formigas, cidades - 1)``. Devolve as rotas
+    (abertas, ``int64``) e seus comprimentos (``float64``).
+    """
+    m, n = len(inicios), pesos.shape[0]
+    formigas = np.arange(m)
+    rotas = np.empty((m, n), dtype=np.int64)
+    rotas[:, 0] = inicios
+    livre = np.ones((m, n), dtype=bool)
+    livre[formigas, inicios] = False
+    limiares = uniformes.astype(pesos.dtype)
+    zero = pesos.dtype.type(0)
+
+    for s in range(n - 1):
+        atual = rotas[:, s]
+        p = np.where(livre, pesos[atual], zero)
+        acumulado = np.cumsum(p, axis=1)
+        total = acumulado[:, -1]
+        escolha = np.empty(m, dtype=np.int64)
+
+        nulo = total == 0
+        if nulo.any():
+            # peso total nulo: escolha uniforme entre as cidades livres
+            for a in np.flatnonzero(nulo):
+                candidatas = np.flatnonzero(livre[a])
+                escolha[a] = candidatas[escolher_indice(uniformes[a, s], len(candidatas))]
+
+        ok = ~nulo
+        if ok.any():
+            probs = p[ok] / total[ok, None]
+            cumul = np.cumsum(probs, axis=1)
+            alcancou = (limiares[ok, s, None] <= cumul) & livre[ok]
+            primeira = np.argmax(alcancou, axis=1)
+            # arredondamento: o limiar pode ficar acima da soma -> última livre
+            ultima = n - 1 - np.argmax(livre[ok][:, ::-1], axis=1)
+            escolha[ok] = np.where(alcancou.any(axis=1), primeira, ultima)
+
+        rotas[:, s + 1] = escolha
+        livre[formigas, escolha] = False
+
+    return rotas, comprimentos_numpy(distancias, rotas)
+
+
+def comprimentos_numpy(distancias: np.ndarray, rotas: np.ndarray) -> np.ndarray:
+    """Comprimento de cada rota (fechada), somado em ordem e em float64."""
+    trechos = distancias[rotas, np.roll(rotas, -1, axis=1)].astype(np.float64)
+    return np.cumsum(trechos, axis=1)[:, -1]
+
+
+def depositar_numpy(feromonios: np.ndarray, rotas: np.ndarray, comprimentos: np.ndarray,
+                    rho: float, Q: float) -> None:
+    """Evapora e deposita ``Q / L`` nas arestas (nos dois sentidos), no lugar."""
+    feromonios *= (1 - rho)
+    m, n = rotas.shape
+    origem = rotas
+    destino = np.roll(rotas, -1, axis=1)
+    # (a, b) e (b, a) intercalados, na mesma ordem do laço de referência
+    linhas = np.stack([origem, destino], axis=2).reshape(-1)
+    colunas = np.stack([destino, origem], axis=2).reshape(-1)
+    deltas = np.repeat((Q / comprimentos).astype(feromonios.dtype), 2 * n)
+    np.add.at(feromonios, (linhas, colunas), deltas)
+
+
+def dois_opt_numpy(rota: np.ndarray, distancias: np.ndarray, aberta: bool = False) -> np.ndarray:
+    """2-opt de primeira melhora; avalia de uma vez todos os ``j`` de cada ``i``.
+
+    Com ``aberta=True`` a rota é um caminho com as duas pontas fixas (sem a
+    aresta de volta), como um trecho de uma rota maior.
+    """
+    rota = np.array(rota, dtype=np.int64)
+    d = distancias.astype(np.float64, copy=False)
+    n = len(rota)
+    melhorou = True
+    while melhorou:
+        melhorou = False
+        for i in range(n - 2):
+            j0 = i + 2
+            # com i = 0, j = n - 1 é a mesma aresta (ciclo) ou não há aresta (caminho)
+            jmax = n - 1 if i == 0 or aberta else n
+            while j0 < jmax:
+                a, b = rota[i], rota[i + 1]
+                js = np.arange(j0, jmax)
+                c = rota[js]
+                e = rota[(js + 1) % n]
+                ganhos = (d[a, c] + d[b, e]) - (d[a, b] + d[c, e])
+                melhora = np.flatnonzero(ganhos < -EPS_2OPT)
+                if not len(melhora):
+                    break
+                j = j0 + melhora[0]
+                rota[i + 1:j + 1] = rota[i + 1:j + 1][::-1].copy()
+                melhorou = True
+                j0 = j + 1
+    return rota
+
+
+# ---------------------------------------------------------------------
+#  Laços escalares (compilados com Numba quando disponível)
+# ---------------------------------------------------------------------
+def _construir_rotas_laco(pesos, distancias, inicios, uniformes, limiares):
+    m, n = inicios.shape[0], pesos.shape[0]
+    rotas = np.empty((m, n), dtype=np.int64)
+    comprimentos = np.empty(m, dtype=np.float64)
+    livre = np.empty(n, dtype=np.bool_)
+    acumulado = np.empty(n, dtype=pesos.dtype)
+    cumul = np.empty(n, dtype=pesos.dtype)
+    for a in range(m):
+        livre[:] = True
+        atual = inicios[a]
+        rotas[a, 0] = atual
+        livre[atual] = False
+        comprimento = 0.0
+        for s in range(n - 1):
+            for j in range(n):
+                v = pesos[atual, j] if livre[j] else pesos[atual, j] * 0
+                acumulado[j] = v if j == 0 else acumulado[j - 1] + v
+            total = acumulado[n - 1]
+            escolha = -1
+            if total == 0:
+                livres = 0
+                for j in range(n):
+                    if livre[j]:
+                        livres += 1
+                k = min(int(uniformes[a, s] * livres), livres - 1)
+                for j in range(n):
+                    if livre[j]:
+                        if k == 0:
+                            escolha = j
+                            break
+                        k -= 1
+            else:
+                ultima = -1
+                for j in range(n):
+                    v = pesos[atual, j] / total if livre[j] else pesos[atual, j] * 0
+                    cumul[j] = v if j == 0 else cumul[j - 1] + v
+                    if livre[j]:
+                        ultima = j
+                        if escolha < 0 and limiares[a, s] <= cumul[j]:
+                            escolha = j
+                if escolha < 0:
+                    escolha = ultima
+            comprimento += float(distancias[atual, escolha])
+            rotas[a, s + 1] = escolha
+            livre[escolha] = False
+            atual = escolha
+        comprimento += float(distancias[atual, rotas[a, 0]])
+        comprimentos[a] = comprimento
+    return rotas, comprimentos
+
+
+def _depositar_laco(feromonios, rotas, deltas):
+    m, n = rotas.shape
+    for a in range(m):
+        for k in range(n):
+            origem, destino = rotas[a, k], rotas[a, (k + 1) % n]
+            feromonios[origem, destino] += deltas[a]
+            feromonios[destino, origem] += deltas[a]
+
+
+def _dois_opt_laco(rota, distancias):
+    rota = rota.copy()
+    n = rota.shape[0]
+    melhorou = True
+    while melhorou:
+        melhorou = False
+        for i in range(n - 2):
+            jmax = n - 1 if i == 0 else n
+            for j in range(i + 2, jmax):
+                a, b = rota[i], rota[i + 1]
+                c, e = rota[j], rota[(j + 1) % n]
+                ganho = ((float(distancias[a, c]) + float(distancias[b, e]))
+                         - (float(distancias[a, b]) + float(distancias[c, e])))
+                if ganho < -EPS_2OPT:
+                    esq, dir_ = i + 1, j
+                    while esq < dir_:
+                        rota[esq], rota[dir_] = rota[dir_], rota[esq]
+                        esq += 1
+                        dir_ -= 1
+                    melhorou = True
+    return rota
+
+
+if NUMBA_DISPONIVEL:  # pragma: no cover - depende do ambiente
+    # nogil: o modo com várias threads do ACOEngine roda blocos em paralelo
+    _construir_rotas_compilado = numba.njit(cache=True, nogil=True)(_construir_rotas_laco)
+    _depositar_compilado = numba.njit(cache=True, nogil=True)(_depositar_laco)
+    _dois_opt_compilado = numba.njit(cache=True, nogil=True)(_dois_opt_laco)
+else:
+    _construir_rotas_compilado = _construir_rotas_laco
+    _depositar_compilado = _depositar_laco
+    _dois_opt_compilado = _dois_opt_laco
+
+
+def construir_rotas_numba(pesos: np.ndarray, distancias: np.ndarray, inicios: np.ndarray,
+                          uniformes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return _construir_rotas_compilado(pesos, distancias, inicios, uniformes,
+                                      uniformes.astype(pesos.dtype))
+
+
+def depositar_numba(feromonios: np.ndarray, rotas: np.ndarray, comprimentos: np.ndarray,
+                    rho: float, Q: float) -> None:
+    # evaporação no NumPy: multiplicar por um float64 dentro do laço
+    # arredondaria duas vezes em float32
+    feromonios *= (1 - rho)
+    _depositar_compilado(feromonios, rotas, (Q / comprimentos).astype(feromonios.dtype))
+
+
+def dois_opt_numba(rota: np.ndarray, distancias: np.ndarray) -> np.ndarray:
+    return _dois_opt_compilado(np.asarray(rota, dtype=np.int64), distancias)
+
+
+# ---------------------------------------------------------------------
+#  Referência escalar do 2-opt (backend python)
+# ---------------------------------------------------------------------
+def dois_opt(rota: List[int], distancias: np.ndarray) -> List[int]:
+    """2-opt de primeira melhora sobre a rota aberta ``rota``; devolve a nova rota."""
+    return [int(c) for c in _dois_opt_laco(np.asarray(rota, dtype=np.int64), distancias)]
+
+
+KERNELS = {
+    "numpy": (construir_rotas_numpy, depositar_numpy, dois_opt_numpy),
+    "numba": (construir_rotas_numba, depositar_numba, dois_opt_numba),
+}
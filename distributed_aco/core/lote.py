@@ -0,0 +1,177 @@
+"""Muitas instâncias pequenas do TSP resolvidas numa única chamada.
+
+Com milhares de problemas de 10 a 50 cidades (uma rota por veículo), criar
+um ``ACOEngine`` por instância faz o custo fixo dominar: matrizes próprias,
+laços Python por formiga e por passo. Aqui as instâncias são empilhadas em
+arrays ``(instâncias, cidades, cidades)`` preenchidos até o tamanho da maior,
+e todas as colônias andam juntas: cada passo da construção é uma operação
+vetorial sobre ``(instâncias, formigas, cidades)``.
+
+O preenchimento nunca entra numa rota: as cidades extras começam visitadas e,
+quando uma instância menor termina, suas formigas "ficam paradas" na cidade
+inicial (arestas de comprimento zero, sem depósito). As instâncias são
+ordenadas por tamanho e processadas em blocos, para que cada bloco só seja
+preenchido até a sua maior instância.
+
+O algoritmo é o mesmo do ``ACOEngine`` (roleta ``τ^α · η^β``, evaporação e
+depósito ``Q / L`` de todas as formigas), mas com outro gerador de números
+aleatórios, então as rotas não coincidem com as do engine para a mesma seed.
+"""
+from __future__ import annotations
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aco_engine import PRECISOES
+from .cidade import Cidade
+from .kernels import dois_opt_numpy
+
+# Instâncias por bloco (limita a memória de pesos/rotas e o preenchimento)
+TAMANHO_BLOCO = 256
+
+
+def resolver_lote(instancias: Sequence[Sequence[Cidade]],
+                  iteracoes: int = 50,
+                  num_formigas: int = 20,
+                  alpha: float = 1.0,
+                  beta: float = 2.0,
+                  rho: float = 0.1,
+                  Q: float = 100.0,
+                  seed: Optional[int] = None,
+                  precisao: str = "float64",
+                  busca_local: bool = False,
+                  tamanho_bloco: int = TAMANHO_BLOCO) -> List[Tuple[List[int], float]]:
+    """Resolve cada instância e devolve ``(melhor rota em índices locais, distância)``, na ordem de entrada.
+
+    Com ``busca_local`` a melhor rota de cada instância passa por um 2-opt ao
+    final (aplicá-lo a cada formiga, como o engine faz, custaria um laço
+    Python por formiga e anularia o ganho do lote).
+    """
+    if precisao not in PRECISOES:
+        raise ValueError(f"Precisão desconhecida: {precisao!r} (use {', '.join(PRECISOES)})")
+    rng = np.random.default_rng(seed)
+    tamanhos = [len(c) for c in instancias]
+    # com 0 ou 1 cidade a rota é trivial (e de comprimento zero): fica fora dos blocos
+    resultados: List[Tuple[List[int], float]] = [(list(range(n)), 0.0) for n in tamanhos]
+    ordem = sorted((i for i, n in enumerate(tamanhos) if n > 1), key=tamanhos.__getitem__)
+
+    for inicio in range(0, len(ordem), tamanho_bloco):
+        bloco = ordem[inicio:inicio + tamanho_bloco]
+        lote = _Lote([instancias[i] for i in bloco], precisao)
+        lote.executar(iteracoes, num_formigas, alpha, beta, rho, Q, rng)
+        if busca_local:
+            lote.refinar()
+        for i, resultado in zip(bloco, lote.resultados()):
+            resultados[i] = resultado
+    return resultados
+
+
+class _Lote:
+    """Um bloco de instâncias empilhadas; ``B`` instâncias, até ``N`` cidades.
+
+    As instâncias devem vir em ordem crescente de tamanho.
+    """
+
+    def __init__(self, instancias: Sequence[Sequence[Cidade]], precisao: str) -> None:
+        self.n = np.array([len(c) for c in instancias], dtype=np.int64)
+        B, N = len(instancias), int(self.n.max())
+        xy = np.zeros((B, N, 2))
+        for b, cidades in enumerate(instancias):
+            xy[b, :len(cidades)] = [(c.x, c.y) for c in cidades]
+        self.valida = np.arange(N)[None, :] < self.n[:, None]
+
+        d = np.hypot(xy[:, :, None, 0] - xy[:, None, :, 0], xy[:, :, None, 1] - xy[:, None, :, 1])
+        if precisao == "inteira":
+            d = np.floor(d + 0.5)
+        tipo_dist, tipo_real = PRECISOES[precisao]
+        self.distancias = d.astype(tipo_dist)
+        self.heuristica = np.divide(1.0, self.distancias, out=np.zeros(d.shape, dtype=tipo_real),
+                                    where=self.distancias != 0)
+        self.feromonios = np.full(d.shape, 0.1, dtype=tipo_real)
+        self.melhor_distancia = np.full(B, np.inf)
+        self.melhor_rota = np.zeros((B, N), dtype=np.int64)
+
+    def executar(self, iteracoes: int, m: int, alpha: float, beta: float, rho: float,
+                 Q: float, rng: np.random.Generator) -> None:
+        B = len(self.n)
+        todas = np.arange(B)
+        for _ in range(iteracoes):
+            pesos = (self.feromonios ** alpha) * (self.heuristica ** beta)
+            rotas = self._construir(pesos, m, rng)
+            comprimentos = self._comprimentos(rotas)
+            self._depositar(rotas, comprimentos, rho, Q)
+
+            a = np.argmin(comprimentos, axis=1)
+            melhor = comprimentos[todas, a]
+            melhorou = melhor < self.melhor_distancia
+            self.melhor_distancia[melhorou] = melhor[melhorou]
+            self.melhor_rota[melhorou] = rotas[todas, a][melhorou]
+
+    def _construir(self, pesos: np.ndarray, m: int, rng: np.random.Generator) -> np.ndarray:
+        """Rotas ``(B, m, N)``; depois da última cidade, a rota repete a inicial.
+
+        As instâncias estão em ordem crescente de tamanho, então as que ainda
+        têm cidades livres no passo ``s`` formam um sufixo do bloco: só ele é
+        processado, e o preenchimento das menores não custa nada.
+        """
+        B, N = self.valida.shape
+        bi, ai = np.arange(B)[:, None], np.arange(m)[None, :]
+        rotas = np.empty((B, m, N), dtype=np.int64)
+        rotas[:, :, 0] = rng.integers(0, self.n[:, None], size=(B, m))
+        rotas[:, :, 1:] = rotas[:, :, :1]
+        livre = np.repeat(self.valida[:, None, :], m, axis=1)
+        livre[bi, ai, rotas[:, :, 0]] = False
+        uniformes = rng.random((B, m, max(N - 1, 0)))
+
+        for s in range(N - 1):
+            k = int(np.searchsorted(self.n, s + 2))   # primeira instância com n > s + 1
+            lv, bk = livre[k:], bi[k:]
+            p = np.where(lv, pesos[bk, rotas[k:, :, s]], 0)
+            acumulado = np.cumsum(p, axis=2)
+            nulo = acumulado[:, :, -1] <= 0
+            if nulo.any():
+                # peso total nulo: sorteio uniforme entre as cidades livres
+                acumulado[nulo] = np.cumsum(lv[nulo], axis=1)
+            alvo = uniformes[k:, :, s] * acumulado[:, :, -1]
+            escolha = np.argmax(acumulado > alvo[:, :, None], axis=2)
+            sem = acumulado[:, :, -1] <= alvo
+            if sem.any():
+                # arredondamento: o alvo não foi ultrapassado -> última cidade livre
+                escolha[sem] = N - 1 - np.argmax(lv[sem][:, ::-1], axis=1)
+            rotas[k:, :, s + 1] = escolha
+            lv[bi[:B - k], ai, escolha] = False
+        return rotas
+
+    def _comprimentos(self, rotas: np.ndarray) -> np.ndarray:
+        B = len(self.n)
+        bi = np.arange(B)[:, None, None]
+        trechos = self.distancias[bi, rotas, np.roll(rotas, -1, axis=2)]
+        return trechos.sum(axis=2, dtype=np.float64)
+
+    def _depositar(self, rotas: np.ndarray, comprimentos: np.ndarray, rho: float, Q: float) -> None:
+        self.feromonios *= (1 - rho)
+        B, m, N = rotas.shape
+        # só as n arestas reais de cada rota; as do preenchimento ligam a inicial a ela mesma
+        reais = np.broadcast_to((np.arange(N)[None, :] < self.n[:, None])[:, None, :], rotas.shape)
+        b = np.broadcast_to(np.arange(B)[:, None, None], rotas.shape)[reais]
+        origem, destino = rotas[reais], np.roll(rotas, -1, axis=2)[reais]
+        # rota de comprimento zero (cidades no mesmo ponto): nada a depositar
+        q = np.divide(Q, comprimentos, out=np.zeros_like(comprimentos), where=comprimentos > 0)
+        delta = np.broadcast_to(q[:, :, None], rotas.shape)[reais]
+        delta = delta.astype(self.feromonios.dtype)
+        np.add.at(self.feromonios, (b, origem, destino), delta)
+        np.add.at(self.feromonios, (b, destino, origem), delta)
+
+    def refinar(self) -> None:
+        """2-opt na melhor rota de cada instância."""
+        for b, n in enumerate(self.n):
+            if n < 4:
+                continue
+            d = self.distancias[b, :n, :n]
+            rota = dois_opt_numpy(self.melhor_rota[b, :n], d)
+            self.melhor_rota[b, :n] = rota
+            self.melhor_distancia[b] = float(d[rota, np.roll(rota, -1)].sum(dtype=np.float64))
+
+    def resultados(self) -> List[Tuple[List[int], float]]:
+        return [(self.melhor_rota[b, :n].tolist(), float(self.melhor_distancia[b]))
+                for b, n in enumerate(self.n)]
@@ -0,0 +1,150 @@
+"""Partida a quente: reaproveitar a solução de uma execução anterior.
+
+Instâncias recorrentes (as entregas de cada dia) mudam pouco de uma
+execução para a outra. Em vez de começar com feromônio uniforme e sem
+rota, o engine pode partir de:
+
+* uma rota anterior, dada pelos ``id`` das cidades. Cidades que saíram são
+  removidas e as novas entram por inserção mais barata
+  (:func:`reparar_rota`);
+* um snapshot da matriz de feromônio (``.npz`` com a matriz e os ``id``),
+  remapeado para as cidades atuais (:func:`carregar_feromonios`).
+
+As arestas da rota anterior recebem um reforço proporcional
+(:func:`reforcar_rota`), de modo que as formigas partem da vizinhança da
+solução conhecida sem ficarem presas a ela.
+"""
+from __future__ import annotations
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .cidade import Cidade
+
+
+def reparar_rota(ids: Iterable, cidades: Sequence[Cidade]) -> List[int]:
+    """Converte uma rota em ``id`` de cidade para índices em ``cidades``.
+
+    Ids que não existem mais (ou repetidos) são descartados; cidades que não
+    estavam na rota são inseridas, na ordem em que aparecem em ``cidades``,
+    na aresta onde aumentam menos o comprimento.
+    """
+    posicao = {c.id: i for i, c in enumerate(cidades)}
+    rota: List[int] = []
+    vistas = set()
+    for cid in ids:
+        i = posicao.get(cid)
+        if i is not None and i not in vistas:
+            rota.append(i)
+            vistas.add(i)
+
+    xy = np.array([(c.x, c.y) for c in cidades], dtype=np.float64)
+    for nova in (i for i in range(len(cidades)) if i not in vistas):
+        if len(rota) < 2:
+            rota.append(nova)
+            continue
+        r = np.asarray(rota)
+        a, b = xy[r], xy[np.roll(r, -1)]
+        custo = (np.hypot(*(a - xy[nova]).T) + np.hypot(*(b - xy[nova]).T)
+                 - np.hypot(*(a - b).T))
+        rota.insert(int(np.argmin(custo)) + 1, nova)
+    return rota
+
+
+def carregar_rota(caminho: str) -> List:
+    """Lê os ``id`` de uma rota salva.
+
+    Aceita o resultado de um job (``melhor_rota_ids``), um objeto com a chave
+    ``rota`` ou uma lista JSON simples.
+    """
+    with open(caminho) as f:
+        dados = json.load(f)
+    if isinstance(dados, list):
+        return dados
+    for chave in ("melhor_rota_ids", "rota"):
+        if chave in dados:
+            return dados[chave]
+    raise ValueError(f"'{caminho}' não tem 'melhor_rota_ids' nem 'rota'")
+
+
+def salvar_feromonios(caminho: str, feromonios: np.ndarray, cidades: Sequence[Cidade]) -> None:
+    """Grava a matriz com os ``id`` das cidades de cada linha/coluna."""
+    np.savez_compressed(caminho, feromonios=feromonios, ids=np.array([c.id for c in cidades]))
+
+
+def carregar_feromonios(caminho: str, cidades: Sequence[Cidade], dtype=None) -> np.ndarray:
+    """Lê um snapshot e o remapeia para ``cidades``.
+
+    Pares de cidades presentes no snapshot mantêm o valor salvo; pares com
+    uma cidade nova recebem a mediana da matriz antiga (nem atraentes nem
+    evitados).
+    """
+    with np.load(caminho) as dados:
+        antiga, ids = dados["feromonios"], dados["ids"].tolist()
+    posicao = {cid: k for k, cid in enumerate(ids)}
+    fora_da_diagonal = antiga[~np.eye(len(antiga), dtype=bool)]
+    padrao = float(np.median(fora_da_diagonal)) if fora_da_diagonal.size else 0.1
+
+    n = len(cidades)
+    matriz = np.full((n, n), padrao, dtype=dtype or antiga.dtype)
+    origem = np.array([posicao.get(c.id, -1) for c in cidades], dtype=np.int64)
+    presentes = np.flatnonzero(origem >= 0)
+    matriz[np.ix_(presentes, presentes)] = antiga[np.ix_(origem[presentes], origem[presentes])]
+    return matriz
+
+
+def reforcar_rota(feromonios: np.ndarray, caminho: Sequence[int], reforco: float = 1.0) -> None:
+    """Multiplica por ``1 + reforco`` o feromônio das arestas de ``caminho``, no lugar.
+
+    O reforço é relativo ao valor atual, então vale igualmente para a matriz
+    uniforme inicial e para um snapshot de qualquer escala.
+    """
+    if len(caminho) < 3 or reforco <= 0:
+        return
+    origem = np.asarray(caminho)
+    destino = np.roll(origem, -1)
+    fator = feromonios.dtype.type(1 + reforco)
+    feromonios[origem, destino] *= fator
+    feromonios[destino, origem] *= fator
+
+
+class PartidaQuente:
+    """Rota anterior e/ou snapshot de feromônio para iniciar uma execução.
+
+    ``rota`` e ``feromonios`` são caminhos de arquivo (ver :func:`carregar_rota`
+    e :func:`carregar_feromonios`); ``ids`` permite passar a rota diretamente.
+    """
+
+    def __init__(self, rota: Optional[str] = None, feromonios: Optional[str] = None,
+                 reforco: float = 1.0, ids: Optional[List] = None) -> None:
+        self.rota = rota
+        self.feromonios = feromonios
+        self.reforco = reforco
+        self.ids = ids
+
+    @classmethod
+    def from_dict(cls, data: Dict, base_dir: str = ".") -> "PartidaQuente":
+        """Bloco ``partida_quente`` de um job; caminhos relativos ao diretório do job."""
+        def resolver(chave):
+            if not data.get(chave):
+                return None
+            caminho = os.path.join(base_dir, data[chave])
+            if not os.path.isfile(caminho):
+                raise ValueError(f"partida_quente: '{caminho}' não existe")
+            return caminho
+        return cls(resolver("rota"), resolver("feromonios"), float(data.get("reforco", 1.0)),
+                   data.get("ids"))
+
+    def preparar(self, cidades: Sequence[Cidade], dtype) -> Dict:
+        """Carrega e adapta os dados a ``cidades``.
+
+        Devolve ``{"caminho": índices ou None, "feromonios": matriz ou None,
+        "reforco": r}``; a matriz vem sem o reforço da rota (quem a usa aplica
+        :func:`reforcar_rota`).
+        """
+        ids = self.ids if self.ids is not None else carregar_rota(self.rota) if self.rota else None
+        caminho = reparar_rota(ids, cidades) if ids is not None else None
+        matriz = carregar_feromonios(self.feromonios, cidades, dtype) if self.feromonios else None
+        return {"caminho": caminho, "feromonios": matriz, "reforco": self.reforco}
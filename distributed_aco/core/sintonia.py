@@ -0,0 +1,119 @@
+"""Sintonia automática de parâmetros do ACO (busca aleatória e corrida).
+
+A corrida segue a ideia do F‑Race/irace: todas as configurações vivas são
+avaliadas na mesma sequência de instâncias (com a mesma semente, para
+reduzir a variância) e, a partir de ``min_instancias`` passos, as
+configurações cujo posto médio é estatisticamente pior que o da melhor
+são eliminadas. Sem eliminação, o mesmo laço é uma busca aleatória.
+"""
+from __future__ import annotations
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+from .aco_engine import ACOEngine
+from .cidade import Cidade
+
+# nome -> (mínimo, máximo, escala); escala "int", "float" ou "log"
+ESPACO_PADRAO: Dict[str, Tuple[float, float, str]] = {
+    "alpha": (0.5, 3.0, "float"),
+    "beta": (1.0, 6.0, "float"),
+    "rho": (0.01, 0.5, "log"),
+    "Q": (10.0, 1000.0, "log"),
+    "num_formigas": (5, 50, "int"),
+}
+
+
+def amostrar_configuracoes(n: int,
+                           rng: random.Random,
+                           espaco: Dict[str, Tuple[float, float, str]] = ESPACO_PADRAO) -> List[Dict]:
+    """Sorteia ``n`` configurações uniformemente no espaço dado."""
+    configs = []
+    for _ in range(n):
+        cfg = {}
+        for nome, (lo, hi, escala) in espaco.items():
+            if escala == "int":
+                cfg[nome] = rng.randint(int(lo), int(hi))
+            elif escala == "log":
+                cfg[nome] = math.exp(rng.uniform(math.log(lo), math.log(hi)))
+            else:
+                cfg[nome] = rng.uniform(lo, hi)
+        configs.append(cfg)
+    return configs
+
+
+def avaliar_configuracao(cidades: List[Cidade], config: Dict, iteracoes: int,
+                         seed: Optional[int] = None) -> float:
+    """Roda um ``ACOEngine`` com ``config`` por ``iteracoes`` e devolve a melhor distância."""
+    params = dict(config)
+    num_formigas = int(params.pop("num_formigas", 20))
+    engine = ACOEngine("sintonia", cidades, num_formigas, seed=seed, **params)
+    for _ in range(iteracoes):
+        engine.executar_iteracao()
+    return engine.melhor_distancia
+
+
+def _postos(valores: List[float]) -> List[float]:
+    """Postos 1..n (empates recebem a média dos postos)."""
+    ordem = sorted(range(len(valores)), key=lambda i: valores[i])
+    postos = [0.0] * len(valores)
+    i = 0
+    while i < len(ordem):
+        j = i
+        while j + 1 < len(ordem) and valores[ordem[j + 1]] == valores[ordem[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            postos[ordem[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return postos
+
+
+class Corrida:
+    """Mantém os resultados de uma corrida e decide as eliminações.
+
+    A eliminação usa a diferença crítica de Nemenyi aproximada
+    ``z * sqrt(k (k + 1) / (6 N))`` sobre os postos médios, com ``k``
+    configurações vivas e ``N`` passos avaliados.
+    """
+
+    def __init__(self, configuracoes: List[Dict],
+                 min_instancias: int = 3,
+                 eliminar: bool = True,
+                 z: float = 1.96) -> None:
+        self.configuracoes = configuracoes
+        self.min_instancias = min_instancias
+        self.eliminar = eliminar
+        self.z = z
+        self.vivas: List[int] = list(range(len(configuracoes)))
+        self.passos: List[Dict[int, float]] = []
+
+    def registrar(self, resultados: Dict[int, float]) -> List[int]:
+        """Registra um passo (config -> distância) e devolve as eliminadas."""
+        self.passos.append({i: resultados.get(i, float("inf")) for i in self.vivas})
+        if not self.eliminar or len(self.passos) < self.min_instancias or len(self.vivas) < 2:
+            return []
+
+        medios = self.postos_medios()
+        melhor = min(medios.values())
+        k, n = len(self.vivas), len(self.passos)
+        limite = melhor + self.z * math.sqrt(k * (k + 1) / (6 * n))
+        eliminadas = [i for i in self.vivas if medios[i] > limite]
+        self.vivas = [i for i in self.vivas if i not in eliminadas]
+        return eliminadas
+
+    def postos_medios(self) -> Dict[int, float]:
+        soma = {i: 0.0 for i in self.vivas}
+        for passo in self.passos:
+            postos = _postos([passo[i] for i in self.vivas])
+            for i, p in zip(self.vivas, postos):
+                soma[i] += p
+        return {i: s / max(len(self.passos), 1) for i, s in soma.items()}
+
+    def distancia_media(self, i: int) -> float:
+        valores = [p[i] for p in self.passos if i in p]
+        return sum(valores) / len(valores) if valores else float("inf")
+
+    def melhor(self) -> Tuple[int, Dict]:
+        medios = self.postos_medios()
+        idx = min(self.vivas, key=lambda i: (medios[i], self.distancia_media(i)))
+        return idx, self.configuracoes[idx]
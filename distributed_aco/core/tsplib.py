@@ -0,0 +1,48 @@
+"""Leitura de instâncias no formato TSPLIB (seção NODE_COORD_SECTION)."""
+from __future__ import annotations
+from typing import Dict, List, Tuple
+
+from .cidade import Cidade
+
+
+def ler_tsplib(texto: str) -> Tuple[Dict[str, str], List[Cidade]]:
+    """Interpreta o conteúdo de um arquivo ``.tsp``.
+
+    Devolve o cabeçalho (``NAME``, ``EDGE_WEIGHT_TYPE``...) e as cidades, na
+    ordem em que aparecem. O ``id`` de cada cidade é o número do nó no
+    arquivo, e não a posição: assim ele continua o mesmo quando a instância
+    ganha ou perde nós, e a partida a quente reconhece as mesmas cidades.
+    """
+    cabecalho: Dict[str, str] = {}
+    cidades: List[Cidade] = []
+    vistos = set()
+    em_coordenadas = False
+    for linha in texto.splitlines():
+        linha = linha.strip()
+        if linha == "EOF":
+            break
+        if not linha:
+            continue
+        if em_coordenadas:
+            partes = linha.split()
+            if len(partes) >= 3 and partes[0].lstrip("-").isdigit():
+                no = int(partes[0])
+                if no in vistos:
+                    raise ValueError(f"Instância TSPLIB com o nó {no} repetido")
+                vistos.add(no)
+                cidades.append(Cidade(no, float(partes[1]), float(partes[2]), f"Cidade_{partes[0]}"))
+                continue
+            em_coordenadas = False
+        if linha.startswith("NODE_COORD_SECTION"):
+            em_coordenadas = True
+        elif ":" in linha:
+            chave, _, valor = linha.partition(":")
+            cabecalho[chave.strip().upper()] = valor.strip()
+    if not cidades:
+        raise ValueError("Instância TSPLIB sem NODE_COORD_SECTION")
+    return cabecalho, cidades
+
+
+def carregar_tsplib(caminho: str) -> List[Cidade]:
+    with open(caminho) as f:
+        return ler_tsplib(f.read())[1]
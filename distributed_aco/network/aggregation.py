@@ -0,0 +1,79 @@
+"""Combinação dos resultados de iteração de vários workers.
+
+Usada pelo coordenador e pelos subcoordenadores (:mod:`.relay`). Um
+resultado combinado tem o mesmo formato do resultado de um worker, mais o
+campo ``contribuintes``: quantos workers (folhas da árvore) ele representa.
+Como a média é ponderada por esse campo, combinar em vários níveis de uma
+árvore dá o mesmo resultado que combinar todos os workers de uma vez.
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .protocol import decodificar_matriz
+
+
+def combinar_resultados(resultados: Iterable[Dict], tamanho_elite: int = 3,
+                        dtype=None) -> Optional[Dict]:
+    """Melhor rota, média ponderada do feromônio e elite conjunta de ``resultados``.
+
+    ``feromonios`` do resultado é um ``ndarray`` (no ``dtype`` pedido) ou
+    ``None`` se nenhum resultado trouxe matriz (modo de ilhas).
+    ``tempo_iteracao`` é o tempo de cálculo equivalente do grupo: total de
+    formigas dividido pela soma das vazões (os workers rodam em paralelo),
+    então o balanceador mede o grupo como mede um worker.
+    """
+    resultados = list(resultados)
+    if not resultados:
+        return None
+    melhor = min(resultados, key=lambda r: r["melhor_distancia"])
+
+    # Média acumulada no lugar, sem empilhar as k matrizes n×n
+    soma, peso_total = None, 0
+    for r in resultados:
+        if not r.get("feromonios"):
+            continue
+        peso = r.get("contribuintes", 1)
+        matriz = decodificar_matriz(r["feromonios"], dtype)
+        if soma is None:
+            soma = matriz.astype(dtype or np.result_type(matriz, np.float64), copy=True)
+            if peso != 1:
+                soma *= peso
+        elif peso == 1:
+            soma += matriz
+        else:
+            soma += matriz * peso
+        peso_total += peso
+    if soma is not None:
+        soma /= peso_total
+
+    formigas = [r.get("num_formigas") for r in resultados]
+    vazoes = [(r["num_formigas"], r["num_formigas"] / r["tempo_iteracao"]) for r in resultados
+              if r.get("num_formigas") and r.get("tempo_iteracao")]
+    medias = [(r["media_iteracao"], r.get("contribuintes", 1)) for r in resultados
+              if r.get("media_iteracao") is not None]
+    return {
+        "node_id": melhor.get("node_id", ""),
+        "melhor_distancia": melhor["melhor_distancia"],
+        "melhor_caminho": melhor["melhor_caminho"],
+        "media_iteracao": (sum(m * p for m, p in medias) / sum(p for _, p in medias)) if medias else None,
+        "feromonios": soma,
+        "contribuintes": sum(r.get("contribuintes", 1) for r in resultados),
+        "elite": combinar_elites([r.get("elite", []) for r in resultados], tamanho_elite),
+        "num_formigas": sum(formigas) if None not in formigas else None,
+        "tempo_iteracao": (sum(n for n, _ in vazoes) / sum(v for _, v in vazoes)) if vazoes else None,
+    }
+
+
+def combinar_elites(elites: Iterable[List[Dict]], tamanho_elite: int = 3) -> List[Dict]:
+    """As ``tamanho_elite`` melhores rotas distintas entre várias listas de elite."""
+    vistas, elite = set(), []
+    for rota in sorted((r for e in elites for r in e), key=lambda r: r["distancia"]):
+        chave = tuple(rota["caminho"])
+        if chave not in vistas:
+            vistas.add(chave)
+            elite.append(rota)
+            if len(elite) == tamanho_elite:
+                break
+    return elite
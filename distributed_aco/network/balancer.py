@@ -0,0 +1,92 @@
+"""Balanceamento de carga entre workers heterogêneos.
+
+O custo de uma iteração é proporcional ao número de formigas, então a
+vazão de cada worker (formigas por segundo) basta para dividir a colônia
+de forma que todos terminem cada rodada ao mesmo tempo.
+"""
+from __future__ import annotations
+from typing import Dict
+
+# Conjugado da razão áurea: gera uma sequência bem espalhada em [0, 1)
+_PHI = 0.6180339887498949
+
+
+def parametros_diversos(indice: int, alpha: float = 1.0, beta: float = 2.0) -> Dict[str, float]:
+    """``alpha``/``beta`` do ``indice``‑ésimo worker, variando entre 0,5x e 2x da base.
+
+    O worker 0 recebe exatamente os valores base.
+    """
+    u = (0.5 + indice * _PHI) % 1.0
+    v = (0.5 + indice * _PHI * _PHI) % 1.0
+    return {"alpha": alpha * 2 ** (2 * u - 1), "beta": beta * 2 ** (2 * v - 1)}
+
+
+def dividir_proporcional(total: int, pesos: Dict[str, float], minimo: int = 1) -> Dict[str, int]:
+    """Divide ``total`` formigas proporcionalmente a ``pesos`` (maiores restos)."""
+    soma = sum(pesos.values())
+    ideal = {w: total * p / soma for w, p in pesos.items()}
+    alvo = {w: max(minimo, int(ideal[w])) for w in pesos}
+    # maiores restos recebem as formigas que sobraram do arredondamento
+    sobra = total - sum(alvo.values())
+    for w in sorted(pesos, key=lambda w: ideal[w] - int(ideal[w]), reverse=True)[:max(sobra, 0)]:
+        alvo[w] += 1
+    return alvo
+
+
+class ThroughputBalancer:
+    """Redistribui o total de formigas proporcionalmente à vazão medida.
+
+    ``suavizacao`` é o peso da nova medida na média móvel exponencial da
+    vazão; mudanças menores que ``tolerancia`` (fração) são ignoradas para
+    não reconfigurar workers a cada ruído de medida. O total dividido é
+    sempre a soma das formigas registradas, então a colônia não cresce nem
+    encolhe com os arredondamentos.
+    """
+
+    def __init__(self, suavizacao: float = 0.5, tolerancia: float = 0.1,
+                 min_formigas: int = 1) -> None:
+        self.suavizacao = suavizacao
+        self.tolerancia = tolerancia
+        self.min_formigas = min_formigas
+        self.formigas: Dict[str, int] = {}
+        self.registradas: Dict[str, int] = {}
+        self.vazao: Dict[str, float] = {}
+        self.tempo: Dict[str, float] = {}
+
+    def registrar(self, node_id: str, num_formigas: int) -> None:
+        self.formigas[node_id] = int(num_formigas)
+        self.registradas[node_id] = int(num_formigas)
+
+    def remover(self, node_id: str) -> None:
+        for d in (self.formigas, self.registradas, self.vazao, self.tempo):
+            d.pop(node_id, None)
+
+    def observar(self, node_id: str, tempo_iteracao: float | None,
+                 num_formigas: int | None = None) -> None:
+        if num_formigas is not None:
+            self.formigas[node_id] = int(num_formigas)
+        if not tempo_iteracao or tempo_iteracao <= 0 or node_id not in self.formigas:
+            return
+        self.tempo[node_id] = tempo_iteracao
+        medida = self.formigas[node_id] / tempo_iteracao
+        anterior = self.vazao.get(node_id)
+        self.vazao[node_id] = medida if anterior is None else (
+            self.suavizacao * medida + (1 - self.suavizacao) * anterior)
+
+    def rebalancear(self) -> Dict[str, int]:
+        """Novas contagens de formigas dos workers que devem mudar."""
+        workers = [w for w in self.formigas if w in self.vazao]
+        if len(workers) < 2 or len(workers) < len(self.formigas):
+            return {}
+
+        total = sum(self.registradas.get(w, self.formigas[w]) for w in workers)
+        alvo = dividir_proporcional(total, {w: self.vazao[w] for w in workers}, self.min_formigas)
+
+        # Só reconfigura se alguém mudar além da tolerância; aí aplica a divisão
+        # inteira, senão os que ficaram para trás fariam o total derivar
+        if all(abs(n - self.formigas[w]) <= self.tolerancia * self.formigas[w]
+               for w, n in alvo.items()):
+            return {}
+        mudancas = {w: n for w, n in alvo.items() if n != self.formigas[w]}
+        self.formigas.update(mudancas)
+        return mudancas
@@ -1,26 +1,118 @@
-
 import socket
 import threading
 import json
+import random
 import time
 from typing import Dict, List
 import numpy as np
 
+from ..core.aco_engine import PRECISOES
 from ..core.cidade import Cidade
-from ..plotting import plotar_solucao, plotar_solucao_3d_plotly
+from ..core.convergencia import CriterioParada, MOTIVO_LIMITE_ITERACOES
+from ..core.decomposicao import (MODOS as MODOS_DECOMPOSICAO, comprimento_rota, coordenadas,
+                                 costurar, ordenar_grupos, particionar, refinar_janelas,
+                                 resolver_subproblema)
+from ..core.lote import resolver_lote
+from ..core.partida_quente import PartidaQuente, reforcar_rota, salvar_feromonios
+from .aggregation import combinar_resultados
+from .balancer import ThroughputBalancer, parametros_diversos
+from .jobs import Job, JobDirectory
+from .sharing import SharingPolicy
+from .topology import origens
+from .protocol import MessageReader, codificar_matriz, send_msg
+
+# Espera máxima por um lote de subproblemas (cada um roda o ACO inteiro)
+TIMEOUT_SUBPROBLEMAS = 600.0
 
 class Coordinator:
-    def __init__(self, port: int = 8000, max_iters: int = 100) -> None:
+    def __init__(self, port: int = 8000, max_iters: int = 100,
+                 criterio: CriterioParada | None = None,
+                 lobby_wait_seconds: float = 15,
+                 iter_timeout: float = 30.0,
+                 jobs_dir: str | None = None,
+                 balancear: bool = True,
+                 diversificar: bool = False,
+                 cooperacao: str = "media",
+                 topologia: str = "anel",
+                 vizinhos: int = 2,
+                 intervalo_migracao: int = 5,
+                 tamanho_elite: int = 3,
+                 compartilhamento: SharingPolicy | None = None,
+                 precisao: str = "float64",
+                 busca_local: bool = False,
+                 cidades: List[Cidade] | None = None,
+                 decomposicao: str | None = None,
+                 tamanho_cluster: int = 200,
+                 iters_cluster: int = 50,
+                 partida_quente: PartidaQuente | None = None,
+                 salvar_feromonios: str | None = None,
+                 pipeline: int = 0) -> None:
+        if precisao not in PRECISOES:
+            raise ValueError(f"Precisão desconhecida: {precisao!r}")
+        if decomposicao is not None and decomposicao not in MODOS_DECOMPOSICAO:
+            raise ValueError(f"Modo de decomposição desconhecido: {decomposicao!r}")
+        if pipeline < 0:
+            raise ValueError(f"Atraso do pipeline deve ser >= 0: {pipeline}")
         self.port = port
         self.max_iters = max_iters
+        self.criterio = criterio or CriterioParada()
+        self.lobby_wait_seconds = lobby_wait_seconds
+        self.iter_timeout = iter_timeout
         self.clients: Dict[str, socket.socket] = {}
+        # Uma trava de envio por worker: a thread do cliente e a do laço
+        # principal escrevem no mesmo socket
+        self._travas_envio: Dict[str, threading.Lock] = {}
         self.iter_results: Dict[str, dict] = {}
         self.global_best = {"distance": float("inf"), "path": [], "node_id": ""}
         self.global_pheromone: np.ndarray | None = None
-        self.cities = self._sample_cities()
+        self.cities = cidades or self._sample_cities()
+        self.job_id = "padrao"
+        self.parametros: Dict = {}
+        self.job_source = JobDirectory(jobs_dir) if jobs_dir else None
+        self.balancer = ThroughputBalancer() if balancear else None
+        self.diversificar = diversificar
+        # Parâmetros próprios de cada worker (formigas balanceadas, alpha/beta diversos)
+        self.worker_params: Dict[str, Dict] = {}
+        # formigas com que cada worker se registrou (padrão quando o job não fixa)
+        self._formigas_registro: Dict[str, int] = {}
+        self._diversity_index = 0
+        # "media": média das matrizes de feromônio; "ilhas": migração de rotas de elite
+        if cooperacao not in ("media", "ilhas"):
+            raise ValueError(f"Modo de cooperação desconhecido: {cooperacao!r}")
+        self.cooperacao = cooperacao
+        self.topologia = topologia
+        self.vizinhos = vizinhos
+        self.intervalo_migracao = intervalo_migracao
+        self.tamanho_elite = tamanho_elite
+        self.compartilhamento = compartilhamento or SharingPolicy()
+        self.precisao = precisao
+        self.busca_local = busca_local
+        # Decomposição espacial: os workers resolvem grupos de ~tamanho_cluster
+        # cidades, sem nunca receber a instância inteira (ver core.decomposicao)
+        self.decomposicao = decomposicao
+        self.tamanho_cluster = tamanho_cluster
+        self.iters_cluster = iters_cluster
+        # Rota e/ou feromônio de uma execução anterior (os jobs podem trazer a sua)
+        self.partida_quente = partida_quente
+        self._partida: Dict | None = None
+        self.salvar_feromonios = salvar_feromonios
+        # Job em lote: [(id, cidades), ...] de instâncias pequenas (ver core.lote)
+        self.lote: List | None = None
+        self.resultados_lote: List[Dict] = []
+        # Modo pipeline: os workers iteram sem esperar a rodada, até `pipeline`
+        # iterações à frente da última que o coordenador incorporou (0 = lock-step)
+        self.pipeline = pipeline
+        self._filas: Dict[str, List[dict]] = {}
+        self._incorporadas: Dict[str, int] = {}
+        self._em_pipeline = False
+        self._rng = random.Random()
         self.running = False
         self.lock = threading.Lock()
-        self.start_event = threading.Event()
+        self.plot_process = None
+        self.server_sock: socket.socket | None = None
+        self.iterations_done = 0
+        self.stop_reason = ""
+        self.perfilador = None  # ver distributed_aco.profiling
 
     def _sample_cities(self) -> List[Cidade]:
         coords = [
@@ -30,137 +122,584 @@ class Coordinator:
         ]
         return [Cidade(i, x, y, n) for i, (x, y, n) in enumerate(coords)]
 
-    def start(self) -> None:
+    def _listen(self) -> socket.socket:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.bind(("0.0.0.0", self.port))
         sock.listen(10)
+        return sock
+
+    def start(self) -> None:
+        self.server_sock = self._listen()
         self.running = True
-        
+
         print(f"🏛️  Coordinator listening on :{self.port}. Pressione Ctrl+C para sair.")
-        
-        orchestrator_thread = threading.Thread(target=self._orchestration_loop, daemon=True)
-        orchestrator_thread.start()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
 
         try:
-            while self.running:
-                client_sock, addr = sock.accept()
-                threading.Thread(target=self._handle_client, args=(client_sock, addr), daemon=True).start()
+            print(f"🏛️  Sala de espera aberta por {self.lobby_wait_seconds} segundos...")
+            time.sleep(self.lobby_wait_seconds)
+
+            with self.lock:
+                num_workers = len(self.clients)
+            if num_workers == 0 and self.job_source is None:
+                print("❌ Nenhum worker se conectou. Encerrando.")
+                return
+
+            if self.job_source is not None:
+                self._serve_jobs()
+            else:
+                print(f"🚀 Iniciando otimização com {num_workers} worker(s).")
+                self._solve()
         except KeyboardInterrupt:
             print("\n🔌 Encerrando o coordenador...")
         finally:
-            
+            if self.job_source is not None:
+                self._broadcast({"tipo": "finalizar", "encerrar": True})
             self.running = False
-            self.start_event.set()
-            sock.close()
+            self.server_sock.close()
+
+    def _solve(self) -> None:
+        """Resolve o problema único (sem fila de jobs)."""
+        self._run()
+        if self.salvar_feromonios and self.global_pheromone is not None:
+            salvar_feromonios(self.salvar_feromonios, self.global_pheromone, self.cities)
+            print(f"💾 Matriz de feromônio salva em '{self.salvar_feromonios}'")
+        self._finish_plotting()
+
+    def _serve_jobs(self) -> None:
+        """Processa os jobs do diretório indefinidamente, sem desconectar os workers."""
+        default_iters, default_criterio = self.max_iters, self.criterio
+        default_partida = self.partida_quente
+        print(f"📂 Aguardando jobs em '{self.job_source.caminho}'...")
+        while self.running:
+            job = self.job_source.next_job(timeout=5.0)
+            if job is None:
+                continue
+            while self.running and not self.clients:
+                time.sleep(1.0)
+            try:
+                self._load_job(job, default_iters, default_criterio, default_partida)
+                with self.lock:
+                    num_workers = len(self.clients)
+                tamanho = f"{len(job.lote)} instâncias" if job.lote is not None else f"{len(job.cidades)} cidades"
+                print(f"🚀 Job '{job.job_id}': {tamanho}, {num_workers} worker(s).")
+                self._run()
+                saida = self.job_source.complete(job, self.report(), self.global_pheromone)
+                print(f"💾 Resultado do job '{job.job_id}' salvo em '{saida}'")
+            except Exception as e:
+                # Um job ruim não derruba o serviço: os workers param e esperam o próximo
+                print(f"❌ Job '{job.job_id}' falhou: {e}")
+                self._broadcast({"tipo": "finalizar", "job_id": job.job_id, "encerrar": False})
+                self.job_source.fail(job)
+
+    def _load_job(self, job: Job, default_iters: int, default_criterio: CriterioParada,
+                  default_partida: PartidaQuente | None = None) -> None:
+        with self.lock:
+            self.job_id = job.job_id
+            self.cities = job.cidades
+            self.parametros = job.parametros
+            self.max_iters = job.max_iters if job.max_iters is not None else default_iters
+            self.criterio = job.criterio(default_criterio)
+            self.partida_quente = job.partida_quente or default_partida
+            self.lote = job.lote
+            self.resultados_lote = []
+            self._partida = None
+            self.global_best = {"distance": float("inf"), "path": [], "node_id": ""}
+            self.iter_results.clear()
+            # A nova configuração recria os engines: reenvia só a diversidade
+            for params in self.worker_params.values():
+                params.pop("num_formigas", None)
+            overrides = {w: dict(p) for w, p in self.worker_params.items() if p}
+            if self.balancer:
+                # ... e o balanceamento recomeça das formigas do job (ou do registro)
+                for node_id, ants in self._formigas_registro.items():
+                    self.balancer.registrar(node_id, self.parametros.get("num_formigas", ants))
+        self._broadcast(self._config_msg())
+        for node_id, params in overrides.items():
+            self._send_to(node_id, {"tipo": "ajustar_parametros", **params})
+
+    def _config_msg(self) -> dict:
+        msg = {"tipo": "configuracao", "job_id": self.job_id,
+               "cidades": [c.to_dict() for c in self.cities],
+               "parametros": self.parametros,
+               "precisao": self.precisao,
+               "busca_local": self.busca_local,
+               "cooperacao": {"modo": self.cooperacao, "tamanho_elite": self.tamanho_elite}}
+        if self.lote is not None:
+            msg.update(cidades=[], lote=True)
+        elif self.decomposicao:
+            # Os subproblemas chegam depois, com as suas próprias cidades
+            msg.update(cidades=[], decomposicao=self.decomposicao)
+        elif self.partida_quente:
+            partida = self._dados_partida()
+            msg["partida_quente"] = {
+                "caminho": partida["caminho"], "reforco": partida["reforco"],
+                "feromonios": None if partida["feromonios"] is None
+                else codificar_matriz(partida["feromonios"])}
+        if self.pipeline and self.lote is None and not self.decomposicao:
+            msg["pipeline"] = self.pipeline
+        return msg
+
+    def _dados_partida(self) -> Dict | None:
+        """Rota reparada e matriz remapeadas para as cidades atuais (carregadas uma vez)."""
+        if self.partida_quente is None:
+            return None
+        if self._partida is None:
+            self._partida = self.partida_quente.preparar(self.cities, self._dtype_feromonio())
+        return self._partida
+
+    def _accept_loop(self) -> None:
+        if self.server_sock is None:
+            self.server_sock = self._listen()
+        while self.running:
+            try:
+                client_sock, addr = self.server_sock.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._handle_client, args=(client_sock, addr), daemon=True).start()
 
     def _handle_client(self, sock: socket.socket, addr) -> None:
         node_id = None
+        reader = MessageReader(sock)
         try:
-            data = sock.recv(4096).decode()
-            msg = json.loads(data)
-            if msg.get("tipo") != "registro": return
-            
+            msg = reader.recv()
+            if not msg or msg.get("tipo") != "registro": return
+
             node_id = msg.get("node_id")
-            with self.lock:
-                self.clients[node_id] = sock
-            
-            conf = {"tipo": "configuracao", "cidades": [c.to_dict() for c in self.cities]}
-            sock.send(json.dumps(conf).encode())
+            trava = threading.Lock()
+            with trava:
+                # O worker é publicado já com a trava tomada: qualquer envio do
+                # laço principal espera a configuração chegar primeiro
+                with self.lock:
+                    self.clients[node_id] = sock
+                    self._travas_envio[node_id] = trava
+                    conf = self._config_msg()
+                    params = self._register_worker(node_id, msg)
+                    em_pipeline = self._em_pipeline
+                send_msg(sock, conf)
+                if params:
+                    send_msg(sock, {"tipo": "ajustar_parametros", **params})
+                if em_pipeline:
+                    # Chegou no meio de uma execução em pipeline: já começa a iterar
+                    send_msg(sock, {"tipo": "executar_iteracao"})
             print(f"✅ Worker {node_id} conectado de {addr}")
 
             while self.running:
-                self.start_event.wait()
-                if not self.running: break
-
-                pheromones = self.global_pheromone.tolist() if self.global_pheromone is not None else []
-                sock.send(json.dumps({"tipo": "executar_iteracao", "feromonios": pheromones}).encode())
-                
-                result_data = sock.recv(8192).decode()
-                if not result_data: break
-                
-                rsp = json.loads(result_data)
-                if rsp.get("tipo") == "resultado_iteracao":
+                rsp = reader.recv()
+                if rsp is None: break
+
+                if rsp.get("tipo") in ("resultado_iteracao", "resultado_avaliacao",
+                                     "resultado_subproblemas", "resultado_lote"):
                     with self.lock:
-                        self.iter_results[node_id] = rsp["dados"]
+                        # Resultados atrasados de um job anterior são descartados
+                        if rsp.get("job_id", self.job_id) == self.job_id:
+                            if self._em_pipeline and rsp["tipo"] == "resultado_iteracao":
+                                self._filas.setdefault(node_id, []).append(rsp["dados"])
+                            else:
+                                self.iter_results[node_id] = rsp["dados"]
         except (json.JSONDecodeError, ConnectionResetError, BrokenPipeError, OSError):
             pass
         finally:
             if node_id:
                 with self.lock:
                     self.clients.pop(node_id, None)
+                    self._travas_envio.pop(node_id, None)
+                    self.worker_params.pop(node_id, None)
+                    self._formigas_registro.pop(node_id, None)
+                    if self.balancer:
+                        self.balancer.remover(node_id)
                 print(f"➖ Worker {node_id} desconectado.")
             sock.close()
 
-    def _orchestration_loop(self):
-        lobby_wait_seconds = 15
-        print(f"🏛️  Sala de espera aberta por {lobby_wait_seconds} segundos...")
-        time.sleep(lobby_wait_seconds)
+    def _register_worker(self, node_id: str, msg: dict) -> Dict:
+        """Registra o worker no balanceador; devolve seus parâmetros próprios."""
+        self._formigas_registro[node_id] = msg.get("num_formigas", 20)
+        if self.balancer:
+            ants = self.parametros.get("num_formigas", self._formigas_registro[node_id])
+            self.balancer.registrar(node_id, ants)
+        params = {}
+        if self.diversificar:
+            params = parametros_diversos(self._diversity_index,
+                                         self.parametros.get("alpha", 1.0),
+                                         self.parametros.get("beta", 2.0))
+            self._diversity_index += 1
+        self.worker_params[node_id] = params
+        return params
+
+    def _rebalance(self) -> None:
+        """Ajusta as formigas de cada worker pela vazão medida na última iteração."""
+        if self.balancer is None:
+            return
+        with self.lock:
+            for node_id, r in self.iter_results.items():
+                self.balancer.observar(node_id, r.get("tempo_iteracao"), r.get("num_formigas"))
+            mudancas = self.balancer.rebalancear()
+            for node_id, n in mudancas.items():
+                self.worker_params.setdefault(node_id, {})["num_formigas"] = n
+        for node_id, n in mudancas.items():
+            self._send_to(node_id, {"tipo": "ajustar_parametros", "num_formigas": n})
 
+    def _migrate(self) -> None:
+        """Envia a cada worker as rotas de elite das ilhas vizinhas na topologia."""
         with self.lock:
-            num_workers = len(self.clients)
-        if num_workers == 0:
-            print("❌ Nenhum worker se conectou. Encerrando.")
-            self.running = False
+            elites = {w: r.get("elite", []) for w, r in self.iter_results.items()}
+        mapa = origens(list(elites), self.topologia, self.vizinhos, self._rng)
+        for receptor, emissores in mapa.items():
+            rotas = sorted((rota for e in emissores for rota in elites[e]),
+                           key=lambda r: r["distancia"])[:self.tamanho_elite]
+            if rotas:
+                self._send_to(receptor, {"tipo": "migracao", "rotas": rotas})
+
+    def _broadcast(self, msg: dict) -> None:
+        """Envia ``msg`` a todos os workers, descartando os que caíram."""
+        data = (json.dumps(msg) + "\n").encode()
+        with self.lock:
+            clients = [(node_id, sock, self._trava_envio(node_id)) for node_id, sock in self.clients.items()]
+        for node_id, sock, trava in clients:
+            try:
+                with trava:
+                    sock.sendall(data)
+            except OSError:
+                with self.lock:
+                    self.clients.pop(node_id, None)
+                print(f"➖ Worker {node_id} removido (falha de envio).")
+
+    def _trava_envio(self, node_id: str) -> threading.Lock:
+        """Trava de envio do worker (chamar com ``self.lock`` tomado)."""
+        return self._travas_envio.setdefault(node_id, threading.Lock())
+
+    def _send_to(self, node_id: str, msg: dict) -> bool:
+        """Envia ``msg`` a um único worker; devolve False (e o descarta) se falhar."""
+        with self.lock:
+            sock = self.clients.get(node_id)
+            trava = self._trava_envio(node_id)
+        if sock is None:
+            return False
+        try:
+            with trava:
+                send_msg(sock, msg)
+            return True
+        except OSError:
+            with self.lock:
+                self.clients.pop(node_id, None)
+            print(f"➖ Worker {node_id} removido (falha de envio).")
+            return False
+
+    def _wait_results(self, n: int, timeout: float) -> bool:
+        """Aguarda o resultado de ``n`` workers (ou de todos os que restarem)."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                if len(self.iter_results) >= min(n, len(self.clients)):
+                    return True
+            time.sleep(0.005)
+        return False
+
+    def _coletar_pipeline(self, n: int, timeout: float) -> bool:
+        """Modo pipeline: aguarda um resultado novo de ``n`` workers.
+
+        Fica com o mais recente de cada um (os anteriores já estão contidos
+        nele: melhor rota e feromônio são cumulativos no engine) e anota até
+        qual iteração de cada worker a rodada incorporou.
+        """
+        completo = False
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                prontos = sum(1 for w in self.clients if self._filas.get(w))
+                if prontos >= min(n, len(self.clients)):
+                    completo = True
+                    break
+            time.sleep(0.005)
+        with self.lock:
+            for node_id, fila in self._filas.items():
+                if fila:
+                    self.iter_results[node_id] = fila[-1]
+                    self._incorporadas[node_id] = fila[-1].get("iteracao", 0)
+            self._filas.clear()
+        return completo
+
+    def _run(self) -> None:
+        if self.lote is not None:
+            self._run_lote()
+            return
+        if self.decomposicao:
+            self._run_decomposto()
             return
-            
-        print(f"🚀 Iniciando otimização com {num_workers} worker(s).")
-        
-        self.global_pheromone = np.ones((len(self.cities), len(self.cities))) * 0.1
+        self.global_pheromone = np.full((len(self.cities), len(self.cities)), 0.1,
+                                        dtype=self._dtype_feromonio())
+        self._aplicar_partida()
+        self.compartilhamento.reiniciar()
+        self.criterio.iniciar()
+        self.stop_reason = MOTIVO_LIMITE_ITERACOES
+        self.iterations_done = 0
+        if self.pipeline:
+            with self.lock:
+                self._filas.clear()
+                self._incorporadas.clear()
+                self._em_pipeline = True
+            # Uma ordem só: daqui em diante os workers iteram sozinhos
+            self._broadcast({"tipo": "executar_iteracao"})
 
-        for it in range(self.max_iters):
-            if not self.running: break
+        while self.running and (not self.max_iters or self.iterations_done < self.max_iters):
+            it = self.iterations_done + 1
+            if self.perfilador:
+                self.perfilador.iteracao(it)
 
             with self.lock:
                 self.iter_results.clear()
-            
-            self.start_event.clear()
-            self.start_event.set()
-            
-            time.sleep(1)
-            
-            self.start_event.clear()
-            
+                num_workers = len(self.clients)
+            if num_workers == 0:
+                self.stop_reason = "todos os workers desconectaram"
+                break
+
+            if self.pipeline:
+                self._coletar_pipeline(num_workers, self.iter_timeout)
+            else:
+                self._broadcast({"tipo": "executar_iteracao"})
+                self._wait_results(num_workers, self.iter_timeout)
+
             with self.lock:
                 self._aggregate()
+            self._rebalance()
+            if self.cooperacao == "ilhas":
+                if it % self.intervalo_migracao == 0:
+                    self._migrate()
+            elif self.compartilhamento.deve_enviar(it, self.global_pheromone):
+                # Os workers misturam a matriz global antes da próxima iteração
+                self._broadcast({"tipo": "atualizar_feromonios",
+                                 "feromonios": codificar_matriz(self.global_pheromone),
+                                 "peso": self.compartilhamento.peso})
+            if self.pipeline:
+                # Libera os workers que esperavam por esta rodada
+                with self.lock:
+                    incorporadas = dict(self._incorporadas)
+                self._broadcast({"tipo": "sincronizar", "iteracao": it, "incorporadas": incorporadas})
+            self.iterations_done = it
 
-            if (it + 1) % 5 == 0 or it == self.max_iters - 1:
-                self._print_status(it + 1)
-        
-        self.running = False
-        self.start_event.set()
-        self._finish_plotting()
+            motivo = self.criterio.verificar(self.global_best["distance"], self.global_pheromone)
+            if motivo:
+                self.stop_reason = motivo
+                self._print_status(it)
+                break
+            if it % 5 == 0 or it == self.max_iters:
+                self._print_status(it)
+
+        self._encerrar_execucao()
+
+    def _encerrar_execucao(self) -> None:
+        with self.lock:
+            self._em_pipeline = False
+            self._filas.clear()
+        if self.perfilador:
+            self.perfilador.parar()
+        # Em modo de fila os workers continuam conectados para o próximo job
+        self._broadcast({"tipo": "finalizar", "job_id": self.job_id,
+                         "encerrar": self.job_source is None})
+        self._print_report()
+
+    def _aplicar_partida(self) -> None:
+        """Parte da solução anterior, exatamente como os engines dos workers."""
+        partida = self._dados_partida()
+        if not partida:
+            return
+        if partida["feromonios"] is not None:
+            self.global_pheromone[...] = partida["feromonios"]
+            print(f"♻️  Feromônio inicial carregado de '{self.partida_quente.feromonios}'")
+        caminho = partida["caminho"]
+        if caminho:
+            reforcar_rota(self.global_pheromone, caminho, partida["reforco"])
+            distancia = comprimento_rota(coordenadas(self.cities), caminho)
+            self.global_best = {"distance": distancia, "path": caminho, "node_id": "partida_quente"}
+            print(f"♻️  Rota anterior reparada para {len(caminho)} cidades: {distancia:.2f}")
+
+    # --------------------------------------------------------------
+    #  Decomposição espacial
+    # --------------------------------------------------------------
+    def _run_decomposto(self) -> None:
+        """Particiona as cidades, resolve os grupos nos workers e costura as sub-rotas."""
+        self.iterations_done = 0
+        self.global_pheromone = None
+        xy = coordenadas(self.cities)
+        grupos = particionar(self.cities, self.decomposicao, self.tamanho_cluster,
+                             seed=self._rng.randrange(2 ** 31))
+        print(f"🧩 {len(self.cities)} cidades divididas em {len(grupos)} grupo(s) "
+              f"({self.decomposicao}, até ~{self.tamanho_cluster} por grupo).")
+
+        subrotas = self._resolver_grupos(grupos)
+        if len(subrotas) < len(grupos):
+            self.stop_reason = "interrompido antes de resolver todos os grupos"
+        else:
+            ordem = ordenar_grupos(xy, grupos)
+            rota = costurar(xy, [subrotas[g] for g in ordem])
+            costurada = comprimento_rota(xy, rota)
+            rota = refinar_janelas(xy, rota)
+            distancia = comprimento_rota(xy, rota)
+            print(f"🧵 Rota costurada: {costurada:.2f}; após o refinamento: {distancia:.2f}")
+            self.global_best = {"distance": distancia, "path": rota, "node_id": "decomposicao"}
+            self.iterations_done = self.iters_cluster
+            self.stop_reason = f"{len(grupos)} grupo(s) resolvido(s) e costurado(s)"
+        self._encerrar_execucao()
+
+    def _resolver_grupos(self, grupos: List[np.ndarray]) -> Dict[int, List[int]]:
+        """Resolve os grupos nos workers; devolve as rotas em índices globais."""
+        params = self._parametros_execucao()
+        base = self._rng.randrange(2 ** 31)
+        itens = {idx: {"cidades": [self.cities[i].to_dict() for i in grupo], "seed": base + idx}
+                 for idx, grupo in enumerate(grupos)}
+
+        def resolver_local(pendentes: Dict[int, Dict]) -> Dict[int, Dict]:
+            resultados = {}
+            for idx, sub in pendentes.items():
+                cidades = [Cidade.from_dict(c) for c in sub["cidades"]]
+                caminho, dist = resolver_subproblema(cidades, params, self.iters_cluster, sub["seed"])
+                resultados[idx] = {"caminho": caminho, "distancia": dist}
+            return resultados
+
+        resultados = self._distribuir("resolver_subproblemas", "subproblemas", itens,
+                                      {"parametros": params, "iteracoes": self.iters_cluster},
+                                      resolver_local)
+        return {idx: [int(grupos[idx][c]) for c in r["caminho"]] for idx, r in resultados.items()}
+
+    def _parametros_execucao(self) -> Dict:
+        """Parâmetros do job mais a precisão e a busca local do coordenador."""
+        params = dict(self.parametros)
+        params.setdefault("precisao", self.precisao)
+        params.setdefault("busca_local", self.busca_local)
+        return params
+
+    def _distribuir(self, tipo: str, chave: str, itens: Dict[int, Dict], extra: Dict,
+                    resolver_local) -> Dict[int, Dict]:
+        """Distribui itens independentes entre os workers até todos terem resultado.
+
+        Cada worker recebe um lote (``msg[chave]``) por rodada, em round-robin,
+        como no modo sintonia; itens de workers que caíram voltam na rodada
+        seguinte. Sem workers, os que faltam vão para ``resolver_local``.
+        """
+        pendentes = dict(itens)
+        resultados: Dict[int, Dict] = {}
+        while pendentes and self.running:
+            with self.lock:
+                workers = sorted(self.clients)
+                self.iter_results.clear()
+            if not workers:
+                print(f"⚠️ Sem workers: resolvendo {len(pendentes)} item(ns) no coordenador.")
+                resultados.update(resolver_local(pendentes))
+                break
+
+            lotes: Dict[str, Dict[int, Dict]] = {}
+            for k, (idx, item) in enumerate(pendentes.items()):
+                lotes.setdefault(workers[k % len(workers)], {})[idx] = item
+            enviados = [w for w, lote in lotes.items() if self._send_to(w, {
+                "tipo": tipo, "job_id": self.job_id, chave: lote, **extra})]
+            self._wait_results(len(enviados), max(self.iter_timeout, TIMEOUT_SUBPROBLEMAS))
+
+            with self.lock:
+                respostas = list(self.iter_results.values())
+            for r in respostas:
+                for idx, res in r["resultados"].items():
+                    if pendentes.pop(int(idx), None) is not None:
+                        resultados[int(idx)] = res
+            print(f"   {len(resultados)}/{len(itens)} resolvido(s)")
+        return resultados
+
+    # --------------------------------------------------------------
+    #  Lotes de instâncias pequenas
+    # --------------------------------------------------------------
+    def _run_lote(self) -> None:
+        """Job em lote: as instâncias são divididas entre os workers, que resolvem
+        cada parte numa única chamada de :func:`..core.lote.resolver_lote`."""
+        if not self.max_iters or self.max_iters <= 0:
+            # ex.: job sem "iters" num coordenador iniciado com --iters 0
+            raise ValueError("Job em lote sem número de iterações: defina 'iters' >= 1 no job")
+        self.iterations_done = 0
+        self.global_pheromone = None
+        params = self._parametros_execucao()
+        seed = self._rng.randrange(2 ** 31)
+        itens = {idx: {"cidades": [c.to_dict() for c in cidades]}
+                 for idx, (_, cidades) in enumerate(self.lote)}
+        print(f"📦 Lote de {len(itens)} instância(s), {self.max_iters} iterações cada.")
+
+        def resolver_local(pendentes: Dict[int, Dict]) -> Dict[int, Dict]:
+            instancias = [[Cidade.from_dict(c) for c in item["cidades"]] for item in pendentes.values()]
+            return {idx: {"caminho": caminho, "distancia": dist} for idx, (caminho, dist)
+                    in zip(pendentes, resolver_lote(instancias, self.max_iters, seed=seed, **params))}
+
+        resultados = self._distribuir("resolver_lote", "instancias", itens,
+                                      {"parametros": params, "iteracoes": self.max_iters, "seed": seed},
+                                      resolver_local)
+        self.resultados_lote = []
+        for idx, (nome, cidades) in enumerate(self.lote):
+            r = resultados.get(idx)
+            self.resultados_lote.append({
+                "id": nome,
+                "melhor_distancia": r["distancia"] if r else float("inf"),
+                "melhor_caminho": r["caminho"] if r else [],
+                "melhor_rota_ids": [cidades[i].id for i in r["caminho"]] if r else [],
+            })
+        total = sum(r["melhor_distancia"] for r in self.resultados_lote)
+        self.global_best = {"distance": total, "path": [], "node_id": "lote"}
+        self.iterations_done = self.max_iters
+        self.stop_reason = (f"{len(resultados)} de {len(itens)} instância(s) resolvida(s)"
+                            if len(resultados) < len(itens) else f"lote de {len(itens)} instância(s) resolvido")
+        self._encerrar_execucao()
 
     def _aggregate(self):
         if not self.iter_results: return
 
-        best_iter = min(self.iter_results.values(), key=lambda r: r["melhor_distancia"])
-        if best_iter["melhor_distancia"] < self.global_best["distance"]:
+        combinado = combinar_resultados(self.iter_results.values(), self.tamanho_elite,
+                                        self._dtype_feromonio())
+        if combinado["melhor_distancia"] < self.global_best["distance"]:
             self.global_best.update({
-                "distance": best_iter["melhor_distancia"],
-                "path": best_iter["melhor_caminho"],
-                "node_id": best_iter["node_id"],
+                "distance": combinado["melhor_distancia"],
+                "path": combinado["melhor_caminho"],
+                "node_id": combinado["node_id"],
             })
+        if combinado["feromonios"] is not None:
+            self.global_pheromone = combinado["feromonios"]
 
-        all_pheromones = [np.array(r['feromonios']) for r in self.iter_results.values() if r.get('feromonios')]
-        if all_pheromones:
-            self.global_pheromone = np.mean(np.array(all_pheromones), axis=0)
+    def _dtype_feromonio(self):
+        """dtype da matriz global: o da precisão do job (ou do coordenador)."""
+        return PRECISOES[self.parametros.get("precisao", self.precisao)][1]
 
     def _print_status(self, it: int):
-        print(f"--- Iteração {it:3d}/{self.max_iters} | Melhor Global: {self.global_best['distance']:.2f} (Worker: {self.global_best.get('node_id', 'N/A')}) ---")
+        limite = self.max_iters or "∞"
+        print(f"--- Iteração {it:3d}/{limite} | Melhor Global: {self.global_best['distance']:.2f} (Worker: {self.global_best.get('node_id', 'N/A')}) ---")
+
+    def report(self) -> dict:
+        """Resumo final da execução (inclui o motivo de parada)."""
+        rel = {
+            "iteracoes": self.iterations_done,
+            "motivo_parada": self.stop_reason,
+            "melhor_distancia": self.global_best["distance"],
+            "melhor_caminho": self.global_best["path"],
+            # ids das cidades: servem de rota inicial mesmo se a instância mudar
+            "melhor_rota_ids": [self.cities[i].id for i in self.global_best["path"]],
+            "node_id": self.global_best["node_id"],
+        }
+        if self.lote is not None:
+            rel["lote"] = self.resultados_lote
+        if self.balancer:
+            rel["workers"] = {w: {"num_formigas": n, "tempo_iteracao": self.balancer.tempo.get(w)}
+                              for w, n in self.balancer.formigas.items()}
+        return rel
 
+    def _print_report(self):
+        rel = self.report()
+        print(f"🏁 Otimização finalizada após {rel['iteracoes']} iteração(ões): {rel['motivo_parada']}.")
+        print(f"   Melhor distância: {rel['melhor_distancia']:.2f} (Worker: {rel['node_id'] or 'N/A'})")
 
     def _finish_plotting(self):
         """
-        Este método é chamado ao final da otimização para gerar 
-        os resultados visuais.
+        Este método é chamado ao final da otimização para gerar
+        os resultados visuais, num processo separado para não atrasar o
+        encerramento do coordenador (o processo fica em ``plot_process``).
         """
-        print("🏁 Otimização finalizada.")
         if self.global_best["path"]:
+            # Importado aqui: só o coordenador, ao final, precisa das libs de gráficos
+            from ..plotting import gerar_graficos_em_segundo_plano
             titulo = f"Melhor Rota Global (Distância: {self.global_best['distance']:.2f})"
-
-            print("\nGerando gráfico 2D estático...")
-            plotar_solucao(self.cities, self.global_best["path"], titulo)
-
-            print("\nGerando gráfico 3D interativo...")
-            plotar_solucao_3d_plotly(self.cities, self.global_best["path"], titulo)
\ No newline at end of file
+            self.plot_process = gerar_graficos_em_segundo_plano(
+                self.cities, self.global_best["path"], titulo)
+            print(f"🖼️  Gráficos sendo gerados em segundo plano (pid {self.plot_process.pid}).")
@@ -0,0 +1,178 @@
+"""Fila de jobs do coordenador, alimentada por um diretório.
+
+Cada job é um arquivo ``*.json`` colocado no diretório observado::
+
+    {
+      "id": "entregas-2026-10-19",          # opcional (padrão: nome do arquivo)
+      "cidades": [{"id": 0, "x": 0, "y": 0, "nome": "Depósito"}, ...],
+      "arquivo": "instancias/berlin52.tsp",  # alternativa a "cidades" (TSPLIB)
+      "iters": 200,
+      "parametros": {"num_formigas": 30, "alpha": 1.0, "beta": 3.0, "rho": 0.1, "Q": 100,
+                     "precisao": "float32"},  # precisao: opcional (padrão: a do coordenador)
+      "parada": {"paciencia": 20, "tempo_max": 120},
+      "partida_quente": {"rota": "resultados/entregas-2026-10-18.json",   # opcional
+                         "feromonios": "resultados/entregas-2026-10-18.npz",
+                         "reforco": 1.0}
+    }
+
+Um job em lote traz muitas instâncias pequenas, resolvidas de uma vez
+(ver :mod:`distributed_aco.core.lote`); ``iters`` e ``parametros`` valem
+para todas::
+
+    {
+      "id": "veiculos-2026-10-19",
+      "lote": [{"id": "van-01", "cidades": [...]}, {"id": "van-02", "cidades": [...]}],
+      "iters": 100
+    }
+
+O arquivo é movido para ``em_andamento/`` ao ser retirado da fila e para
+``concluidos/`` ao terminar; o resultado é gravado em ``resultados/<id>.json``
+e a matriz de feromônio final em ``resultados/<id>.npz`` (pronta para a
+partida a quente do job do dia seguinte).
+Arquivos inválidos (e jobs cuja execução falhou) vão para ``falhas/``.
+"""
+from __future__ import annotations
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..core.aco_engine import PRECISOES
+from ..core.cidade import Cidade
+from ..core.convergencia import CriterioParada
+from ..core.partida_quente import PartidaQuente, salvar_feromonios
+from ..core.tsplib import carregar_tsplib
+
+PARAMETROS_ENGINE = ("num_formigas", "alpha", "beta", "rho", "Q", "precisao", "busca_local")
+PARAMETROS_NUMERICOS = ("num_formigas", "alpha", "beta", "rho", "Q")
+
+
+def _validar(job_id: str, parametros, parada, iters=None, lote: bool = False) -> None:
+    """Rejeita no parsing o que só falharia no meio do job (e derrubaria o serviço)."""
+    if iters is not None and (isinstance(iters, bool) or not isinstance(iters, int) or iters < 0):
+        raise ValueError(f"Job {job_id}: 'iters' deve ser um inteiro >= 0, não {iters!r}")
+    if lote and iters == 0:
+        # o lote não usa critérios de parada: 0 (= sem limite) não faz sentido
+        raise ValueError(f"Job {job_id}: jobs em lote precisam de 'iters' >= 1")
+    if parametros is not None:
+        if not isinstance(parametros, dict):
+            raise ValueError(f"Job {job_id}: 'parametros' deve ser um objeto")
+        for chave in PARAMETROS_NUMERICOS:
+            valor = parametros.get(chave)
+            if valor is not None and (isinstance(valor, bool) or not isinstance(valor, (int, float))):
+                raise ValueError(f"Job {job_id}: parâmetro {chave!r} deve ser numérico, não {valor!r}")
+        if parametros.get("num_formigas") is not None and parametros["num_formigas"] < 1:
+            raise ValueError(f"Job {job_id}: 'num_formigas' deve ser >= 1")
+        precisao = parametros.get("precisao")
+        if precisao is not None and precisao not in PRECISOES:
+            raise ValueError(f"Job {job_id}: Precisão desconhecida: {precisao!r} (use {', '.join(PRECISOES)})")
+    if parada is not None:
+        try:
+            CriterioParada(**parada)
+        except TypeError as e:
+            raise ValueError(f"Job {job_id}: 'parada' inválida ({e})") from None
+
+
+class Job:
+    """Uma instância do TSP mais os parâmetros com que deve ser resolvida."""
+
+    def __init__(self,
+                 job_id: str,
+                 cidades: List[Cidade],
+                 max_iters: int | None = None,
+                 parametros: Dict | None = None,
+                 parada: Dict | None = None,
+                 arquivo: str | None = None,
+                 partida_quente: PartidaQuente | None = None,
+                 lote: List[Tuple[str, List[Cidade]]] | None = None) -> None:
+        self.job_id = job_id
+        self.cidades = cidades
+        self.max_iters = max_iters
+        self.parametros = {k: v for k, v in (parametros or {}).items() if k in PARAMETROS_ENGINE}
+        self.parada = parada
+        self.arquivo = arquivo
+        self.partida_quente = partida_quente
+        self.lote = lote
+
+    @classmethod
+    def from_dict(cls, data: Dict, job_id: str, base_dir: str = ".") -> "Job":
+        _validar(job_id, data.get("parametros"), data.get("parada"), data.get("iters"), "lote" in data)
+        if "lote" in data:
+            lote = []
+            for k, inst in enumerate(data["lote"]):
+                cidades = [Cidade.from_dict(c) for c in inst["cidades"]]
+                if len(cidades) < 2:
+                    raise ValueError(f"Job {job_id}: instância {k} do lote precisa de ao menos 2 cidades")
+                lote.append((str(inst.get("id", k)), cidades))
+            if not lote:
+                raise ValueError(f"Job {job_id} com lote vazio")
+            return cls(data.get("id", job_id), [], data.get("iters"), data.get("parametros"),
+                       data.get("parada"), lote=lote)
+        if "cidades" in data:
+            cidades = [Cidade.from_dict(c) for c in data["cidades"]]
+        elif "arquivo" in data:
+            cidades = carregar_tsplib(os.path.join(base_dir, data["arquivo"]))
+        else:
+            raise ValueError(f"Job {job_id} sem 'cidades' nem 'arquivo'")
+        if len(cidades) < 2:
+            raise ValueError(f"Job {job_id} precisa de ao menos 2 cidades")
+        partida = data.get("partida_quente")
+        return cls(data.get("id", job_id), cidades, data.get("iters"),
+                   data.get("parametros"), data.get("parada"),
+                   partida_quente=PartidaQuente.from_dict(partida, base_dir) if partida else None)
+
+    def criterio(self, padrao: CriterioParada) -> CriterioParada:
+        return CriterioParada(**self.parada) if self.parada else padrao
+
+
+class JobDirectory:
+    """Observa um diretório e entrega os jobs em ordem alfabética de arquivo."""
+
+    def __init__(self, caminho: str, intervalo: float = 1.0) -> None:
+        self.caminho = caminho
+        self.intervalo = intervalo
+        for sub in ("em_andamento", "concluidos", "resultados", "falhas"):
+            os.makedirs(os.path.join(caminho, sub), exist_ok=True)
+
+    def _pendentes(self) -> List[str]:
+        return sorted(f for f in os.listdir(self.caminho)
+                      if f.endswith(".json") and os.path.isfile(os.path.join(self.caminho, f)))
+
+    def next_job(self, timeout: float) -> Optional[Job]:
+        """Retira o próximo job válido da fila, esperando até ``timeout`` segundos."""
+        deadline = time.time() + timeout
+        while True:
+            for nome in self._pendentes():
+                origem = os.path.join(self.caminho, nome)
+                destino = os.path.join(self.caminho, "em_andamento", nome)
+                os.replace(origem, destino)
+                try:
+                    with open(destino) as f:
+                        job = Job.from_dict(json.load(f), nome[:-len(".json")], self.caminho)
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    print(f"⚠️ Job '{nome}' inválido: {e}")
+                    os.replace(destino, os.path.join(self.caminho, "falhas", nome))
+                    continue
+                job.arquivo = nome
+                return job
+            if time.time() >= deadline:
+                return None
+            time.sleep(self.intervalo)
+
+    def complete(self, job: Job, relatorio: Dict, feromonios=None) -> str:
+        """Grava o resultado (e a matriz de feromônio) do job e o move para ``concluidos/``."""
+        saida = os.path.join(self.caminho, "resultados", f"{job.job_id}.json")
+        with open(saida, "w") as f:
+            json.dump({"job_id": job.job_id, **relatorio}, f, indent=2, ensure_ascii=False)
+        if feromonios is not None:
+            salvar_feromonios(saida[:-len(".json")] + ".npz", feromonios, job.cidades)
+        if job.arquivo:
+            os.replace(os.path.join(self.caminho, "em_andamento", job.arquivo),
+                       os.path.join(self.caminho, "concluidos", job.arquivo))
+        return saida
+
+    def fail(self, job: Job) -> None:
+        """Move para ``falhas/`` um job que falhou depois de sair da fila."""
+        if job.arquivo:
+            os.replace(os.path.join(self.caminho, "em_andamento", job.arquivo),
+                       os.path.join(self.caminho, "falhas", job.arquivo))
@@ -0,0 +1,107 @@
+"""Protocolo de mensagens entre coordenador e workers.
+
+Cada mensagem é um objeto JSON terminado por ``\\n`` (JSON Lines), o que
+permite enviar mensagens maiores que um único ``recv`` e várias mensagens
+seguidas sem que elas se misturem no fluxo TCP.
+
+Para compatibilidade, um pedaço recebido sem ``\\n`` que já forma um JSON
+completo também é aceito como mensagem (pares antigos enviavam um objeto
+por ``send``).
+
+Matrizes (feromônio) viajam em binário codificado em base64 — ver
+:func:`codificar_matriz` —, no dtype do engine que as produziu.
+"""
+from __future__ import annotations
+import base64
+import json
+import socket
+from typing import Optional, Union
+
+import numpy as np
+
+RECV_SIZE = 65536
+
+# Um erro de decodificação mais distante que isso do fim do buffer não pode
+# ser só uma mensagem truncada (números e literais são curtos).
+_CAUDA = 64
+
+
+def codificar_matriz(matriz: np.ndarray) -> dict:
+    """``{"dtype", "forma", "dados"}``: os bytes da matriz em base64.
+
+    Um float32 ocupa ~5,3 caracteres (contra ~19 de um float64 em texto JSON).
+    """
+    m = np.ascontiguousarray(matriz)
+    return {"dtype": m.dtype.str, "forma": list(m.shape),
+            "dados": base64.b64encode(m.tobytes()).decode("ascii")}
+
+
+def decodificar_matriz(obj: Union[dict, list], dtype=None) -> np.ndarray:
+    """Inverso de :func:`codificar_matriz`; também aceita listas aninhadas (formato antigo)."""
+    if isinstance(obj, dict):
+        matriz = np.frombuffer(base64.b64decode(obj["dados"]),
+                               dtype=np.dtype(obj["dtype"])).reshape(obj["forma"])
+    else:
+        matriz = np.asarray(obj)
+    return matriz if dtype is None else matriz.astype(dtype, copy=False)
+
+
+def send_msg(sock: socket.socket, msg: dict) -> None:
+    sock.sendall((json.dumps(msg) + "\n").encode())
+
+
+class MessageReader:
+    """Lê mensagens JSON completas de um socket, uma por chamada."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self._buf = bytearray()
+        self._busca = 0  # posição a partir da qual ainda não há '\n'
+
+    def recv(self) -> Optional[dict]:
+        """Devolve a próxima mensagem ou ``None`` se o par desconectou.
+
+        Levanta ``json.JSONDecodeError`` se o fluxo não contém JSON válido.
+        """
+        while True:
+            fim = self._buf.find(b"\n", self._busca)
+            if fim >= 0:
+                linha = bytes(self._buf[:fim])
+                del self._buf[:fim + 1]
+                self._busca = 0
+                if linha.strip():
+                    return json.loads(linha)
+                continue
+            self._busca = len(self._buf)
+
+            chunk = self.sock.recv(RECV_SIZE)
+            if not chunk:
+                pendente = bytes(self._buf)
+                self._buf.clear()
+                self._busca = 0
+                return json.loads(pendente) if pendente.strip() else None
+            self._buf += chunk
+
+            # Só tenta o formato antigo em buffers pequenos ou que terminem
+            # num objeto fechado, para não reanalisar mensagens grandes a cada pedaço.
+            if b"\n" not in chunk and (len(self._buf) <= RECV_SIZE or self._buf.endswith(b"}")):
+                msg = self._try_unframed()
+                if msg is not None:
+                    return msg
+
+    def _try_unframed(self) -> Optional[dict]:
+        try:
+            texto = self._buf.decode()
+        except UnicodeDecodeError:
+            return None  # caractere multibyte cortado: aguarda o resto
+        try:
+            msg = json.loads(texto)
+        except json.JSONDecodeError as e:
+            if e.pos < len(texto) - _CAUDA and not e.msg.startswith("Unterminated string"):
+                self._buf.clear()
+                self._busca = 0
+                raise
+            return None
+        self._buf.clear()
+        self._busca = 0
+        return msg
@@ -0,0 +1,237 @@
+"""Subcoordenador: um nó intermediário da árvore de agregação.
+
+Para os workers abaixo dele, o ``Relay`` é um coordenador; para o nó
+acima (o coordenador ou outro relay), é um único worker. A cada
+``executar_iteracao`` recebida de cima, ele repassa a ordem ao seu grupo,
+combina os resultados localmente com :func:`.aggregation.combinar_resultados`
+e envia um único resultado para cima. Assim o coordenador recebe uma matriz
+por subcoordenador, não uma por worker.
+
+No modo pipeline o relay continua em lock-step com o seu grupo: cada
+``sincronizar`` vindo de cima dispara a próxima rodada.
+"""
+from __future__ import annotations
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+from .aggregation import combinar_resultados
+from .balancer import dividir_proporcional
+from .coordinator import Coordinator
+from .protocol import MessageReader, codificar_matriz, send_msg
+
+class Relay(Coordinator):
+    """Agrega um grupo de workers e fala com o nó superior como um só worker.
+
+    ``port`` é a porta onde os workers do grupo se conectam; ``host`` e
+    ``port_superior`` apontam para o coordenador (ou outro subcoordenador).
+    """
+
+    def __init__(self,
+                 node_id: str,
+                 host: str = "localhost",
+                 port_superior: int = 8000,
+                 port: int = 8001,
+                 lobby_wait_seconds: float = 10,
+                 iter_timeout: float = 30.0,
+                 balancear: bool = True) -> None:
+        super().__init__(port=port, lobby_wait_seconds=lobby_wait_seconds,
+                         iter_timeout=iter_timeout, balancear=balancear)
+        self.node_id = node_id
+        self.host, self.port_superior = host, port_superior
+        self.upstream: Optional[socket.socket] = None
+        self.reader: Optional[MessageReader] = None
+        self._config: Optional[dict] = None
+        # O nó superior está em modo pipeline (ver Coordinator.pipeline)
+        self._pipeline_superior = False
+        self._formigas: Dict[str, int] = {}
+        # Formigas do grupo na última rodada com respostas
+        self._total_grupo = 0
+
+    # --------------------------------------------------------------
+    def start(self) -> None:
+        self.server_sock = self._listen()
+        self.running = True
+        print(f"🔀 Subcoordenador {self.node_id} ouvindo em :{self.port}.")
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+        try:
+            print(f"🔀 Aguardando workers por {self.lobby_wait_seconds} segundos...")
+            time.sleep(self.lobby_wait_seconds)
+            with self.lock:
+                num_workers = len(self.clients)
+            if num_workers == 0:
+                print("❌ Nenhum worker se conectou. Encerrando.")
+                return
+            if not self._conectar():
+                return
+            print(f"🔀 Subcoordenador {self.node_id} conectado a {self.host}:{self.port_superior} "
+                  f"com {num_workers} worker(s).")
+            self._loop()
+        except KeyboardInterrupt:
+            print("\n🔌 Encerrando o subcoordenador...")
+        finally:
+            self._broadcast({"tipo": "finalizar", "encerrar": True})
+            self.running = False
+            self.server_sock.close()
+            if self.upstream:
+                self.upstream.close()
+
+    def _conectar(self) -> bool:
+        try:
+            self.upstream = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.upstream.connect((self.host, self.port_superior))
+            with self.lock:
+                formigas = sum(self._formigas.get(w, 0) for w in self.clients)
+                num_workers = len(self.clients)
+            send_msg(self.upstream, {"tipo": "registro", "node_id": self.node_id,
+                                     "num_formigas": formigas, "workers": num_workers})
+            self.reader = MessageReader(self.upstream)
+            cfg = self.reader.recv()
+            if not cfg or cfg.get("tipo") != "configuracao":
+                return False
+            self._configurar(cfg)
+            return True
+        except OSError as e:
+            print(f"❌ Subcoordenador {self.node_id} falhou ao conectar: {e}")
+            return False
+
+    def _loop(self) -> None:
+        while self.running:
+            msg = self.reader.recv()
+            if msg is None:
+                print(f"🔌 Subcoordenador {self.node_id}: nó superior desconectou.")
+                return
+            tipo = msg.get("tipo")
+            if tipo == "executar_iteracao":
+                self._iteracao(msg)
+            elif tipo == "sincronizar":
+                if self._pipeline_superior:
+                    self._iteracao({"tipo": "executar_iteracao"})
+            elif tipo == "configuracao":
+                self._configurar(msg)
+            elif tipo == "ajustar_parametros":
+                self._ajustar(msg)
+            elif tipo == "avaliar_configuracoes":
+                self._repassar(msg, "configs", "resultado_avaliacao")
+            elif tipo == "resolver_subproblemas":
+                self._repassar(msg, "subproblemas", "resultado_subproblemas")
+            elif tipo == "resolver_lote":
+                self._repassar(msg, "instancias", "resultado_lote")
+            elif tipo in ("atualizar_feromonios", "migracao"):
+                self._broadcast(msg)
+            elif tipo == "finalizar":
+                self._broadcast(msg)
+                if msg.get("encerrar", True):
+                    print(f"🏁 Subcoordenador {self.node_id}: otimização finalizada.")
+                    return
+
+    # --------------------------------------------------------------
+    def _config_msg(self) -> dict:
+        # Workers que chegam depois recebem a configuração vinda de cima
+        return self._config if self._config is not None else super()._config_msg()
+
+    def _configurar(self, cfg: dict) -> None:
+        # O grupo abaixo roda em lock-step, comandado pelo relay
+        self._pipeline_superior = bool(cfg.get("pipeline"))
+        if "pipeline" in cfg:
+            cfg = {k: v for k, v in cfg.items() if k != "pipeline"}
+        with self.lock:
+            self._config = cfg
+            self.job_id = cfg.get("job_id")
+            self.parametros = dict(cfg.get("parametros") or {})
+            self.precisao = cfg.get("precisao", self.precisao)
+            self.tamanho_elite = (cfg.get("cooperacao") or {}).get("tamanho_elite", self.tamanho_elite)
+            self.iter_results.clear()
+            # Os engines são recriados: cada worker volta às formigas do job ou às próprias
+            for node_id in self.clients:
+                ants = self._formigas_registro.get(node_id, 20)
+                self._atualizar_formigas(node_id, self.parametros.get("num_formigas", ants))
+            for params in self.worker_params.values():
+                params.pop("num_formigas", None)
+        self._broadcast(cfg)
+
+    def _register_worker(self, node_id: str, msg: dict) -> Dict:
+        params = super()._register_worker(node_id, msg)
+        self._formigas[node_id] = self.parametros.get("num_formigas", self._formigas_registro[node_id])
+        return params
+
+    def _atualizar_formigas(self, node_id: str, n: int) -> None:
+        self._formigas[node_id] = n
+        if self.balancer:
+            self.balancer.registrar(node_id, n)
+
+    def _ajustar(self, msg: dict) -> None:
+        """Repassa os parâmetros; ``num_formigas`` é o total do grupo, dividido entre os workers."""
+        params = {k: v for k, v in msg.items() if k != "tipo"}
+        total = params.pop("num_formigas", None)
+        if params:
+            self._broadcast({"tipo": "ajustar_parametros", **params})
+        if total is None:
+            return
+        with self.lock:
+            atuais = {w: self._formigas.get(w, 1) for w in self.clients}
+            if not atuais:
+                return
+            novas = dividir_proporcional(int(total), atuais)
+            for node_id, n in novas.items():
+                self._atualizar_formigas(node_id, n)
+                self.worker_params.setdefault(node_id, {})["num_formigas"] = n
+        for node_id, n in novas.items():
+            self._send_to(node_id, {"tipo": "ajustar_parametros", "num_formigas": n})
+
+    def _rebalance(self) -> None:
+        super()._rebalance()
+        if self.balancer:
+            with self.lock:
+                self._formigas.update(self.balancer.formigas)
+
+    # --------------------------------------------------------------
+    def _iteracao(self, msg: dict) -> None:
+        """Uma rodada do grupo: repassa, espera, combina e responde para cima."""
+        inicio = time.perf_counter()
+        if self.perfilador:
+            self.perfilador.iteracao(self.iterations_done + 1)
+        with self.lock:
+            self.iter_results.clear()
+            num_workers = len(self.clients)
+        self._broadcast(msg)
+        self._wait_results(num_workers, self.iter_timeout)
+
+        with self.lock:
+            combinado = combinar_resultados(self.iter_results.values(), self.tamanho_elite,
+                                            self._dtype_feromonio())
+            registradas = sum(self._formigas.get(w, 0) for w in self.clients)
+        self._rebalance()
+        self.iterations_done += 1
+
+        if combinado is None:
+            # Nenhum worker respondeu: responde mesmo assim para não travar o nó superior,
+            # com as formigas do grupo (0 zeraria a vazão no balanceamento de cima)
+            combinado = {"node_id": self.node_id, "melhor_distancia": float("inf"),
+                         "melhor_caminho": [], "feromonios": None, "contribuintes": 0,
+                         "elite": [], "num_formigas": registradas or self._total_grupo}
+        else:
+            self._total_grupo = combinado["num_formigas"] or self._total_grupo
+        if combinado["feromonios"] is not None:
+            combinado["feromonios"] = codificar_matriz(combinado["feromonios"])
+        else:
+            combinado["feromonios"] = []
+        if combinado.get("tempo_iteracao") is None:
+            # sem medidas do grupo, o tempo de parede da rodada (inclui a rede)
+            combinado["tempo_iteracao"] = time.perf_counter() - inicio
+        combinado["iteracao"] = self.iterations_done
+        send_msg(self.upstream, {"tipo": "resultado_iteracao", "job_id": self.job_id,
+                                 "dados": combinado})
+
+    def _repassar(self, msg: dict, chave: str, resposta: str) -> None:
+        """Lotes independentes (sintonia, decomposição, lote): divide ``msg[chave]``
+        entre os workers com :meth:`Coordinator._distribuir` e junta os resultados
+        numa única resposta."""
+        itens = {int(idx): item for idx, item in msg[chave].items()}
+        extra = {k: v for k, v in msg.items() if k not in ("tipo", chave)}
+        # Sem workers no grupo não há o que resolver aqui: o nó superior reenvia o que faltar
+        resultados = self._distribuir(msg["tipo"], chave, itens, extra, lambda pendentes: {})
+        send_msg(self.upstream, {"tipo": resposta, "job_id": msg.get("job_id", self.job_id),
+                                 "dados": {"node_id": self.node_id, "resultados": resultados}})
@@ -0,0 +1,42 @@
+"""Política de compartilhamento do feromônio global com os workers."""
+from __future__ import annotations
+from typing import Optional
+
+import numpy as np
+
+
+class SharingPolicy:
+    """Decide quando o coordenador envia ``atualizar_feromonios`` e com que peso.
+
+    * ``peso``      – fração da matriz global misturada à do worker
+      (``τ_local = (1 - peso) τ_local + peso τ_global``);
+    * ``intervalo`` – envia a cada ``intervalo`` iterações;
+    * ``pular_inalterado`` – não reenvia uma matriz que não mudou desde o
+      último envio (diferença máxima ``<= tolerancia``).
+    """
+
+    def __init__(self, peso: float = 0.1, intervalo: int = 1,
+                 pular_inalterado: bool = True, tolerancia: float = 1e-9) -> None:
+        if not 0.0 <= peso <= 1.0:
+            raise ValueError("peso deve estar entre 0 e 1")
+        if intervalo < 1:
+            raise ValueError("intervalo deve ser >= 1")
+        self.peso = peso
+        self.intervalo = intervalo
+        self.pular_inalterado = pular_inalterado
+        self.tolerancia = tolerancia
+        self._ultima: Optional[np.ndarray] = None
+
+    def reiniciar(self) -> None:
+        self._ultima = None
+
+    def deve_enviar(self, iteracao: int, matriz: Optional[np.ndarray]) -> bool:
+        """Registra o envio quando devolve True."""
+        if matriz is None or self.peso == 0.0 or iteracao % self.intervalo != 0:
+            return False
+        if (self.pular_inalterado and self._ultima is not None
+                and self._ultima.shape == matriz.shape
+                and np.max(np.abs(self._ultima - matriz)) <= self.tolerancia):
+            return False
+        self._ultima = matriz.copy()
+        return True
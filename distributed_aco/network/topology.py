@@ -0,0 +1,35 @@
+"""Topologias de migração do modelo de ilhas.
+
+Cada função devolve, para cada worker, a lista de workers **dos quais** ele
+recebe rotas de elite numa migração.
+"""
+from __future__ import annotations
+import random
+from typing import Dict, List, Optional
+
+TOPOLOGIAS = ("anel", "completa", "aleatoria", "hub")
+
+
+def origens(workers: List[str], topologia: str = "anel", k: int = 2,
+            rng: Optional[random.Random] = None) -> Dict[str, List[str]]:
+    """Mapa receptor -> emissores para os ``workers`` dados.
+
+    * ``anel``      – cada worker recebe do anterior (ordem alfabética);
+    * ``completa``  – cada worker recebe de todos os outros;
+    * ``aleatoria`` – cada worker recebe de ``k`` outros sorteados a cada migração;
+    * ``hub``       – o primeiro worker recebe de todos e envia a todos.
+    """
+    ws = sorted(workers)
+    if len(ws) < 2:
+        return {w: [] for w in ws}
+    if topologia == "anel":
+        return {w: [ws[i - 1]] for i, w in enumerate(ws)}
+    if topologia == "completa":
+        return {w: [o for o in ws if o != w] for w in ws}
+    if topologia == "aleatoria":
+        rng = rng or random.Random()
+        return {w: rng.sample([o for o in ws if o != w], min(k, len(ws) - 1)) for w in ws}
+    if topologia == "hub":
+        hub = ws[0]
+        return {w: ([o for o in ws if o != hub] if w == hub else [hub]) for w in ws}
+    raise ValueError(f"Topologia desconhecida: {topologia!r}")
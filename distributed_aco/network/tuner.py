@@ -0,0 +1,122 @@
+"""Coordenador do modo sintonia: distribui configurações de parâmetros entre workers."""
+from __future__ import annotations
+import json
+import os
+import random
+from typing import Dict, List, Tuple
+
+from ..core.cidade import Cidade
+from ..core.sintonia import Corrida, amostrar_configuracoes, avaliar_configuracao
+from ..core.tsplib import carregar_tsplib
+from .coordinator import Coordinator
+from .jobs import Job
+
+CLASSE_PADRAO = "geral"
+
+
+def carregar_classes(diretorio: str) -> Dict[str, List[Tuple[str, List[Cidade]]]]:
+    """Lê as instâncias de sintonia agrupadas por classe.
+
+    Cada subdiretório é uma classe; arquivos soltos na raiz pertencem à
+    classe ``geral``. São aceitos ``.tsp`` (TSPLIB) e ``.json`` no formato
+    de job (``cidades`` ou ``arquivo``; a chave ``classe`` tem prioridade).
+    """
+    classes: Dict[str, List[Tuple[str, List[Cidade]]]] = {}
+    for raiz, _, arquivos in sorted(os.walk(diretorio)):
+        padrao = os.path.relpath(raiz, diretorio)
+        padrao = CLASSE_PADRAO if padrao == "." else padrao
+        for nome in sorted(arquivos):
+            caminho = os.path.join(raiz, nome)
+            if nome.endswith(".tsp"):
+                classe, cidades = padrao, carregar_tsplib(caminho)
+            elif nome.endswith(".json"):
+                with open(caminho) as f:
+                    data = json.load(f)
+                classe, cidades = data.get("classe", padrao), Job.from_dict(data, nome, raiz).cidades
+            else:
+                continue
+            classes.setdefault(classe, []).append((nome, cidades))
+    if not classes:
+        raise ValueError(f"Nenhuma instância (.tsp/.json) encontrada em '{diretorio}'")
+    return classes
+
+
+class TuningCoordinator(Coordinator):
+    """Avalia configurações sorteadas em paralelo nos workers, classe a classe.
+
+    Com ``corrida=True`` as configurações ruins são eliminadas à medida que
+    as instâncias são avaliadas (estilo irace); caso contrário todas são
+    avaliadas em todas as instâncias (busca aleatória).
+    """
+
+    def __init__(self,
+                 instancias_dir: str,
+                 port: int = 8000,
+                 num_configs: int = 20,
+                 orcamento: int = 50,
+                 repeticoes: int = 1,
+                 corrida: bool = True,
+                 min_instancias: int = 3,
+                 saida: str = "sintonia.json",
+                 seed: int | None = None,
+                 lobby_wait_seconds: float = 15,
+                 iter_timeout: float = 600.0) -> None:
+        super().__init__(port=port, max_iters=orcamento,
+                         lobby_wait_seconds=lobby_wait_seconds, iter_timeout=iter_timeout)
+        self.job_id = "sintonia"
+        self.classes = carregar_classes(instancias_dir)
+        self.num_configs = num_configs
+        self.orcamento = orcamento
+        self.repeticoes = repeticoes
+        self.corrida = corrida
+        self.min_instancias = min_instancias
+        self.saida = saida
+        self.rng = random.Random(seed)
+        self.resultado: Dict[str, Dict] = {}
+
+    def _solve(self) -> None:
+        configs = amostrar_configuracoes(self.num_configs, self.rng)
+        for classe, instancias in self.classes.items():
+            corrida = Corrida(configs, self.min_instancias, eliminar=self.corrida)
+            passos = [(nome, cidades, self.rng.randrange(2 ** 31))
+                      for nome, cidades in instancias for _ in range(self.repeticoes)]
+            self.rng.shuffle(passos)
+            print(f"🎛️  Classe '{classe}': {len(configs)} configurações, {len(passos)} passo(s).")
+
+            for n, (nome, cidades, seed) in enumerate(passos, 1):
+                if not self.running:
+                    return
+                vivas = {i: configs[i] for i in corrida.vivas}
+                eliminadas = corrida.registrar(self._avaliar(cidades, vivas, seed))
+                print(f"   passo {n}/{len(passos)} ({nome}): {len(corrida.vivas)} viva(s)"
+                      + (f", eliminadas {eliminadas}" if eliminadas else ""))
+
+            idx, melhor = corrida.melhor()
+            self.resultado[classe] = {
+                "melhor": melhor,
+                "posto_medio": corrida.postos_medios()[idx],
+                "distancia_media": corrida.distancia_media(idx),
+                "passos": len(corrida.passos),
+                "sobreviventes": [configs[i] for i in corrida.vivas],
+            }
+            print(f"🏆 Classe '{classe}': {self._formatar(melhor)}")
+
+        with open(self.saida, "w") as f:
+            json.dump(self.resultado, f, indent=2, ensure_ascii=False)
+        print(f"💾 Melhores configurações salvas em '{self.saida}'")
+        self._broadcast({"tipo": "finalizar"})
+
+    def _avaliar(self, cidades: List[Cidade], configs: Dict[int, Dict], seed: int) -> Dict[int, float]:
+        """Distribui ``configs`` entre os workers até todas terem resultado."""
+        def resolver_local(pendentes: Dict[int, Dict]) -> Dict[int, float]:
+            return {idx: avaliar_configuracao(cidades, cfg, self.orcamento, seed)
+                    for idx, cfg in pendentes.items()}
+
+        return self._distribuir("avaliar_configuracoes", "configs", configs,
+                                {"cidades": [c.to_dict() for c in cidades],
+                                 "iteracoes": self.orcamento, "seed": seed},
+                                resolver_local)
+
+    @staticmethod
+    def _formatar(cfg: Dict) -> str:
+        return ", ".join(f"{k}={v:.3g}" if isinstance(v, float) else f"{k}={v}" for k, v in cfg.items())
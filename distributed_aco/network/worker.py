@@ -1,43 +1,119 @@
 """Worker node: conecta‑se ao coordenador e executa o ACO localmente."""
 from __future__ import annotations
-import socket, json, time, random
+import socket, json, time, random, queue, threading
 from typing import Optional
 import numpy as np
 from ..core.cidade import Cidade
 from ..core.aco_engine import ACOEngine
 from distributed_aco.core.cidade import Cidade
 from distributed_aco.core.aco_engine import ACOEngine
+from distributed_aco.core.decomposicao import resolver_subproblema
+from distributed_aco.core.lote import resolver_lote
+from distributed_aco.core.sintonia import avaliar_configuracao
+from .protocol import MessageReader, codificar_matriz, decodificar_matriz, send_msg
 
 class Worker:
-    def __init__(self, node_id: str, host="localhost", port=8000, ants=20):
+    def __init__(self, node_id: str, host="localhost", port=8000, ants=20, backend="python",
+                 num_threads=1):
         self.node_id = node_id
         self.host, self.port = host, port
         self.ants = ants
+        # Escolhas locais: dependem do que está instalado e dos núcleos desta máquina
+        self.backend = backend
+        self.num_threads = num_threads
         self.sock: Optional[socket.socket] = None
         self.engine: Optional[ACOEngine] = None
+        self.reader: Optional[MessageReader] = None
+        self.job_id: Optional[str] = None
+        # No modo de ilhas a matriz de feromônio não é enviada ao coordenador
+        self.enviar_feromonios = True
         self.running = False
+        self.perfilador = None  # ver distributed_aco.profiling
+        # Modo pipeline (definido pelo coordenador): iterações à frente da última
+        # incorporada ao feromônio global; 0 = lock-step
+        self.atraso_max = 0
+        self._iterando = False
+        self._incorporada = 0
+        self._saida: Optional[queue.Queue] = None
 
     # --------------------------------------------------------------
     def connect(self) -> bool:
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
-            self.sock.send(json.dumps({
+            send_msg(self.sock, {
                 "tipo": "registro",
                 "node_id": self.node_id,
                 "num_formigas": self.ants,
-            }).encode())
-            cfg = json.loads(self.sock.recv(4096).decode())
-            if cfg["tipo"] != "configuracao":
+            })
+            self.reader = MessageReader(self.sock)
+            cfg = self.reader.recv()
+            if not cfg or cfg["tipo"] != "configuracao":
                 return False
-            cities = [Cidade.from_dict(c) for c in cfg["cidades"]]
-            self.engine = ACOEngine(self.node_id, cities, self.ants, seed=random.randrange(9999))
+            self._configurar(cfg)
             return True
         except Exception as e:
             print(f"❌ Worker {self.node_id} failed to connect: {e}")
             return False
 
+    def _configurar(self, cfg: dict) -> None:
+        """(Re)cria o engine para o job descrito numa mensagem ``configuracao``."""
+        params = dict(cfg.get("parametros") or {})
+        params.setdefault("precisao", cfg.get("precisao", "float64"))
+        params.setdefault("busca_local", cfg.get("busca_local", False))
+        num_formigas = params.pop("num_formigas", self.ants)
+        cooperacao = cfg.get("cooperacao") or {}
+        cities = [Cidade.from_dict(c) for c in cfg["cidades"]]
+        self.job_id = cfg.get("job_id")
+        self.enviar_feromonios = cooperacao.get("modo", "media") == "media"
+        self.atraso_max = int(cfg.get("pipeline", 0))
+        if self.engine is not None:
+            self.engine.fechar()
+            self.engine = None
+        if cfg.get("decomposicao") or cfg.get("lote"):
+            # Só resolve subproblemas/lotes: não há instância única para montar um engine
+            return
+        self.engine = ACOEngine(self.node_id, cities, num_formigas,
+                                seed=random.randrange(9999), backend=self.backend,
+                                num_threads=self.num_threads,
+                                tamanho_elite=cooperacao.get("tamanho_elite", 3), **params)
+        partida = cfg.get("partida_quente")
+        if partida:
+            feromonios = partida.get("feromonios")
+            self.engine.aquecer(partida.get("caminho"),
+                                decodificar_matriz(feromonios) if feromonios else None,
+                                partida.get("reforco", 1.0))
+
+    def _avaliar_configuracoes(self, msg: dict) -> None:
+        """Modo sintonia: roda cada configuração recebida e devolve as distâncias."""
+        cities = [Cidade.from_dict(c) for c in msg["cidades"]]
+        resultados = {idx: avaliar_configuracao(cities, cfg, msg["iteracoes"], msg.get("seed"))
+                      for idx, cfg in msg["configs"].items()}
+        self._responder({"tipo": "resultado_avaliacao",
+                         "dados": {"node_id": self.node_id, "resultados": resultados}})
+
+    def _resolver_subproblemas(self, msg: dict) -> None:
+        """Modo decomposição: roda o ACO em cada grupo de cidades recebido."""
+        resultados = {}
+        for idx, sub in msg["subproblemas"].items():
+            cities = [Cidade.from_dict(c) for c in sub["cidades"]]
+            caminho, distancia = resolver_subproblema(
+                cities, msg.get("parametros") or {}, msg["iteracoes"], sub.get("seed"),
+                backend=self.backend, num_threads=self.num_threads)
+            resultados[idx] = {"caminho": caminho, "distancia": distancia}
+        self._responder({"tipo": "resultado_subproblemas", "job_id": self.job_id,
+                         "dados": {"node_id": self.node_id, "resultados": resultados}})
 
+    def _resolver_lote(self, msg: dict) -> None:
+        """Job em lote: resolve todas as instâncias recebidas numa única chamada."""
+        indices = list(msg["instancias"])
+        instancias = [[Cidade.from_dict(c) for c in msg["instancias"][idx]["cidades"]] for idx in indices]
+        solucoes = resolver_lote(instancias, msg["iteracoes"], seed=msg.get("seed"),
+                                 **(msg.get("parametros") or {}))
+        resultados = {idx: {"caminho": caminho, "distancia": distancia}
+                      for idx, (caminho, distancia) in zip(indices, solucoes)}
+        self._responder({"tipo": "resultado_lote", "job_id": self.job_id,
+                         "dados": {"node_id": self.node_id, "resultados": resultados}})
 
     def loop(self) -> None:
         if not self.connect():
@@ -47,28 +123,162 @@ class Worker:
         print(f"🐜 Worker {self.node_id} running")
         
         while self.running:
+            if self.atraso_max:
+                # A partir daqui as mensagens chegam pela thread de recepção
+                self._loop_pipeline()
+                break
             try:
-                # Recebe os dados do socket
-                data = self.sock.recv(8192).decode()
+                # Recebe a próxima mensagem completa do socket
+                if self.reader is None:
+                    self.reader = MessageReader(self.sock)
+                msg = self.reader.recv()
 
-                # Se 'data' for vazio, o servidor desconectou. Paramos o loop.
-                if not data:
+                # Se não houver mensagem, o servidor desconectou. Paramos o loop.
+                if msg is None:
                     self.running = False
                     continue
 
-                # Apenas se houver dados, tentamos decodificar o JSON
-                msg = json.loads(data)
-                mtype = msg.get("tipo") # Usar .get() é mais seguro
-
-                if mtype == "executar_iteracao":
-                    iter_data = self.engine.executar_iteracao()
-                    self.sock.send(json.dumps({"tipo": "resultado_iteracao", "dados": iter_data}).encode())
-                elif mtype == "atualizar_feromonios":
-                    self.engine.integrar_feromonio_externo(np.array(msg["feromonios"]))
+                if msg.get("tipo") == "executar_iteracao":
+                    self._responder(self._executar_iteracao(msg, codificar=True))
                 else:
-                    # Mensagem desconhecida, apenas aguarda
-                    time.sleep(0.01)
+                    self._tratar(msg)
 
             except (json.JSONDecodeError, ConnectionError, BrokenPipeError):
                 # Se qualquer erro de rede ou JSON ocorrer, encerra o loop
-                self.running = False
\ No newline at end of file
+                self.running = False
+
+        if self.engine is not None:
+            self.engine.fechar()
+        if self.perfilador:
+            self.perfilador.parar()
+
+    def _executar_iteracao(self, msg: dict, codificar: bool) -> dict:
+        """Roda uma iteração e monta a mensagem ``resultado_iteracao``."""
+        if self.perfilador:
+            self.perfilador.iteracao(self.engine.iteracao_atual + 1)
+        if msg.get("feromonios"):
+            self.engine.integrar_feromonio_externo(decodificar_matriz(msg["feromonios"]), msg.get("peso", 0.1))
+        iter_data = self.engine.executar_iteracao(self.enviar_feromonios)
+        if codificar and isinstance(iter_data.get("feromonios"), np.ndarray):
+            iter_data["feromonios"] = codificar_matriz(iter_data["feromonios"])
+        return {"tipo": "resultado_iteracao", "job_id": self.job_id, "dados": iter_data}
+
+    def _responder(self, msg: dict) -> None:
+        """Envia ao coordenador; no modo pipeline, pela fila da thread de envio."""
+        if self._saida is not None:
+            self._saida.put(msg)
+        else:
+            send_msg(self.sock, msg)
+
+    def _tratar(self, msg: dict) -> None:
+        """Mensagens comuns aos dois modos (tudo menos ``executar_iteracao``)."""
+        mtype = msg.get("tipo") # Usar .get() é mais seguro
+
+        if mtype == "atualizar_feromonios":
+            self.engine.integrar_feromonio_externo(decodificar_matriz(msg["feromonios"]), msg.get("peso", 0.1))
+        elif mtype == "migracao":
+            self.engine.reforcar_rotas(msg["rotas"], msg.get("peso", 1.0))
+        elif mtype == "ajustar_parametros":
+            if self.engine is not None:
+                params = {k: v for k, v in msg.items() if k != "tipo"}
+                self.engine.ajustar_parametros(**params)
+        elif mtype == "avaliar_configuracoes":
+            self._avaliar_configuracoes(msg)
+        elif mtype == "resolver_subproblemas":
+            self._resolver_subproblemas(msg)
+        elif mtype == "resolver_lote":
+            self._resolver_lote(msg)
+        elif mtype == "configuracao":
+            self._configurar(msg)
+            if self.engine is not None:
+                print(f"📥 Worker {self.node_id}: novo job '{self.job_id}' ({self.engine.num_cidades} cidades)")
+            else:
+                modo = "lote" if msg.get("lote") else "decomposição"
+                print(f"📥 Worker {self.node_id}: novo job '{self.job_id}' ({modo})")
+        elif mtype == "finalizar":
+            if msg.get("encerrar", True):
+                print(f"🏁 Worker {self.node_id}: coordenador finalizou a otimização.")
+                self.running = False
+        else:
+            # Mensagem desconhecida, apenas aguarda
+            time.sleep(0.01)
+
+    # --------------------------------------------------------------
+    #  Modo pipeline
+    # --------------------------------------------------------------
+    def _loop_pipeline(self) -> None:
+        """Itera sem esperar o coordenador, com atraso limitado.
+
+        Uma thread recebe as mensagens e outra envia os resultados (e codifica
+        as matrizes), então a iteração k+1 começa enquanto o resultado de k
+        ainda está a caminho. As atualizações globais são aplicadas entre
+        iterações, assim que chegam. Cada ``sincronizar`` diz até qual
+        iteração deste worker o coordenador já incorporou; o worker nunca fica
+        mais de ``atraso_max`` iterações à frente disso.
+        """
+        entrada: queue.Queue = queue.Queue()
+        self._saida = queue.Queue()
+        threading.Thread(target=self._receber, args=(entrada,), daemon=True,
+                         name=f"rx-{self.node_id}").start()
+        enviador = threading.Thread(target=self._enviar, args=(self._saida,), daemon=True,
+                                    name=f"tx-{self.node_id}")
+        enviador.start()
+
+        while self.running:
+            pode = self._pode_iterar()
+            try:
+                # com iteração liberada, só drena o que já chegou; senão, espera
+                msg = entrada.get(block=not pode, timeout=None if pode else 1.0)
+            except queue.Empty:
+                if pode:
+                    self._saida.put(self._executar_iteracao({}, codificar=False))
+                continue
+            if msg is None:
+                self.running = False
+            elif msg.get("tipo") == "executar_iteracao":
+                if self.atraso_max:
+                    self._iterando = True
+                else:
+                    # job seguinte em lock-step: uma iteração por pedido
+                    self._saida.put(self._executar_iteracao(msg, codificar=False))
+            elif msg.get("tipo") == "sincronizar":
+                self._incorporada = max(self._incorporada,
+                                        msg.get("incorporadas", {}).get(self.node_id, 0))
+            else:
+                if msg.get("tipo") in ("configuracao", "finalizar"):
+                    # fim do job: para e espera a ordem de começar o próximo
+                    self._iterando, self._incorporada = False, 0
+                self._tratar(msg)
+
+        self._saida.put(None)
+        enviador.join(timeout=5.0)
+        self._saida = None
+
+    def _pode_iterar(self) -> bool:
+        return (self._iterando and self.atraso_max > 0 and self.engine is not None
+                and self.engine.iteracao_atual - self._incorporada < self.atraso_max)
+
+    def _receber(self, entrada: queue.Queue) -> None:
+        """Thread de recepção: repassa as mensagens; ``None`` indica desconexão."""
+        try:
+            while True:
+                msg = self.reader.recv()
+                entrada.put(msg)
+                if msg is None:
+                    return
+        except (json.JSONDecodeError, ConnectionError, OSError):
+            entrada.put(None)
+
+    def _enviar(self, saida: queue.Queue) -> None:
+        """Thread de envio: codifica as matrizes e escreve no socket."""
+        while True:
+            msg = saida.get()
+            if msg is None:
+                return
+            dados = msg.get("dados") or {}
+            if isinstance(dados.get("feromonios"), np.ndarray):
+                dados["feromonios"] = codificar_matriz(dados["feromonios"])
+            try:
+                send_msg(self.sock, msg)
+            except OSError:
+                return
@@ -1,45 +1,101 @@
+"""Gráficos da solução (Matplotlib e Plotly).
 
+As bibliotecas de visualização são opcionais (``requirements-visualizacao.txt``)
+e só são importadas quando um gráfico é de fato gerado; assim workers e a
+CLI não pagam o custo de importá-las.
+"""
+import math
+import multiprocessing
+from typing import List, Tuple
 
-import matplotlib.pyplot as plt # type: ignore
 import numpy as np
-import plotly.graph_objects as go # type: ignore
+
 from .core.cidade import Cidade
-from typing import List
 
-import matplotlib # type: ignore
-matplotlib.use('Agg')  # Define o backend para não-gráfico
-import numpy as np
+# Acima destes tamanhos a renderização passa a ser econômica
+LIMITE_ROTULOS = 100     # nomes das cidades desenhados
+LIMITE_WEBGL = 2000      # Plotly: 2D Scattergl em vez de 3D
+LIMITE_PONTOS = 50000    # marcadores desenhados (dizimação acima disso)
+
+
+def _pyplot():
+    """Importa ``matplotlib.pyplot`` com backend não-gráfico, ou None se ausente."""
+    try:
+        import matplotlib # type: ignore
+        matplotlib.use('Agg')  # Define o backend para não-gráfico
+        import matplotlib.pyplot as plt # type: ignore
+    except ImportError:
+        print("⚠️ Matplotlib não instalado; gráfico não gerado (pip install -r requirements-visualizacao.txt).")
+        return None
+    return plt
+
+
+def _plotly():
+    """Importa ``plotly.graph_objects``, ou None se ausente."""
+    try:
+        import plotly.graph_objects as go # type: ignore
+    except ImportError:
+        print("⚠️ Plotly não instalado; gráfico não gerado (pip install -r requirements-visualizacao.txt).")
+        return None
+    return go
+
+
+def _coordenadas(cidades: List[Cidade]) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(cidades)
+    xs = np.fromiter((c.x for c in cidades), dtype=float, count=n)
+    ys = np.fromiter((c.y for c in cidades), dtype=float, count=n)
+    return xs, ys
+
+
+def _decimar(indices: np.ndarray, limite: int) -> np.ndarray:
+    """Mantém no máximo ~``limite`` elementos, em passos regulares."""
+    if len(indices) <= limite:
+        return indices
+    return indices[::math.ceil(len(indices) / limite)]
+
 
 def plotar_solucao(cidades: List[Cidade], caminho: List[int], titulo: str):
     """
     Plota as cidades e o caminho encontrado com um estilo visual aprimorado (Matplotlib).
+
+    Todas as cidades são desenhadas num único ``scatter``; acima de
+    ``LIMITE_ROTULOS`` cidades os nomes são omitidos e acima de
+    ``LIMITE_PONTOS`` os marcadores são dizimados (a rota continua completa).
     """
     COR_PONTOS = '#003f5c'
     COR_INICIO = '#00a676'
     COR_ROTA = '#ffa600'
     COR_TEXTO = '#333333'
 
+    plt = _pyplot()
+    if plt is None:
+        return
+
+    xs, ys = _coordenadas(cidades)
+    n = len(cidades)
+    pequeno = n <= LIMITE_ROTULOS
+
     fig, ax = plt.subplots(figsize=(14, 10))
 
-    # Plota as cidades como pontos
-    for i, cidade in enumerate(cidades):
-        if i == caminho[0]:
-            ax.scatter(cidade.x, cidade.y, c=COR_INICIO, s=250, zorder=5, label='Cidade Inicial', edgecolor='black', linewidth=1)
-        else:
-            ax.scatter(cidade.x, cidade.y, c=COR_PONTOS, s=150, zorder=5, edgecolor='white', linewidth=1)
-        
-        # --- MELHORIA AQUI: Adiciona um fundo para melhor legibilidade ---
-        ax.text(cidade.x, cidade.y, f" {cidade.nome}", fontsize=9, color=COR_TEXTO,
-                fontweight='bold', ha='left', va='bottom',
-                bbox=dict(facecolor='white', alpha=0.6, edgecolor='none', boxstyle='round,pad=0.2'))
+    # Plota as cidades como pontos (um único artista para todas)
+    pontos = _decimar(np.arange(n), LIMITE_PONTOS)
+    ax.scatter(xs[pontos], ys[pontos], c=COR_PONTOS, s=150 if pequeno else 4, zorder=5,
+               edgecolor='white' if pequeno else 'none', linewidth=1)
+    inicio = caminho[0]
+    ax.scatter(xs[inicio], ys[inicio], c=COR_INICIO, s=250, zorder=6, label='Cidade Inicial',
+               edgecolor='black', linewidth=1)
 
-    x_coords = [cidades[i].x for i in caminho]
-    y_coords = [cidades[i].y for i in caminho]
-    x_coords.append(cidades[caminho[0]].x)
-    y_coords.append(cidades[caminho[0]].y)
+    if pequeno:
+        # --- MELHORIA AQUI: Adiciona um fundo para melhor legibilidade ---
+        for cidade in cidades:
+            ax.text(cidade.x, cidade.y, f" {cidade.nome}", fontsize=9, color=COR_TEXTO,
+                    fontweight='bold', ha='left', va='bottom',
+                    bbox=dict(facecolor='white', alpha=0.6, edgecolor='none', boxstyle='round,pad=0.2'))
 
-    ax.plot(x_coords, y_coords, color=COR_ROTA, linewidth=2, linestyle='-',
-            marker='o', markersize=4, markerfacecolor=COR_ROTA, alpha=0.8, label='Melhor Rota')
+    rota = np.append(np.asarray(caminho), caminho[0])
+    ax.plot(xs[rota], ys[rota], color=COR_ROTA, linewidth=2 if pequeno else 0.6, linestyle='-',
+            marker='o' if pequeno else None, markersize=4, markerfacecolor=COR_ROTA,
+            alpha=0.8, label='Melhor Rota')
 
     ax.set_title(titulo, fontsize=18, fontweight='bold', pad=20)
     ax.set_xlabel("Longitude (Coordenada X)", fontsize=12)
@@ -51,7 +107,7 @@ def plotar_solucao(cidades: List[Cidade], caminho: List[int], titulo: str):
     fig.tight_layout()
 
     nome_arquivo = "melhor_rota_estilizada.png"
-    plt.savefig(nome_arquivo, dpi=300, bbox_inches='tight')
+    plt.savefig(nome_arquivo, dpi=300 if pequeno else 150, bbox_inches='tight')
     print(f"\n📊 Gráfico 2D estilizado salvo como '{nome_arquivo}'")
     plt.close()
 
@@ -63,7 +119,10 @@ def plotar_convergencia(historico_distancias: List[float]):
     if not historico_distancias:
         print("⚠️ Histórico de distâncias vazio, não foi possível gerar o gráfico de convergência.")
         return
-        
+    plt = _pyplot()
+    if plt is None:
+        return
+
     plt.figure(figsize=(12, 6))
     plt.plot(historico_distancias, color='#003f5c', linewidth=2,
              marker='o', markersize=5, markerfacecolor='#ffa600')
@@ -82,61 +141,107 @@ def plotar_solucao_3d_plotly(cidades: List[Cidade], caminho: List[int], titulo:
     """
     Plota as cidades e o caminho em um gráfico 3D interativo usando Plotly.
     O eixo Z representa a ordem de visitação.
+
+    Rotas com mais de ``LIMITE_WEBGL`` cidades viram um gráfico 2D
+    ``Scattergl`` (WebGL), sem rótulos fixos e com os pontos dizimados a
+    ``LIMITE_PONTOS``, para manter o HTML pequeno e responsivo.
     """
-    cidades_ordenadas = [cidades[i] for i in caminho]
-    x_coords = [c.x for c in cidades_ordenadas]
-    y_coords = [c.y for c in cidades_ordenadas]
-    z_coords = list(range(len(cidades_ordenadas)))
-    
-    x_coords.append(cidades_ordenadas[0].x)
-    y_coords.append(cidades_ordenadas[0].y)
-    z_coords.append(0)
+    go = _plotly()
+    if go is None:
+        return
 
-    # Prepara os textos que aparecem FIXOS no gráfico
-    text_labels_fixos = [c.nome for c in cidades_ordenadas]
-    # Prepara os textos que aparecem no HOVER (ao passar o mouse)
-    text_labels_hover = [f"{c.nome}<br>Ordem: {i+1}" for i, c in enumerate(cidades_ordenadas)]
+    xs, ys = _coordenadas(cidades)
+    n = len(caminho)
+    ordem = _decimar(np.arange(n), LIMITE_PONTOS)
+    rota = np.asarray(caminho)[ordem]
+    x_coords = np.append(xs[rota], xs[caminho[0]])
+    y_coords = np.append(ys[rota], ys[caminho[0]])
+    z_coords = np.append(ordem, 0)
 
     fig = go.Figure()
+    if n > LIMITE_WEBGL:
+        fig.add_trace(go.Scattergl(
+            x=x_coords, y=y_coords, mode='lines',
+            line=dict(color='#1f77b4', width=1), hoverinfo='skip', name='Rota'
+        ))
+        fig.add_trace(go.Scattergl(
+            x=x_coords[:-1], y=y_coords[:-1], mode='markers',
+            marker=dict(size=3, color=z_coords[:-1], colorscale='Viridis',
+                        showscale=True, colorbar=dict(title='Ordem de Visita')),
+            hovertemplate='Ordem: %{marker.color}<extra></extra>', name='Cidades'
+        ))
+        fig.update_layout(
+            title=dict(text=f'<b>{titulo}</b>', x=0.5, font=dict(size=20)),
+            xaxis_title='Longitude (X)', yaxis_title='Latitude (Y)',
+            margin=dict(l=0, r=0, b=0, t=40),
+        )
+    else:
+        cidades_ordenadas = [cidades[i] for i in rota]
+        # Textos FIXOS só para rotas pequenas; o HOVER (ao passar o mouse) sempre
+        text_labels_fixos = [c.nome for c in cidades_ordenadas] if n <= LIMITE_ROTULOS else None
+        text_labels_hover = [f"{c.nome}<br>Ordem: {i+1}" for i, c in zip(ordem, cidades_ordenadas)]
+
+        fig.add_trace(go.Scatter3d(
+            x=x_coords, y=y_coords, z=z_coords,
+            mode='lines',
+            line=dict(color='#1f77b4', width=4),
+            hoverinfo='none',
+            name='Rota'
+        ))
+
+        fig.add_trace(go.Scatter3d(
+            x=x_coords[:-1], y=y_coords[:-1], z=z_coords[:-1],
+            mode='markers+text' if text_labels_fixos else 'markers',
+            marker=dict(
+                size=8 if text_labels_fixos else 3,
+                color=z_coords[:-1],
+                colorscale='Viridis',
+                opacity=0.9,
+                showscale=True,
+                colorbar=dict(title='Ordem de Visita')
+            ),
+            text=text_labels_fixos, # <--- Texto que aparece fixo
+            textposition='top center',
+            textfont=dict(size=10, color='#000000'),
+            hovertext=text_labels_hover, # <--- Texto que aparece no hover
+            hoverinfo='text',
+            name='Cidades'
+        ))
+
+        fig.update_layout(
+            title=dict(text=f'<b>{titulo}</b>', x=0.5, font=dict(size=20)),
+            scene=dict(
+                xaxis_title='Longitude (X)',
+                yaxis_title='Latitude (Y)',
+                zaxis_title='Sequência da Rota (Z)'
+            ),
+            margin=dict(l=0, r=0, b=0, t=40),
+            legend=dict(yanchor="top", y=0.9, xanchor="left", x=0.1)
+        )
 
-    fig.add_trace(go.Scatter3d(
-        x=x_coords, y=y_coords, z=z_coords,
-        mode='lines',
-        line=dict(color='#1f77b4', width=4),
-        hoverinfo='none',
-        name='Rota'
-    ))
-
-    fig.add_trace(go.Scatter3d(
-        x=x_coords[:-1], y=y_coords[:-1], z=z_coords[:-1],
-        mode='markers+text', # <--- MUDANÇA PRINCIPAL: Adiciona 'text'
-        marker=dict(
-            size=8,
-            color=z_coords[:-1],
-            colorscale='Viridis',
-            opacity=0.9,
-            showscale=True,
-            colorbar=dict(title='Ordem de Visita')
-        ),
-        text=text_labels_fixos, # <--- Texto que aparece fixo
-        textposition='top center',
-        textfont=dict(size=10, color='#000000'),
-        hovertext=text_labels_hover, # <--- Texto que aparece no hover
-        hoverinfo='text',
-        name='Cidades'
-    ))
-
-    fig.update_layout(
-        title=dict(text=f'<b>{titulo}</b>', x=0.5, font=dict(size=20)),
-        scene=dict(
-            xaxis_title='Longitude (X)',
-            yaxis_title='Latitude (Y)',
-            zaxis_title='Sequência da Rota (Z)'
-        ),
-        margin=dict(l=0, r=0, b=0, t=40),
-        legend=dict(yanchor="top", y=0.9, xanchor="left", x=0.1)
-    )
-    
     nome_arquivo = "melhor_rota_3d_interativa.html"
-    fig.write_html(nome_arquivo)
-    print(f"🌍 Gráfico 3D interativo salvo como '{nome_arquivo}'")
\ No newline at end of file
+    # Rotas grandes: referencia o plotly.js pela CDN em vez de embutir ~3 MB
+    fig.write_html(nome_arquivo, include_plotlyjs=True if n <= LIMITE_WEBGL else 'cdn')
+    print(f"🌍 Gráfico 3D interativo salvo como '{nome_arquivo}'")
+
+
+def gerar_graficos_solucao(cidades: List[Cidade], caminho: List[int], titulo: str):
+    """Gera o gráfico 2D e o interativo; ponto de entrada do processo de plotagem."""
+    print("\nGerando gráfico 2D estático...")
+    plotar_solucao(cidades, caminho, titulo)
+
+    print("\nGerando gráfico 3D interativo...")
+    plotar_solucao_3d_plotly(cidades, caminho, titulo)
+
+
+def gerar_graficos_em_segundo_plano(cidades: List[Cidade], caminho: List[int], titulo: str):
+    """Dispara :func:`gerar_graficos_solucao` num processo separado e retorna.
+
+    O processo não é daemon: o interpretador aguarda o fim da plotagem ao
+    sair, mas quem chamou (o coordenador) segue imediatamente.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    processo = ctx.Process(target=gerar_graficos_solucao, args=(cidades, list(caminho), titulo),
+                           name="plotagem")
+    processo.start()
+    return processo
@@ -0,0 +1,144 @@
+"""Perfilamento opcional de workers e do coordenador.
+
+Dois modos estão disponíveis:
+
+* ``cprofile``   – perfilador determinístico; gera ``<no>.pstats``.
+* ``amostragem`` – amostra periodicamente as pilhas de todas as threads;
+  gera ``<no>.collapsed`` (formato "collapsed stack", pronto para
+  ferramentas de flame graph).
+
+Sem janela, o nó inteiro é perfilado, do início ao fim (inclusive modos
+sem iterações, como sintonia, decomposição e lotes). Opcionalmente, apenas
+uma janela de iterações é perfilada (ex.: 10–20), para que o aquecimento
+não distorça os números.
+"""
+from __future__ import annotations
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Optional, Tuple
+
+MODOS = ("cprofile", "amostragem")
+
+
+def parse_janela(texto: str | None) -> Optional[Tuple[int, int]]:
+    """Converte ``"10:20"`` em ``(10, 20)`` (intervalo fechado)."""
+    if not texto:
+        return None
+    ini, _, fim = texto.partition(":")
+    try:
+        ini_i, fim_i = int(ini), int(fim or ini)
+    except ValueError:
+        ini_i = fim_i = 0
+    if ini_i < 1 or fim_i < ini_i:
+        raise ValueError(f"Janela de iterações inválida: {texto!r}")
+    return ini_i, fim_i
+
+
+class Perfilador:
+    """Liga/desliga um perfilador em volta de um nó ou das suas iterações.
+
+    O nó chama :meth:`iteracao` no início de cada iteração e :meth:`parar`
+    ao sair do laço, sempre na thread que executa as iterações (o
+    ``cProfile`` só observa a thread em que foi ligado). Essas chamadas só
+    importam com ``janela``; sem ela o perfil cobre todo o :meth:`executar`.
+    """
+
+    def __init__(self,
+                 node_id: str,
+                 modo: str = "cprofile",
+                 diretorio: str = ".",
+                 janela: Optional[Tuple[int, int]] = None,
+                 intervalo: float = 0.005) -> None:
+        if modo not in MODOS:
+            raise ValueError(f"Modo de perfilamento desconhecido: {modo!r}")
+        self.node_id = node_id
+        self.modo = modo
+        self.diretorio = diretorio
+        self.janela = janela
+        self.intervalo = intervalo
+
+        self.ativo = False
+        self._profile = cProfile.Profile() if modo == "cprofile" else None
+        self._pilhas: Counter = Counter()
+        self._amostrador: Optional[threading.Thread] = None
+        self._encerrado = threading.Event()
+
+    # -----------------------------------------------------------------
+    def executar(self, no, metodo: Callable[[], None]) -> None:
+        """Executa ``metodo`` (ex.: ``worker.loop``) com o nó instrumentado."""
+        no.perfilador = self
+        if self.modo == "amostragem":
+            self._amostrador = threading.Thread(target=self._amostrar, daemon=True)
+            self._amostrador.start()
+        if self.janela is None:
+            self._ligar()
+        try:
+            metodo()
+        finally:
+            self._desligar()
+            self.salvar()
+
+    def iteracao(self, k: int) -> None:
+        """Marca o início da iteração ``k`` (1‑based)."""
+        if self.janela is None:
+            return
+        dentro = self.janela[0] <= k <= self.janela[1]
+        if dentro and not self.ativo:
+            self._ligar()
+        elif not dentro and self.ativo:
+            self._desligar()
+
+    def parar(self) -> None:
+        """Fim do laço de iterações (sem janela, o perfil segue até o fim do nó)."""
+        if self.janela is not None:
+            self._desligar()
+
+    # -----------------------------------------------------------------
+    def _ligar(self) -> None:
+        self.ativo = True
+        if self._profile is not None:
+            self._profile.enable()
+
+    def _desligar(self) -> None:
+        if not self.ativo:
+            return
+        self.ativo = False
+        if self._profile is not None:
+            self._profile.disable()
+
+    def _amostrar(self) -> None:
+        proprio = threading.get_ident()
+        while not self._encerrado.is_set():
+            if self.ativo:
+                for tid, frame in sys._current_frames().items():
+                    if tid == proprio:
+                        continue
+                    pilha = []
+                    while frame is not None:
+                        codigo = frame.f_code
+                        pilha.append(f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}")
+                        frame = frame.f_back
+                    self._pilhas[";".join(reversed(pilha))] += 1
+            time.sleep(self.intervalo)
+
+    def salvar(self) -> str:
+        """Grava o resultado e devolve o caminho do arquivo gerado."""
+        self._encerrado.set()
+        if self._amostrador is not None:
+            self._amostrador.join(timeout=1.0)
+        os.makedirs(self.diretorio, exist_ok=True)
+
+        if self._profile is not None:
+            caminho = os.path.join(self.diretorio, f"{self.node_id}.pstats")
+            self._profile.dump_stats(caminho)
+        else:
+            caminho = os.path.join(self.diretorio, f"{self.node_id}.collapsed")
+            with open(caminho, "w") as f:
+                for pilha, n in sorted(self._pilhas.items()):
+                    f.write(f"{pilha} {n}\n")
+        print(f"⏱️  Perfil de {self.node_id} salvo em '{caminho}'")
+        return caminho
@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distributed_aco.network.balancer import ThroughputBalancer, parametros_diversos
+from distributed_aco.network.coordinator import Coordinator
+
+
+def test_parametros_diversos():
+    assert parametros_diversos(0, 1.0, 2.0) == pytest.approx({"alpha": 1.0, "beta": 2.0})
+    valores = [parametros_diversos(i, 1.0, 2.0) for i in range(20)]
+    assert all(0.5 <= v["alpha"] <= 2.0 and 1.0 <= v["beta"] <= 4.0 for v in valores)
+    assert len({round(v["alpha"], 6) for v in valores}) == 20
+
+
+def test_balancer_divide_formigas_pela_vazao():
+    b = ThroughputBalancer(suavizacao=1.0)
+    b.registrar("rapido", 20)
+    b.registrar("lento", 20)
+    b.observar("rapido", 1.0)
+    assert b.rebalancear() == {}  # ainda falta medir o lento
+    b.observar("lento", 3.0)
+    assert b.rebalancear() == {"rapido": 30, "lento": 10}
+    # Com as novas contagens os tempos se igualam e nada mais muda
+    b.observar("rapido", 1.5, 30)
+    b.observar("lento", 1.5, 10)
+    assert b.rebalancear() == {}
+
+
+def test_balancer_ignora_ruido_e_remove_worker():
+    b = ThroughputBalancer(suavizacao=1.0, tolerancia=0.1)
+    for w in ("a", "b"):
+        b.registrar(w, 20)
+    b.observar("a", 1.0)
+    b.observar("b", 1.05)
+    assert b.rebalancear() == {}
+    b.remover("b")
+    assert "b" not in b.formigas and "b" not in b.vazao
+
+
+def test_coordinator_rebalanceia_workers():
+    coordinator = Coordinator()
+    socks = {"rapido": MagicMock(), "lento": MagicMock()}
+    coordinator.clients = dict(socks)
+    for w in socks:
+        coordinator._register_worker(w, {"num_formigas": 20})
+    coordinator.iter_results = {
+        "rapido": {"tempo_iteracao": 0.1, "num_formigas": 20},
+        "lento": {"tempo_iteracao": 0.3, "num_formigas": 20},
+    }
+    with patch.object(coordinator, '_send_to') as mock_send:
+        coordinator._rebalance()
+    enviados = {c.args[0]: c.args[1] for c in mock_send.call_args_list}
+    assert enviados["rapido"] == {"tipo": "ajustar_parametros", "num_formigas": 30}
+    assert enviados["lento"] == {"tipo": "ajustar_parametros", "num_formigas": 10}
+    assert coordinator.report()["workers"]["lento"]["num_formigas"] == 10
+
+
+def test_coordinator_diversifica_alpha_beta():
+    coordinator = Coordinator(diversificar=True)
+    p0 = coordinator._register_worker("w0", {})
+    p1 = coordinator._register_worker("w1", {})
+    assert p0 == pytest.approx({"alpha": 1.0, "beta": 2.0})
+    assert p1 != p0
+
+
+def test_dividir_proporcional_respeita_total_e_minimo():
+    from distributed_aco.network.balancer import dividir_proporcional
+    assert dividir_proporcional(10, {"a": 1, "b": 1, "c": 1}) == {"a": 4, "b": 3, "c": 3}
+    assert sum(dividir_proporcional(7, {"a": 100.0, "b": 1.0}).values()) == 7
+    assert dividir_proporcional(7, {"a": 100.0, "b": 1.0})["b"] == 1
+
+
+def test_balancer_conserva_o_total_com_vazao_ruidosa():
+    import random
+    rng = random.Random(0)
+    b = ThroughputBalancer()
+    velocidade = {"a": 1.0, "b": 2.0, "c": 0.5, "d": 1.5}
+    for w, n in zip(velocidade, (20, 20, 30, 10)):
+        b.registrar(w, n)
+    for _ in range(200):
+        for w, v in velocidade.items():
+            # tempo proporcional às formigas, com ±30% de ruído de medida
+            b.observar(w, b.formigas[w] / v * rng.uniform(0.7, 1.3))
+        b.rebalancear()
+        assert sum(b.formigas.values()) == 80
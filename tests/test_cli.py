@@ -12,7 +12,21 @@ def test_cli_inicia_coordenador(mock_coordinator):
     with patch('sys.argv', ['cli.py', '--mode', 'coordenador', '--port', '8001']):
         main()
         # Verifica se a classe Coordenador foi chamada com os argumentos 
-        mock_coordinator.assert_called_once_with(port=8001, max_iters=100)
+        mock_coordinator.assert_called_once()
+        kwargs = mock_coordinator.call_args.kwargs
+        assert kwargs['port'] == 8001 and kwargs['max_iters'] == 100
+        assert kwargs['jobs_dir'] is None
+        assert kwargs['balancear'] is True and kwargs['diversificar'] is False
+        assert kwargs['cooperacao'] == 'media' and kwargs['topologia'] == 'anel'
+        assert kwargs['intervalo_migracao'] == 5 and kwargs['tamanho_elite'] == 3
+        assert kwargs['precisao'] == 'float64' and kwargs['busca_local'] is False
+        assert kwargs['cidades'] is None and kwargs['decomposicao'] is None
+        assert kwargs['partida_quente'] is None and kwargs['salvar_feromonios'] is None
+        assert kwargs['pipeline'] == 0
+        politica = kwargs['compartilhamento']
+        assert (politica.peso, politica.intervalo, politica.pular_inalterado) == (0.1, 1, True)
+        # Sem flags de parada, o critério não tem nada ativo
+        assert kwargs['criterio'].ativo is False
         # Verifica se o método start() foi chamado
         mock_coordinator.return_value.start.assert_called_once()
 
@@ -21,7 +35,8 @@ def test_cli_inicia_worker(mock_worker):
     """Verifica se o modo 'trabalhador' instancia e inicia o Worker."""
     with patch('sys.argv', ['cli.py', '--mode', 'trabalhador', '--host', 'testhost', '--port', '8002', '--id', 'test-worker']):
         main()
-        mock_worker.assert_called_once_with('test-worker', host='testhost', port=8002, ants=20)
+        mock_worker.assert_called_once_with('test-worker', host='testhost', port=8002, ants=20,
+                                            backend='python', num_threads=1)
         mock_worker.return_value.loop.assert_called_once()
 
 @patch('distributed_aco.cli.Worker')
@@ -35,3 +50,78 @@ def test_cli_inicia_worker_com_id_aleatorio(mock_worker):
         # Apenas verificamos que um ID foi gerado (não é nulo e é uma string)
         assert worker_id is not None
         assert isinstance(worker_id, str)
+
+@patch('distributed_aco.cli.Perfilador')
+@patch('distributed_aco.cli.Worker')
+def test_cli_worker_com_profile(mock_worker, mock_perfilador):
+    """Verifica se --profile executa o loop do worker através do perfilador."""
+    with patch('sys.argv', ['cli.py', '--mode', 'trabalhador', '--id', 'w-prof',
+                            '--profile', '--profile-iters', '10:20', '--profile-dir', 'perfis']):
+        main()
+    mock_perfilador.assert_called_once_with('w-prof', modo='cprofile', diretorio='perfis', janela=(10, 20))
+    worker = mock_worker.return_value
+    mock_perfilador.return_value.executar.assert_called_once_with(worker, worker.loop)
+    worker.loop.assert_not_called()
+
+@patch('distributed_aco.cli.Coordinator')
+def test_cli_coordenador_com_criterios_de_parada(mock_coordinator):
+    """Verifica se as flags de parada antecipada chegam ao Coordenador."""
+    with patch('sys.argv', ['cli.py', '--mode', 'coordenador', '--iters', '0',
+                            '--paciencia', '15', '--alvo', '1200', '--tempo-max', '60']):
+        main()
+    criterio = mock_coordinator.call_args.kwargs['criterio']
+    assert mock_coordinator.call_args.kwargs['max_iters'] == 0
+    assert (criterio.paciencia, criterio.alvo, criterio.tempo_max) == (15, 1200.0, 60.0)
+    assert criterio.ramificacao_min is None
+
+def test_cli_iters_zero_sem_criterio_falha():
+    """--iters 0 sem nenhum critério de parada rodaria para sempre."""
+    with patch('sys.argv', ['cli.py', '--mode', 'coordenador', '--iters', '0']):
+        with pytest.raises(SystemExit):
+            main()
+
+@pytest.mark.parametrize("janela", ["20:10", "0:5", "a:b"])
+def test_cli_profile_iters_invalido_falha(janela):
+    with patch('sys.argv', ['cli.py', '--mode', 'trabalhador', '--profile', '--profile-iters', janela]):
+        with pytest.raises(SystemExit):
+            main()
+
+def test_cli_threads_exige_backend_vetorizado():
+    with patch('sys.argv', ['cli.py', '--mode', 'trabalhador', '--threads', '4']):
+        with pytest.raises(SystemExit):
+            main()
+
+@patch('distributed_aco.cli.Relay')
+def test_cli_inicia_subcoordenador(mock_relay):
+    with patch('sys.argv', ['cli.py', '--mode', 'subcoordenador', '--id', 'sub-a',
+                            '--host', 'coord', '--port', '9000', '--porta-local', '9001']):
+        main()
+    mock_relay.assert_called_once_with('sub-a', host='coord', port_superior=9000, port=9001,
+                                       balancear=True)
+    mock_relay.return_value.start.assert_called_once()
+
+@patch('distributed_aco.cli.Coordinator')
+def test_cli_coordenador_com_decomposicao(mock_coordinator, tmp_path):
+    """--instancia carrega o .tsp e as flags de decomposição chegam ao Coordenador."""
+    tsp = tmp_path / "mini.tsp"
+    tsp.write_text("NAME: mini\nTYPE: TSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\n"
+                   "NODE_COORD_SECTION\n1 0 0\n2 3 0\n3 0 4\nEOF\n")
+    with patch('sys.argv', ['cli.py', '--mode', 'coordenador', '--instancia', str(tsp),
+                            '--decomposicao', 'kmeans', '--tamanho-cluster', '150',
+                            '--iters-cluster', '30']):
+        main()
+    kwargs = mock_coordinator.call_args.kwargs
+    assert len(kwargs['cidades']) == 3
+    assert (kwargs['decomposicao'], kwargs['tamanho_cluster'], kwargs['iters_cluster']) == ('kmeans', 150, 30)
+
+@patch('distributed_aco.cli.Coordinator')
+def test_cli_coordenador_com_partida_quente(mock_coordinator):
+    """As flags de partida a quente viram uma PartidaQuente no Coordenador."""
+    with patch('sys.argv', ['cli.py', '--mode', 'coordenador', '--rota-inicial', 'ontem.json',
+                            '--feromonios-iniciais', 'ontem.npz', '--reforco-inicial', '0.5',
+                            '--salvar-feromonios', 'hoje.npz']):
+        main()
+    kwargs = mock_coordinator.call_args.kwargs
+    partida = kwargs['partida_quente']
+    assert (partida.rota, partida.feromonios, partida.reforco) == ('ontem.json', 'ontem.npz', 0.5)
+    assert kwargs['salvar_feromonios'] == 'hoje.npz'
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from distributed_aco.core.convergencia import CriterioParada, fator_ramificacao
+
+
+def test_fator_ramificacao_uniforme_e_estagnado():
+    n = 6
+    uniforme = np.ones((n, n)) * 0.1
+    assert fator_ramificacao(uniforme) == pytest.approx(n - 1)
+
+    # Uma única rota 0-1-2-3-4-5-0 com todo o feromônio
+    estagnado = np.full((n, n), 1e-6)
+    for i in range(n):
+        j = (i + 1) % n
+        estagnado[i, j] = estagnado[j, i] = 10.0
+    assert fator_ramificacao(estagnado) == pytest.approx(2.0)
+
+
+def test_criterio_sem_limites_nunca_para():
+    criterio = CriterioParada()
+    assert criterio.ativo is False
+    assert all(criterio.verificar(100.0) is None for _ in range(50))
+
+
+def test_criterio_paciencia():
+    criterio = CriterioParada(paciencia=3)
+    assert criterio.verificar(100.0) is None
+    assert criterio.verificar(90.0) is None
+    assert criterio.verificar(90.0) is None
+    assert criterio.verificar(90.0) is None
+    assert "sem melhora" in criterio.verificar(90.0)
+
+
+def test_criterio_alvo():
+    criterio = CriterioParada(alvo=50.0)
+    assert criterio.verificar(51.0) is None
+    assert "alvo" in criterio.verificar(49.5)
+
+
+def test_criterio_tempo(monkeypatch):
+    relogio = iter([0.0, 5.0, 11.0])
+    monkeypatch.setattr("time.monotonic", lambda: next(relogio))
+    criterio = CriterioParada(tempo_max=10)
+    assert criterio.verificar(10.0) is None
+    assert "tempo" in criterio.verificar(9.0)
+
+
+def test_criterio_estagnacao():
+    criterio = CriterioParada(ramificacao_min=2.0)
+    n = 5
+    estagnado = np.full((n, n), 1e-6)
+    for i in range(n):
+        j = (i + 1) % n
+        estagnado[i, j] = estagnado[j, i] = 5.0
+    assert criterio.verificar(10.0, np.ones((n, n))) is None
+    assert "estagnação" in criterio.verificar(10.0, estagnado)
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from distributed_aco.core.cidade import Cidade
+from distributed_aco.core.decomposicao import (comprimento_rota, coordenadas, costurar,
+                                               ordenar_grupos, particionar, refinar_janelas,
+                                               resolver_subproblema)
+from distributed_aco.network.coordinator import Coordinator
+
+
+@pytest.fixture
+def cidades():
+    rng = np.random.default_rng(3)
+    # duas regiões densas e uma esparsa
+    pontos = np.vstack([rng.normal(20, 3, (150, 2)), rng.normal(80, 3, (150, 2)),
+                        rng.random((100, 2)) * 100])
+    return [Cidade(i, x, y) for i, (x, y) in enumerate(pontos)]
+
+
+@pytest.mark.parametrize("modo", ["grade", "kmeans"])
+def test_particao_cobre_cada_cidade_uma_vez(cidades, modo):
+    grupos = particionar(cidades, modo, tamanho_max=50, seed=0)
+    todos = np.concatenate(grupos)
+    assert sorted(todos.tolist()) == list(range(len(cidades)))
+    assert all(len(g) for g in grupos)
+    if modo == "grade":
+        assert max(len(g) for g in grupos) <= 100
+
+
+def test_modo_desconhecido(cidades):
+    with pytest.raises(ValueError):
+        particionar(cidades, "hexagonos")
+
+
+def test_costura_e_refinamento(cidades):
+    xy = coordenadas(cidades)
+    grupos = particionar(cidades, "kmeans", tamanho_max=60, seed=1)
+    # sub-rotas simples (ordem de índice) para exercitar a costura e o 2-opt
+    subrotas = [g.tolist() for g in grupos]
+    rota = costurar(xy, [subrotas[g] for g in ordenar_grupos(xy, grupos)])
+    assert sorted(rota) == list(range(len(cidades)))
+
+    refinada = refinar_janelas(xy, rota, janela=40)
+    assert sorted(refinada) == list(range(len(cidades)))
+    assert comprimento_rota(xy, refinada) < comprimento_rota(xy, rota)
+
+
+def test_refinamento_mantem_rota_sem_melhora():
+    xy = np.array([[0, 0], [1, 0], [2, 0], [2, 1], [1, 1], [0, 1]], dtype=float)
+    assert refinar_janelas(xy, list(range(6)), janela=4) == list(range(6))
+
+
+def _circulo(n=120):
+    t = 2 * np.pi * np.arange(n) / n
+    return np.column_stack([np.cos(t), np.sin(t)]) * 100
+
+
+def test_refinamento_alcanca_o_fim_da_rota_e_a_emenda():
+    xy = _circulo()
+    otimo = comprimento_rota(xy, list(range(120)))
+    # cruzamento no fim da rota, depois da última janela completa (100..119)
+    cauda = list(range(104)) + list(range(111, 103, -1)) + list(range(112, 120))
+    # cruzamento atravessando a emenda 119 -> 0
+    emenda = [0, 119, 118, 117, 116] + list(range(4, 116)) + [3, 2, 1]
+    for rota in (cauda, emenda):
+        assert comprimento_rota(xy, rota) > otimo + 1
+        refinada = refinar_janelas(xy, rota, janela=50)
+        assert sorted(refinada) == list(range(120))
+        assert comprimento_rota(xy, refinada) == pytest.approx(otimo)
+
+
+def test_resolver_subproblema_pequeno_e_normal(cidades):
+    assert resolver_subproblema(cidades[:2], {}, 5) == ([0, 1], pytest.approx(
+        2 * np.hypot(cidades[0].x - cidades[1].x, cidades[0].y - cidades[1].y)))
+    caminho, distancia = resolver_subproblema(cidades[:30], {"num_formigas": 5}, 3, seed=1,
+                                              backend="numpy")
+    assert sorted(caminho) == list(range(30))
+    assert distancia == pytest.approx(comprimento_rota(coordenadas(cidades[:30]), caminho))
+
+
+def _coordenador(cidades, **kwargs):
+    coord = Coordinator(cidades=cidades, decomposicao="grade", tamanho_cluster=80,
+                        iters_cluster=2, balancear=False, **kwargs)
+    coord.running = True
+    return coord
+
+
+def test_coordenador_decomposto_com_workers(cidades):
+    coord = _coordenador(cidades)
+    coord.clients = {"w1": object(), "w2": object()}
+    enviados = []
+
+    def responder(node_id, msg):
+        # faz o papel do worker: resolve o lote e guarda a resposta
+        enviados.append(msg)
+        resultados = {}
+        for idx, sub in msg["subproblemas"].items():
+            caminho, dist = resolver_subproblema([Cidade.from_dict(c) for c in sub["cidades"]],
+                                                 msg["parametros"], msg["iteracoes"], sub["seed"])
+            resultados[str(idx)] = {"caminho": caminho, "distancia": dist}
+        coord.iter_results[node_id] = {"node_id": node_id, "resultados": resultados}
+        return True
+
+    coord._send_to = responder
+    coord._broadcast = lambda msg: None
+    coord._run()
+
+    assert {m["tipo"] for m in enviados} == {"resolver_subproblemas"}
+    assert len(enviados) == 2 and coord.global_pheromone is None
+    rota = coord.global_best["path"]
+    assert sorted(rota) == list(range(len(cidades)))
+    assert coord.global_best["distance"] == pytest.approx(comprimento_rota(coordenadas(cidades), rota))
+    assert coord._config_msg()["cidades"] == [] and coord._config_msg()["decomposicao"] == "grade"
+
+
+def test_coordenador_decomposto_sem_workers_resolve_localmente(cidades):
+    coord = _coordenador(cidades)
+    coord._run()
+    assert sorted(coord.global_best["path"]) == list(range(len(cidades)))
+    assert "costurado" in coord.report()["motivo_parada"]
@@ -116,4 +116,129 @@ def test_selecao_proxima_cidade_com_probabilidade_zero(cidades_brasil):
     proxima_cidade = engine._selecionar_proxima_cidade(ant)
 
     disponiveis = set(range(len(cidades_brasil))) - {0, 1}
-    assert proxima_cidade in disponiveis
\ No newline at end of file
+    assert proxima_cidade in disponiveis
+
+def test_ajustar_parametros_e_tempo_iteracao(cidades_brasil):
+    """O engine aceita novos parâmetros entre iterações e mede o tempo de cada uma."""
+    engine = ACOEngine("test_ajuste", cidades_brasil, num_formigas=10, seed=3)
+    engine.ajustar_parametros(num_formigas=4, alpha=2.0)
+    assert engine.num_formigas == 4 and engine.alpha == 2.0
+
+    resultado = engine.executar_iteracao()
+    assert resultado["num_formigas"] == 4
+    assert resultado["tempo_iteracao"] > 0
+
+    with pytest.raises(ValueError):
+        engine.ajustar_parametros(gamma=1.0)
+
+
+def test_elite_e_reforco_de_rotas_migradas(cidades_brasil):
+    """O engine mantém rotas de elite distintas e reforça rotas recebidas de outras ilhas."""
+    engine = ACOEngine("ilha", cidades_brasil, num_formigas=10, seed=5, tamanho_elite=3)
+    resultado = engine.executar_iteracao(incluir_feromonios=False)
+    assert resultado["feromonios"] == []
+    distancias = [r["distancia"] for r in resultado["elite"]]
+    assert distancias == sorted(distancias) and len(distancias) <= 3
+    assert len({tuple(r["caminho"]) for r in resultado["elite"]}) == len(distancias)
+
+    rota = list(range(len(cidades_brasil)))
+    antes = engine.feromonios.copy()
+    engine.reforcar_rotas([{"distancia": 1.0, "caminho": rota}], peso=0.5)
+    delta = 0.5 * engine.Q / 1.0
+    assert engine.feromonios[0, 1] == pytest.approx(antes[0, 1] + delta)
+    assert engine.feromonios[rota[-1], 0] == pytest.approx(antes[rota[-1], 0] + delta)
+    assert engine.feromonios[0, 2] == antes[0, 2]
+    assert engine.melhor_distancia == 1.0 and engine.elite[0] == (1.0, rota)
+
+
+def test_integracao_feromonio_externo_em_place(cidades_brasil):
+    """A integração reutiliza o buffer existente em vez de alocar outra matriz."""
+    engine = ACOEngine("test_inplace", cidades_brasil, seed=1)
+    buffer = engine.feromonios
+    engine.integrar_feromonio_externo(np.full_like(buffer, 3.0), peso=0.25)
+    assert engine.feromonios is buffer
+    assert np.allclose(buffer, 0.75 * 0.1 + 0.25 * 3.0)
+    with pytest.raises(ValueError):
+        engine.integrar_feromonio_externo(np.ones((2, 2)))
+
+
+@pytest.mark.parametrize("precisao, tipo_dist, tipo_fero", [
+    ("float64", np.float64, np.float64),
+    ("float32", np.float32, np.float32),
+    ("inteira", np.int32, np.float32),
+])
+def test_precisao_define_dtypes(cidades_brasil, precisao, tipo_dist, tipo_fero):
+    engine = ACOEngine("p", cidades_brasil, num_formigas=5, seed=1, precisao=precisao)
+    assert engine.distancias.dtype == tipo_dist
+    assert engine.heuristica.dtype == tipo_fero and engine.feromonios.dtype == tipo_fero
+    resultado = engine.executar_iteracao()
+    assert resultado["feromonios"].dtype == tipo_fero
+    assert type(resultado["melhor_distancia"]) is float
+
+
+def test_precisao_inteira_arredonda_como_tsplib():
+    cidades = [Cidade(0, 0, 0), Cidade(1, 3, 4.4), Cidade(2, 0, 1.5)]
+    engine = ACOEngine("p", cidades, precisao="inteira")
+    # nint(hypot(3, 4.4)) = nint(5.325) = 5; nint(1.5) = 2
+    assert engine.distancias[0, 1] == 5 and engine.distancias[0, 2] == 2
+
+
+def test_precisao_desconhecida(cidades_brasil):
+    with pytest.raises(ValueError):
+        ACOEngine("p", cidades_brasil, precisao="float16")
+
+
+def test_qualidade_da_solucao_por_precisao():
+    """Quantifica a perda de qualidade da precisão reduzida (comprimento real, float64)."""
+    rng = np.random.default_rng(42)
+    cidades = [Cidade(i, x, y) for i, (x, y) in enumerate(rng.random((25, 2)) * 100)]
+    referencia = ACOEngine("ref", cidades).distancias
+
+    def comprimento_real(caminho):
+        return float(referencia[caminho, np.roll(caminho, -1)].sum())
+
+    medias = {}
+    for precisao in ("float64", "float32", "inteira"):
+        comprimentos = []
+        for seed in range(5):
+            engine = ACOEngine("q", cidades, num_formigas=10, seed=seed, precisao=precisao)
+            for _ in range(20):
+                engine.executar_iteracao(incluir_feromonios=False)
+            comprimentos.append(comprimento_real(engine.melhor_caminho))
+        medias[precisao] = float(np.mean(comprimentos))
+
+    assert abs(medias["float32"] - medias["float64"]) / medias["float64"] < 0.02
+    assert abs(medias["inteira"] - medias["float64"]) / medias["float64"] < 0.05
+
+
+def _engine_paralelo(cidades, seed=5, **kw):
+    return ACOEngine("par", cidades, num_formigas=10, seed=seed, backend="numpy", num_threads=3, **kw)
+
+
+def test_modo_paralelo_e_reprodutivel(cidades_brasil):
+    """Com a mesma semente e o mesmo número de threads o resultado não depende do escalonamento."""
+    a, b = _engine_paralelo(cidades_brasil), _engine_paralelo(cidades_brasil)
+    for _ in range(5):
+        ra, rb = a.executar_iteracao(), b.executar_iteracao()
+    assert np.array_equal(a.feromonios, b.feromonios)
+    assert ra["melhor_caminho"] == rb["melhor_caminho"]
+    assert sorted(ra["melhor_caminho"]) == list(range(len(cidades_brasil)))
+    a.fechar()
+    b.fechar()
+
+
+def test_modo_paralelo_junta_todas_as_formigas(cidades_brasil):
+    engine = _engine_paralelo(cidades_brasil, busca_local=True)
+    engine.ajustar_parametros(num_formigas=7)  # blocos de tamanhos diferentes
+    capturado = {}
+    original = engine._atualizar_feromonios
+    engine._atualizar_feromonios = lambda r, c: (capturado.update(n=len(r)), original(r, c))
+    resultado = engine.executar_iteracao()
+    assert capturado["n"] == 7 and resultado["num_formigas"] == 7
+    engine.fechar()
+    assert engine._pool is None
+
+
+def test_modo_paralelo_exige_kernel(cidades_brasil):
+    with pytest.raises(ValueError):
+        ACOEngine("par", cidades_brasil, backend="python", num_threads=2)
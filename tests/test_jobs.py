@@ -0,0 +1,136 @@
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distributed_aco.core.convergencia import CriterioParada
+from distributed_aco.core.tsplib import ler_tsplib
+from distributed_aco.network.coordinator import Coordinator
+from distributed_aco.network.jobs import Job, JobDirectory
+
+TSP = """NAME : mini
+TYPE : TSP
+EDGE_WEIGHT_TYPE : EUC_2D
+NODE_COORD_SECTION
+1 0 0
+2 3 4
+3 6 0
+EOF
+"""
+
+
+def _cidades(n=4):
+    return [{"id": i, "x": i * 10, "y": (i % 2) * 5, "nome": f"C{i}"} for i in range(n)]
+
+
+def test_ler_tsplib():
+    cabecalho, cidades = ler_tsplib(TSP)
+    assert cabecalho["EDGE_WEIGHT_TYPE"] == "EUC_2D"
+    # o id é o número do nó, não a posição
+    assert [(c.id, c.x, c.y) for c in cidades] == [(1, 0, 0), (2, 3, 4), (3, 6, 0)]
+    with pytest.raises(ValueError):
+        ler_tsplib(TSP.replace("3 6 0", "2 6 0"))
+
+
+def test_job_from_dict_com_arquivo_tsplib(tmp_path):
+    (tmp_path / "mini.tsp").write_text(TSP)
+    job = Job.from_dict({"arquivo": "mini.tsp", "iters": 5,
+                         "parametros": {"alpha": 2.0, "desconhecido": 1}}, "j1", str(tmp_path))
+    assert len(job.cidades) == 3
+    assert job.parametros == {"alpha": 2.0}
+    padrao = CriterioParada()
+    assert job.criterio(padrao) is padrao
+
+
+def test_job_sem_cidades_e_invalido():
+    with pytest.raises(ValueError):
+        Job.from_dict({"iters": 5}, "vazio")
+
+
+def test_job_directory_ciclo_completo(tmp_path):
+    fila = JobDirectory(str(tmp_path), intervalo=0.01)
+    (tmp_path / "b.json").write_text(json.dumps({"cidades": _cidades(), "parada": {"paciencia": 3}}))
+    (tmp_path / "a.json").write_text(json.dumps({"id": "primeiro", "cidades": _cidades()}))
+    (tmp_path / "c.json").write_text("{ quebrado")
+
+    job = fila.next_job(timeout=0)
+    assert job.job_id == "primeiro"
+    assert os.path.exists(tmp_path / "em_andamento" / "a.json")
+
+    saida = fila.complete(job, {"melhor_distancia": 42.0})
+    assert json.loads(open(saida).read()) == {"job_id": "primeiro", "melhor_distancia": 42.0}
+    assert os.path.exists(tmp_path / "concluidos" / "a.json")
+
+    job_b = fila.next_job(timeout=0)
+    assert job_b.job_id == "b"
+    assert job_b.criterio(CriterioParada()).paciencia == 3
+
+    assert fila.next_job(timeout=0) is None
+    assert os.path.exists(tmp_path / "falhas" / "c.json")
+
+
+@patch('distributed_aco.network.coordinator.Coordinator._broadcast')
+def test_coordinator_carrega_job_e_mantem_workers(mock_broadcast, tmp_path):
+    """Ao carregar um job o coordenador reenvia a configuração e não desconecta ninguém."""
+    coordinator = Coordinator(max_iters=1, jobs_dir=str(tmp_path))
+    coordinator.running = True
+    coordinator.clients = {"w1": MagicMock()}
+    job = Job.from_dict({"id": "j1", "cidades": _cidades(5), "iters": 2,
+                         "parametros": {"beta": 3.0}}, "arquivo-j1")
+
+    coordinator._load_job(job, 100, CriterioParada())
+    conf = mock_broadcast.call_args.args[0]
+    assert conf["tipo"] == "configuracao" and conf["job_id"] == "j1"
+    assert len(conf["cidades"]) == 5 and conf["parametros"] == {"beta": 3.0}
+    assert coordinator.max_iters == 2
+
+    resultado = {'melhor_distancia': 10, 'node_id': 'w1', 'melhor_caminho': [0, 1, 2, 3, 4], 'feromonios': []}
+    with patch.object(coordinator, '_wait_results',
+                      side_effect=lambda *a, **k: coordinator.iter_results.update(w1=resultado)):
+        coordinator._run()
+    final = mock_broadcast.call_args.args[0]
+    assert final == {"tipo": "finalizar", "job_id": "j1", "encerrar": False}
+    assert coordinator.report()["iteracoes"] == 2
+
+
+def test_job_com_parada_ou_parametros_invalidos_vai_para_falhas(tmp_path):
+    with pytest.raises(ValueError):
+        Job.from_dict({"cidades": _cidades(), "parada": {"pacience": 3}}, "x")
+    with pytest.raises(ValueError):
+        Job.from_dict({"cidades": _cidades(), "parametros": {"alpha": "alto"}}, "x")
+
+    fila = JobDirectory(str(tmp_path), intervalo=0.01)
+    (tmp_path / "a.json").write_text(json.dumps({"cidades": _cidades(), "parada": {"pacience": 3}}))
+    assert fila.next_job(timeout=0) is None
+    assert os.path.exists(tmp_path / "falhas" / "a.json")
+
+
+def test_job_com_precisao_desconhecida_vai_para_falhas(tmp_path):
+    with pytest.raises(ValueError, match="Precisão desconhecida"):
+        Job.from_dict({"cidades": _cidades(), "parametros": {"precisao": "float16"}}, "x")
+    fila = JobDirectory(str(tmp_path), intervalo=0.01)
+    (tmp_path / "a.json").write_text(json.dumps({"lote": [{"cidades": _cidades()}],
+                                                 "parametros": {"precisao": "float16"}}))
+    assert fila.next_job(timeout=0) is None
+    assert os.path.exists(tmp_path / "falhas" / "a.json")
+
+
+@patch('distributed_aco.network.coordinator.Coordinator._broadcast')
+def test_job_que_falha_na_execucao_nao_derruba_o_servico(mock_broadcast, tmp_path):
+    for nome in ("a", "b"):
+        (tmp_path / f"{nome}.json").write_text(json.dumps({"cidades": _cidades()}))
+    coordinator = Coordinator(max_iters=1, jobs_dir=str(tmp_path))
+    coordinator.running = True
+    coordinator.clients = {"w1": MagicMock()}
+
+    def rodar():
+        if coordinator.job_id == "a":
+            raise RuntimeError("engine quebrou")
+        coordinator.running = False
+
+    with patch.object(coordinator, "_run", side_effect=rodar):
+        coordinator._serve_jobs()
+    assert os.path.exists(tmp_path / "falhas" / "a.json")
+    assert os.path.exists(tmp_path / "concluidos" / "b.json")
+    assert {"tipo": "finalizar", "job_id": "a", "encerrar": False} in [c.args[0] for c in mock_broadcast.call_args_list]
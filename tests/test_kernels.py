@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from distributed_aco.core import kernels
+from distributed_aco.core.aco_engine import ACOEngine
+from distributed_aco.core.cidade import Cidade
+
+
+@pytest.fixture
+def cidades():
+    rng = np.random.default_rng(1)
+    return [Cidade(i, x, y) for i, (x, y) in enumerate(rng.random((30, 2)) * 100)]
+
+
+@pytest.fixture
+def backend_laco(monkeypatch):
+    """Os laços escalares sem compilar: a mesma lógica que o Numba compila."""
+    def depositar(feromonios, rotas, comprimentos, rho, Q):
+        feromonios *= (1 - rho)
+        kernels._depositar_laco(feromonios, rotas, (Q / comprimentos).astype(feromonios.dtype))
+
+    monkeypatch.setitem(kernels.KERNELS, "laco", (
+        lambda p, d, i, u: kernels._construir_rotas_laco(p, d, i, u, u.astype(p.dtype)),
+        depositar, kernels._dois_opt_laco))
+    return "laco"
+
+
+def _rodar(cidades, backend, precisao, busca_local, iteracoes=5):
+    engine = ACOEngine("k", cidades, num_formigas=8, seed=7, precisao=precisao,
+                       backend="python" if backend == "laco" else backend, busca_local=busca_local)
+    engine.backend = backend
+    for _ in range(iteracoes):
+        resultado = engine.executar_iteracao()
+    return engine, resultado
+
+
+@pytest.mark.parametrize("busca_local", [False, True])
+@pytest.mark.parametrize("precisao", ["float64", "float32", "inteira"])
+def test_backends_identicos_bit_a_bit(cidades, backend_laco, precisao, busca_local):
+    ref, ref_res = _rodar(cidades, "python", precisao, busca_local)
+    for backend in ("numpy", backend_laco):
+        engine, res = _rodar(cidades, backend, precisao, busca_local)
+        assert np.array_equal(engine.feromonios, ref.feromonios)
+        assert engine.melhor_caminho == ref.melhor_caminho
+        assert engine.melhor_distancia == ref.melhor_distancia
+        assert res["media_iteracao"] == ref_res["media_iteracao"]
+        assert res["elite"] == ref_res["elite"]
+
+
+def test_peso_total_nulo_escolhe_cidade_livre(cidades):
+    pesos = np.zeros((5, 5))
+    distancias = np.ones((5, 5))
+    uniformes = np.array([[0.99, 0.0, 0.5, 0.3]])
+    rotas, _ = kernels.construir_rotas_numpy(pesos, distancias, np.array([2]), uniformes)
+    laco, _ = kernels._construir_rotas_laco(pesos, distancias, np.array([2]), uniformes, uniformes)
+    assert sorted(rotas[0]) == [0, 1, 2, 3, 4]
+    assert np.array_equal(rotas, laco)
+
+
+def test_dois_opt_desfaz_cruzamento():
+    # quadrado percorrido em "laço": 0-2 e 1-3 se cruzam
+    cidades = [Cidade(0, 0, 0), Cidade(1, 1, 0), Cidade(2, 1, 1), Cidade(3, 0, 1)]
+    d = ACOEngine("k", cidades).distancias
+    cruzada = [0, 2, 1, 3]
+    esperado = kernels.dois_opt(cruzada, d)
+    assert kernels.comprimentos_numpy(d, np.array([esperado]))[0] == pytest.approx(4.0)
+    assert list(kernels.dois_opt_numpy(cruzada, d)) == esperado
+
+
+def test_busca_local_melhora_a_rota(cidades):
+    sem, _ = _rodar(cidades, "numpy", "float64", False, iteracoes=3)
+    com, _ = _rodar(cidades, "numpy", "float64", True, iteracoes=3)
+    assert com.melhor_distancia <= sem.melhor_distancia
+
+
+def test_backend_desconhecido_e_fallback_do_numba(cidades, monkeypatch):
+    with pytest.raises(ValueError):
+        ACOEngine("k", cidades, backend="cuda")
+    monkeypatch.setattr(kernels, "NUMBA_DISPONIVEL", False)
+    assert kernels.resolver_backend("numba") == "numpy"
+
+
+@pytest.mark.skipif(not kernels.NUMBA_DISPONIVEL, reason="numba não instalado")
+def test_numba_identico_a_referencia(cidades):
+    ref, _ = _rodar(cidades, "python", "float32", True)
+    engine, _ = _rodar(cidades, "numba", "float32", True)
+    assert np.array_equal(engine.feromonios, ref.feromonios)
+    assert engine.melhor_caminho == ref.melhor_caminho
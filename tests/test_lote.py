@@ -0,0 +1,137 @@
+import itertools
+import json
+import warnings
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from distributed_aco.core.cidade import Cidade
+from distributed_aco.core.decomposicao import comprimento_rota, coordenadas
+from distributed_aco.core.lote import resolver_lote
+from distributed_aco.network.coordinator import Coordinator
+from distributed_aco.network.jobs import Job
+from distributed_aco.network.worker import Worker
+
+
+def _instancias(tamanhos, seed=0):
+    rng = np.random.default_rng(seed)
+    return [[Cidade(100 * k + i, x, y) for i, (x, y) in enumerate(rng.random((n, 2)) * 100)]
+            for k, n in enumerate(tamanhos)]
+
+
+def _otimo(cidades):
+    xy = coordenadas(cidades)
+    return min(comprimento_rota(xy, (0,) + p) for p in itertools.permutations(range(1, len(cidades))))
+
+
+def test_lote_devolve_rotas_validas_na_ordem_de_entrada():
+    instancias = _instancias([12, 2, 30, 3, 7, 12])
+    resultados = resolver_lote(instancias, iteracoes=5, num_formigas=6, seed=1, tamanho_bloco=4)
+    assert len(resultados) == len(instancias)
+    for cidades, (caminho, distancia) in zip(instancias, resultados):
+        assert sorted(caminho) == list(range(len(cidades)))
+        assert distancia == pytest.approx(comprimento_rota(coordenadas(cidades), caminho))
+
+
+def test_lote_encontra_o_otimo_de_instancias_pequenas():
+    instancias = _instancias([6, 7, 8, 5])
+    resultados = resolver_lote(instancias, iteracoes=30, num_formigas=10, seed=3)
+    for cidades, (_, distancia) in zip(instancias, resultados):
+        assert distancia == pytest.approx(_otimo(cidades))
+
+
+def test_lote_reprodutivel_e_com_busca_local():
+    instancias = _instancias([20, 25, 15])
+    a = resolver_lote(instancias, iteracoes=5, seed=7)
+    assert a == resolver_lote(instancias, iteracoes=5, seed=7)
+    com = resolver_lote(instancias, iteracoes=5, seed=7, busca_local=True)
+    for (_, sem_d), (caminho, com_d), cidades in zip(a, com, instancias):
+        assert com_d <= sem_d
+        assert sorted(caminho) == list(range(len(cidades)))
+
+
+def test_lote_precisao_inteira_e_invalida():
+    (_, distancia), = resolver_lote(_instancias([10]), iteracoes=3, seed=0, precisao="inteira")
+    assert distancia == int(distancia)
+    with pytest.raises(ValueError):
+        resolver_lote(_instancias([5]), precisao="float16")
+
+
+def test_job_em_lote():
+    instancias = _instancias([4, 5])
+    data = {"lote": [{"id": "van-1", "cidades": [c.to_dict() for c in instancias[0]]},
+                     {"cidades": [c.to_dict() for c in instancias[1]]}], "iters": 10}
+    job = Job.from_dict(data, "veiculos")
+    assert [nome for nome, _ in job.lote] == ["van-1", "1"] and job.cidades == []
+    with pytest.raises(ValueError):
+        Job.from_dict({"lote": [{"cidades": [instancias[0][0].to_dict()]}]}, "x")
+
+
+def _coordenador_com_lote(instancias):
+    coord = Coordinator(max_iters=5, balancear=False)
+    coord.lote = [(f"v{k}", cidades) for k, cidades in enumerate(instancias)]
+    coord.running = True
+    coord._broadcast = lambda msg: None
+    return coord
+
+
+def test_coordenador_distribui_o_lote_entre_workers():
+    instancias = _instancias([8, 9, 10, 11, 12])
+    coord = _coordenador_com_lote(instancias)
+    coord.clients = {"w1": object(), "w2": object()}
+    enviados = {}
+
+    def responder(node_id, msg):
+        # o worker de verdade, com um socket falso
+        enviados[node_id] = sorted(msg["instancias"])
+        worker = Worker(node_id)
+        worker.sock = MagicMock()
+        worker._resolver_lote(json.loads(json.dumps(msg)))
+        resposta = json.loads(worker.sock.sendall.call_args.args[0])
+        coord.iter_results[node_id] = resposta["dados"]
+        return True
+
+    coord._send_to = responder
+    assert coord._config_msg()["lote"] is True and coord._config_msg()["cidades"] == []
+    coord._run()
+
+    assert enviados == {"w1": [0, 2, 4], "w2": [1, 3]}
+    lote = coord.report()["lote"]
+    assert [r["id"] for r in lote] == ["v0", "v1", "v2", "v3", "v4"]
+    for cidades, r in zip(instancias, lote):
+        assert sorted(r["melhor_caminho"]) == list(range(len(cidades)))
+        assert r["melhor_rota_ids"] == [cidades[i].id for i in r["melhor_caminho"]]
+    assert coord.global_best["distance"] == pytest.approx(sum(r["melhor_distancia"] for r in lote))
+
+
+def test_coordenador_resolve_o_lote_sem_workers():
+    coord = _coordenador_com_lote(_instancias([6, 6]))
+    coord._run()
+    assert all(r["melhor_distancia"] < float("inf") for r in coord.report()["lote"])
+    assert "resolvido" in coord.stop_reason
+
+
+def test_lote_exige_iteracoes():
+    cidades = [c.to_dict() for c in _instancias([4])[0]]
+    for iters in (0, -3, "10"):
+        with pytest.raises(ValueError):
+            Job.from_dict({"lote": [{"cidades": cidades}], "iters": iters}, "x")
+    # iters 0 continua valendo para jobs comuns com critério de parada
+    assert Job.from_dict({"cidades": cidades, "iters": 0, "parada": {"paciencia": 5}}, "y").max_iters == 0
+
+    coord = _coordenador_com_lote(_instancias([5]))
+    coord.max_iters = 0  # herdado de um coordenador com --iters 0
+    with pytest.raises(ValueError):
+        coord._run()
+
+
+def test_lote_com_uma_cidade_ou_cidades_no_mesmo_ponto():
+    instancias = [[Cidade(1, 5, 5)], [Cidade(k, 3, 3) for k in range(4)], _instancias([6])[0]]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        resultados = resolver_lote(instancias, iteracoes=3, num_formigas=4, seed=0)
+    assert resultados[0] == ([0], 0.0)
+    caminho, distancia = resultados[1]
+    assert sorted(caminho) == [0, 1, 2, 3] and distancia == 0.0
+    assert sorted(resultados[2][0]) == list(range(6))
@@ -59,7 +59,7 @@ def test_coordinator_nao_inicia_run_sem_clientes(mock_socket, mock_sleep, mock_t
 def test_coordinator_lida_com_cliente_morto(mock_socket_class):
     coordinator = Coordinator(port=8000)
     good_worker_sock, dead_worker_sock = MagicMock(), MagicMock()
-    dead_worker_sock.send.side_effect = BrokenPipeError("Test broken pipe")
+    dead_worker_sock.sendall.side_effect = BrokenPipeError("Test broken pipe")
     coordinator.clients = {"good-worker": good_worker_sock, "dead-worker": dead_worker_sock}
     coordinator._broadcast({"tipo": "teste"})
     assert "dead-worker" not in coordinator.clients
@@ -188,8 +188,8 @@ def test_worker_executa_iteracao_e_envia_resultado(mock_socket_class, mock_conne
     # Verifica se o método do engine foi chamado
     worker.engine.executar_iteracao.assert_called_once()
     # Verifica se o resultado foi enviado de volta pelo socket
-    mock_socket_instance.send.assert_called_once()
-    sent_data = json.loads(mock_socket_instance.send.call_args[0][0].decode())
+    mock_socket_instance.sendall.assert_called_once()
+    sent_data = json.loads(mock_socket_instance.sendall.call_args[0][0].decode())
     assert sent_data['tipo'] == 'resultado_iteracao'
     assert sent_data['dados']['distancia'] == 123
 
@@ -270,4 +270,78 @@ def test_worker_loop_com_erro_de_rede(mock_socket_class, mock_connect):
     worker.loop()
     
     # A verificação principal é que o worker parou de rodar
-    assert worker.running is False
\ No newline at end of file
+    assert worker.running is False
+@patch('distributed_aco.network.coordinator.Coordinator._broadcast')
+def test_coordinator_para_cedo_sem_melhora(mock_broadcast):
+    """O _run deve parar antes de max_iters quando o critério de paciência dispara."""
+    from distributed_aco.core.convergencia import CriterioParada
+    coordinator = Coordinator(port=8000, max_iters=50, criterio=CriterioParada(paciencia=3))
+    coordinator.running = True
+    coordinator.clients = {"w1": MagicMock()}
+
+    resultado = {'melhor_distancia': 100, 'node_id': 'w1', 'melhor_caminho': [0, 1], 'feromonios': []}
+
+    def popula(*args, **kwargs):
+        coordinator.iter_results = {'w1': resultado}
+
+    with patch.object(coordinator, '_wait_results', side_effect=popula):
+        coordinator._run()
+
+    assert coordinator.iterations_done == 4
+    assert "sem melhora" in coordinator.report()['motivo_parada']
+    assert mock_broadcast.call_args_list[-1].args[0]['tipo'] == 'finalizar'
+
+
+def test_coordinator_agrega_matrizes_codificadas_em_float32():
+    from distributed_aco.network.protocol import codificar_matriz
+    coordinator = Coordinator(port=8000, precisao="float32")
+    m1 = np.ones((3, 3), dtype=np.float32)
+    coordinator.iter_results = {
+        'w1': {'melhor_distancia': 10, 'node_id': 'w1', 'melhor_caminho': [0, 1, 2],
+               'feromonios': codificar_matriz(m1)},
+        'w2': {'melhor_distancia': 12, 'node_id': 'w2', 'melhor_caminho': [0, 2, 1],
+               'feromonios': (3 * m1).tolist()},
+    }
+    coordinator._aggregate()
+    assert coordinator.global_pheromone.dtype == np.float32
+    assert np.allclose(coordinator.global_pheromone, 2.0)
+    assert coordinator._config_msg()["precisao"] == "float32"
+
+
+def test_coordinator_configura_o_worker_antes_de_qualquer_outro_envio():
+    """Um envio do laço principal não passa à frente da configuração do worker."""
+    import threading, time
+    coordinator = Coordinator(port=8000)
+    coordinator.running = True
+    enviados, fim = [], threading.Event()
+
+    def enviar(data):
+        tipo = json.loads(data)["tipo"]
+        if tipo == "configuracao":
+            time.sleep(0.2)  # configuração grande, ainda a caminho
+        enviados.append(tipo)
+        return len(data)
+
+    registro = json.dumps({"tipo": "registro", "node_id": "w1"}).encode() + b"\n"
+    leituras = iter([registro])
+
+    def receber(*args):
+        # depois do registro, a conexão fica aberta até o fim do teste
+        proxima = next(leituras, None)
+        if proxima is None:
+            fim.wait(5)
+            return b""
+        return proxima
+
+    sock = MagicMock()
+    sock.sendall.side_effect = enviar
+    sock.recv.side_effect = receber
+
+    t = threading.Thread(target=coordinator._handle_client, args=(sock, ("127.0.0.1", 1)))
+    t.start()
+    while "w1" not in coordinator.clients:
+        time.sleep(0.001)
+    coordinator._broadcast({"tipo": "executar_iteracao"})
+    fim.set()
+    t.join(5)
+    assert enviados == ["configuracao", "executar_iteracao"]
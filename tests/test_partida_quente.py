@@ -0,0 +1,129 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from distributed_aco.core.aco_engine import ACOEngine
+from distributed_aco.core.cidade import Cidade
+from distributed_aco.core.partida_quente import (PartidaQuente, carregar_feromonios, carregar_rota,
+                                                 reforcar_rota, reparar_rota, salvar_feromonios)
+from distributed_aco.network.coordinator import Coordinator
+from distributed_aco.network.jobs import Job, JobDirectory
+from distributed_aco.network.protocol import decodificar_matriz
+from distributed_aco.network.worker import Worker
+
+
+@pytest.fixture
+def quadrado():
+    # ids não sequenciais, como numa base de clientes
+    return [Cidade(10, 0, 0), Cidade(20, 10, 0), Cidade(30, 10, 10), Cidade(40, 0, 10)]
+
+
+def test_reparar_rota_remove_e_insere_na_aresta_mais_barata(quadrado):
+    hoje = quadrado[:3] + [Cidade(50, 5, 10.5)]   # 40 saiu; 50 fica perto da aresta 30 -> 10
+    rota = reparar_rota([10, 20, 40, 30, 10, 99], hoje)
+    assert rota == [0, 1, 2, 3]
+
+
+def test_reparar_rota_vazia_constroi_por_insercao(quadrado):
+    assert sorted(reparar_rota([], quadrado)) == [0, 1, 2, 3]
+
+
+def test_snapshot_remapeado_para_as_cidades_atuais(tmp_path, quadrado):
+    matriz = np.arange(16, dtype=np.float32).reshape(4, 4)
+    salvar_feromonios(tmp_path / "f.npz", matriz, quadrado)
+
+    hoje = [quadrado[2], Cidade(99, 5, 5), quadrado[0]]
+    m = carregar_feromonios(tmp_path / "f.npz", hoje)
+    assert m.dtype == np.float32
+    assert m[0, 2] == matriz[2, 0] and m[2, 0] == matriz[0, 2] and m[0, 0] == matriz[2, 2]
+    mediana = np.median(matriz[~np.eye(4, dtype=bool)])
+    assert m[1, 0] == m[2, 1] == m[1, 1] == mediana
+
+
+def test_carregar_rota_de_resultado_ou_lista(tmp_path):
+    (tmp_path / "r.json").write_text(json.dumps({"melhor_rota_ids": [3, 1, 2]}))
+    (tmp_path / "l.json").write_text("[2, 1]")
+    assert carregar_rota(tmp_path / "r.json") == [3, 1, 2]
+    assert carregar_rota(tmp_path / "l.json") == [2, 1]
+    (tmp_path / "x.json").write_text("{}")
+    with pytest.raises(ValueError):
+        carregar_rota(tmp_path / "x.json")
+
+
+def test_engine_aquecido_parte_da_rota_anterior(quadrado):
+    engine = ACOEngine("q", quadrado, num_formigas=3, seed=1)
+    engine.aquecer([0, 1, 2, 3], np.full((4, 4), 0.5), reforco=1.0)
+    assert engine.melhor_distancia == pytest.approx(40.0)
+    assert engine.melhor_caminho == [0, 1, 2, 3]
+    assert engine.feromonios[0, 1] == engine.feromonios[1, 0] == 1.0
+    assert engine.feromonios[0, 2] == 0.5
+    engine.executar_iteracao()
+    assert engine.melhor_distancia <= 40.0
+
+    with pytest.raises(ValueError):
+        engine.aquecer([0, 1, 1, 3])
+    with pytest.raises(ValueError):
+        engine.aquecer(feromonios=np.ones((3, 3)))
+
+
+def test_reforco_e_relativo(quadrado):
+    m = np.full((4, 4), 2.0)
+    reforcar_rota(m, [0, 2, 1, 3], reforco=0.5)
+    assert m[0, 2] == m[2, 0] == m[3, 0] == 3.0 and m[0, 1] == 2.0
+
+
+def test_coordenador_envia_e_aplica_a_partida(tmp_path, quadrado):
+    salvar_feromonios(tmp_path / "f.npz", np.full((4, 4), 0.3), quadrado)
+    partida = PartidaQuente(feromonios=str(tmp_path / "f.npz"), ids=[10, 20, 30, 40])
+    coord = Coordinator(cidades=quadrado, partida_quente=partida, balancear=False)
+
+    cfg = coord._config_msg()["partida_quente"]
+    assert cfg["caminho"] == [0, 1, 2, 3]
+    assert np.allclose(decodificar_matriz(cfg["feromonios"]), 0.3)
+
+    coord.running = True
+    with patch.object(coord, "_broadcast"):
+        coord._run()
+    assert coord.global_best["distance"] == pytest.approx(40.0)
+    assert coord.global_pheromone[0, 1] == pytest.approx(0.6)
+    assert coord.report()["melhor_rota_ids"] == [10, 20, 30, 40]
+
+    worker = Worker("w", ants=3)
+    worker._configurar(coord._config_msg())
+    assert worker.engine.melhor_distancia == pytest.approx(40.0)
+    assert np.allclose(worker.engine.feromonios, coord.global_pheromone)
+
+
+def test_job_com_partida_quente_e_snapshot_no_resultado(tmp_path, quadrado):
+    (tmp_path / "resultados").mkdir()
+    (tmp_path / "resultados" / "ontem.json").write_text(json.dumps({"melhor_rota_ids": [10, 30, 20]}))
+    data = {"cidades": [c.to_dict() for c in quadrado],
+            "partida_quente": {"rota": "resultados/ontem.json", "reforco": 2.0}}
+    job = Job.from_dict(data, "hoje", str(tmp_path))
+    preparado = job.partida_quente.preparar(job.cidades, np.float64)
+    assert sorted(preparado["caminho"]) == [0, 1, 2, 3] and preparado["reforco"] == 2.0
+
+    with pytest.raises(ValueError):
+        Job.from_dict({**data, "partida_quente": {"feromonios": "nao_existe.npz"}}, "x", str(tmp_path))
+
+    fila = JobDirectory(str(tmp_path))
+    fila.complete(job, {"melhor_distancia": 40.0}, np.ones((4, 4)))
+    assert carregar_feromonios(tmp_path / "resultados" / "hoje.npz", quadrado).shape == (4, 4)
+
+
+def test_partida_quente_com_tsplib_que_perdeu_um_no(tmp_path):
+    from distributed_aco.core.tsplib import ler_tsplib
+    nos = [(1, 0, 0), (2, 10, 0), (3, 10, 10), (4, 0, 10), (5, 5, 12)]
+    tsp = lambda ns: "NODE_COORD_SECTION\n" + "\n".join(f"{n} {x} {y}" for n, x, y in ns) + "\nEOF\n"
+    _, ontem = ler_tsplib(tsp(nos))
+    matriz = np.arange(25, dtype=float).reshape(5, 5)
+    salvar_feromonios(tmp_path / "f.npz", matriz, ontem)
+
+    # o nó 2 saiu: os seguintes continuam sendo as mesmas cidades
+    _, hoje = ler_tsplib(tsp(nos[:1] + nos[2:]))
+    assert [c.id for c in hoje] == [1, 3, 4, 5]
+    m = carregar_feromonios(tmp_path / "f.npz", hoje)
+    assert m[1, 2] == matriz[2, 3] and m[0, 3] == matriz[0, 4]
+    assert reparar_rota([1, 2, 3, 5, 4], hoje) == [0, 1, 3, 2]
@@ -0,0 +1,141 @@
+import json
+import socket
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from distributed_aco.core.aco_engine import ACOEngine
+from distributed_aco.core.cidade import Cidade
+from distributed_aco.network.coordinator import Coordinator
+from distributed_aco.network.protocol import MessageReader, codificar_matriz, decodificar_matriz, send_msg
+from distributed_aco.network.worker import Worker
+
+
+@pytest.fixture
+def cidades():
+    return [Cidade(i, x, y) for i, (x, y) in enumerate([(0, 0), (3, 1), (5, 4), (1, 6), (-2, 3)])]
+
+
+@pytest.fixture
+def conexao(cidades):
+    """Worker em modo pipeline rodando numa thread, ligado a um socketpair."""
+    lado_worker, lado_teste = socket.socketpair()
+    lado_teste.settimeout(5.0)
+    worker = Worker("w1", ants=4)
+    worker.sock, worker.reader = lado_worker, MessageReader(lado_worker)
+    worker._configurar({"tipo": "configuracao", "job_id": "j", "cidades": [c.to_dict() for c in cidades],
+                        "pipeline": 2})
+    worker.running = True
+    thread = threading.Thread(target=worker._loop_pipeline, daemon=True)
+    thread.start()
+    yield worker, lado_teste, MessageReader(lado_teste), thread
+    lado_teste.close()
+    thread.join(timeout=5.0)
+    lado_worker.close()
+
+
+def _iteracoes(reader, n):
+    return [reader.recv()["dados"]["iteracao"] for _ in range(n)]
+
+
+def _nada_chega(sock, reader):
+    sock.settimeout(0.3)
+    try:
+        return reader.recv() is None
+    except socket.timeout:
+        return True
+    finally:
+        sock.settimeout(5.0)
+
+
+def test_worker_avanca_no_maximo_o_atraso_permitido(conexao):
+    worker, sock, reader, thread = conexao
+    assert worker.atraso_max == 2
+    send_msg(sock, {"tipo": "executar_iteracao"})
+    # sem nenhuma rodada incorporada, roda atraso_max iterações e para
+    assert _iteracoes(reader, 2) == [1, 2]
+    assert _nada_chega(sock, reader)
+
+    send_msg(sock, {"tipo": "sincronizar", "iteracao": 1, "incorporadas": {"w1": 2}})
+    assert _iteracoes(reader, 2) == [3, 4]
+    assert _nada_chega(sock, reader)
+
+    send_msg(sock, {"tipo": "finalizar", "encerrar": True})
+    thread.join(timeout=5.0)
+    assert not thread.is_alive() and not worker.running
+
+
+def test_worker_aplica_a_atualizacao_global_entre_iteracoes(conexao):
+    worker, sock, reader, thread = conexao
+    send_msg(sock, {"tipo": "executar_iteracao"})
+    dados = reader.recv()["dados"]
+    # a matriz é codificada pela thread de envio
+    assert decodificar_matriz(dados["feromonios"]).shape == (5, 5)
+    _iteracoes(reader, 1)
+
+    with patch.object(worker.engine, "integrar_feromonio_externo") as integrar:
+        send_msg(sock, {"tipo": "atualizar_feromonios", "feromonios": codificar_matriz(np.ones((5, 5))),
+                        "peso": 0.5})
+        send_msg(sock, {"tipo": "sincronizar", "incorporadas": {"w1": 2}})
+        _iteracoes(reader, 2)
+    integrar.assert_called_once()
+    assert integrar.call_args.args[1] == 0.5
+
+    # novo job: para de iterar até a próxima ordem
+    send_msg(sock, {"tipo": "finalizar", "encerrar": False})
+    assert _nada_chega(sock, reader)
+    assert thread.is_alive() and worker.running
+
+
+def _resultados_de(engine):
+    dados = engine.executar_iteracao()
+    dados["feromonios"] = codificar_matriz(dados["feromonios"])
+    return json.loads(json.dumps(dados))
+
+
+def test_coordenador_incorpora_o_resultado_mais_recente(cidades):
+    coord = Coordinator(cidades=cidades, max_iters=3, balancear=False, pipeline=1)
+    assert coord._config_msg()["pipeline"] == 1
+    coord.running = True
+    coord.clients = {"rapido": object(), "lento": object()}
+    engines = {w: ACOEngine(w, cidades, 4, seed=i) for i, w in enumerate(coord.clients)}
+    enviados = []
+
+    def broadcast(msg):
+        enviados.append(msg)
+        if msg["tipo"] in ("executar_iteracao", "sincronizar"):
+            # o worker rápido entrega duas iterações por rodada
+            with coord.lock:
+                for w, n in (("rapido", 2), ("lento", 1)):
+                    for _ in range(n):
+                        coord._filas.setdefault(w, []).append(_resultados_de(engines[w]))
+
+    coord._broadcast = broadcast
+    coord._run()
+
+    assert [m["tipo"] for m in enviados].count("executar_iteracao") == 1
+    sincronizacoes = [m["incorporadas"] for m in enviados if m["tipo"] == "sincronizar"]
+    assert sincronizacoes == [{"rapido": 2, "lento": 1}, {"rapido": 4, "lento": 2},
+                              {"rapido": 6, "lento": 3}]
+    melhor = min(e.melhor_distancia for e in engines.values())
+    assert coord.global_best["distance"] == pytest.approx(melhor)
+    assert not coord._em_pipeline
+
+
+def test_coordenador_em_pipeline_inicia_quem_chega_depois(cidades):
+    coord = Coordinator(cidades=cidades, balancear=False, pipeline=2)
+    coord.running, coord._em_pipeline = True, True
+    sock = MagicMock()
+    sock.recv.side_effect = [json.dumps({"tipo": "registro", "node_id": "w9"}).encode() + b"\n", b""]
+    coord._handle_client(sock, ("127.0.0.1", 1))
+    tipos = [json.loads(c.args[0])["tipo"] for c in sock.sendall.call_args_list]
+    assert tipos == ["configuracao", "executar_iteracao"]
+
+
+def test_pipeline_so_no_modo_iterativo(cidades):
+    assert "pipeline" not in Coordinator(cidades=cidades)._config_msg()
+    assert "pipeline" not in Coordinator(cidades=cidades, pipeline=1, decomposicao="grade")._config_msg()
+    with pytest.raises(ValueError):
+        Coordinator(pipeline=-1)
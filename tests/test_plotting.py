@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+from distributed_aco.core.cidade import Cidade
+from distributed_aco import plotting
+
+
+def test_cli_nao_importa_bibliotecas_de_graficos():
+    """Workers não devem pagar a importação de matplotlib/plotly."""
+    codigo = ("import sys, distributed_aco.cli; "
+              "print(any(m in sys.modules for m in ('matplotlib', 'plotly')))")
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == "False"
+
+
+def test_plotagem_sem_bibliotecas_instaladas(monkeypatch, tmp_path, capsys):
+    """Sem as dependências opcionais, os gráficos são pulados com um aviso."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(sys.modules, "plotly.graph_objects", None)
+    monkeypatch.setitem(sys.modules, "matplotlib", None)
+    cidades = [Cidade(i, i, i * i) for i in range(4)]
+
+    plotting.plotar_solucao(cidades, [0, 1, 2, 3], "t")
+    plotting.plotar_convergencia([3.0, 2.0])
+    plotting.plotar_solucao_3d_plotly(cidades, [0, 1, 2, 3], "t")
+
+    assert list(tmp_path.iterdir()) == []
+    assert capsys.readouterr().out.count("não instalado") == 3
+
+
+def test_rota_grande_sem_rotulos_e_com_webgl(monkeypatch, tmp_path):
+    """Milhares de cidades: sem texto fixo, HTML em Scattergl pequeno."""
+    import numpy as np
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    n = 5000
+    cidades = [Cidade(f"C{i}", x, y) for i, (x, y) in enumerate(rng.random((n, 2)) * 1000)]
+    caminho = list(rng.permutation(n))
+
+    plotting.plotar_solucao(cidades, caminho, "grande")
+    plotting.plotar_solucao_3d_plotly(cidades, caminho, "grande")
+
+    assert (tmp_path / "melhor_rota_estilizada.png").exists()
+    html = (tmp_path / "melhor_rota_3d_interativa.html").read_text()
+    assert '"type":"scattergl"' in html
+    assert "C4999" not in html
+    assert len(html) < 1_000_000
+
+
+def test_graficos_em_segundo_plano(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    cidades = [Cidade(f"C{i}", i, i * i) for i in range(5)]
+    processo = plotting.gerar_graficos_em_segundo_plano(cidades, [0, 2, 4, 3, 1], "bg")
+    processo.join(60)
+    assert processo.exitcode == 0
+    assert (tmp_path / "melhor_rota_estilizada.png").exists()
+    assert (tmp_path / "melhor_rota_3d_interativa.html").exists()
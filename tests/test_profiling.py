@@ -0,0 +1,73 @@
+import pstats
+
+import pytest
+
+from distributed_aco.profiling import Perfilador, parse_janela
+
+
+class NoFalso:
+    """Nó mínimo que executa algumas 'iterações' chamando o perfilador."""
+
+    def __init__(self, iteracoes=5):
+        self.perfilador = None
+        self.iteracoes = iteracoes
+        self.ativo_por_iteracao = []
+
+    def loop(self):
+        for k in range(1, self.iteracoes + 1):
+            self.perfilador.iteracao(k)
+            self.ativo_por_iteracao.append(self.perfilador.ativo)
+            sum(i * i for i in range(2000))
+        self.perfilador.parar()
+
+
+def test_parse_janela():
+    assert parse_janela(None) is None
+    assert parse_janela("10:20") == (10, 20)
+    assert parse_janela("7") == (7, 7)
+    with pytest.raises(ValueError):
+        parse_janela("20:10")
+    with pytest.raises(ValueError):
+        parse_janela("a:b")
+
+
+def test_perfilador_cprofile_respeita_janela(tmp_path):
+    no = NoFalso()
+    perfilador = Perfilador("w1", diretorio=str(tmp_path), janela=(2, 3))
+    perfilador.executar(no, no.loop)
+
+    assert no.ativo_por_iteracao == [False, True, True, False, False]
+    stats = pstats.Stats(str(tmp_path / "w1.pstats"))
+    assert stats.total_calls > 0
+
+
+def test_perfilador_amostragem_gera_pilhas(tmp_path):
+    no = NoFalso(iteracoes=500)
+    perfilador = Perfilador("coord", modo="amostragem", diretorio=str(tmp_path), intervalo=0.0005)
+    perfilador.executar(no, no.loop)
+
+    linhas = (tmp_path / "coord.collapsed").read_text().splitlines()
+    assert linhas
+    pilha, n = linhas[0].rsplit(" ", 1)
+    assert ";" in pilha and int(n) > 0
+
+
+def test_perfilador_sem_janela_cobre_nos_sem_iteracoes(tmp_path):
+    """Sintonia, decomposição e lotes nunca chamam iteracao(): o nó inteiro é perfilado."""
+    def trabalho():
+        return sum(i * i for i in range(20000))
+
+    class NoSemIteracoes:
+        perfilador = None
+
+        def loop(self):
+            trabalho()
+            self.perfilador.parar()  # fim de um job: o perfil continua
+            trabalho()
+
+    no = NoSemIteracoes()
+    perfilador = Perfilador("sintonia", diretorio=str(tmp_path))
+    perfilador.executar(no, no.loop)
+    funcoes = {nome for (_, _, nome) in pstats.Stats(str(tmp_path / "sintonia.pstats")).stats}
+    assert "trabalho" in funcoes
+    assert not perfilador.ativo
@@ -0,0 +1,72 @@
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from distributed_aco.network.protocol import (MessageReader, codificar_matriz,
+                                              decodificar_matriz, send_msg)
+
+
+def _reader(*chunks):
+    sock = MagicMock()
+    sock.recv.side_effect = list(chunks) + [b'']
+    return MessageReader(sock)
+
+
+def test_send_msg_termina_com_quebra_de_linha():
+    sock = MagicMock()
+    send_msg(sock, {"tipo": "teste"})
+    enviado = sock.sendall.call_args[0][0]
+    assert enviado.endswith(b"\n")
+    assert json.loads(enviado) == {"tipo": "teste"}
+
+
+def test_reader_separa_mensagens_concatenadas():
+    reader = _reader(b'{"a": 1}\n{"b": 2}\n')
+    assert reader.recv() == {"a": 1}
+    assert reader.recv() == {"b": 2}
+    assert reader.recv() is None
+
+
+def test_reader_junta_mensagem_dividida_em_pedacos():
+    msg = {"feromonios": [[0.1] * 50 for _ in range(50)], "nome": "São Paulo"}
+    dados = (json.dumps(msg, ensure_ascii=False) + "\n").encode()
+    pedacos = [dados[i:i + 7] for i in range(0, len(dados), 7)]
+    reader = _reader(*pedacos)
+    assert reader.recv() == msg
+    assert reader.recv() is None
+
+
+def test_reader_aceita_json_sem_delimitador():
+    reader = _reader(b'{"tipo": "registro"}', b'{"tipo": "resultado_iteracao"}')
+    assert reader.recv()["tipo"] == "registro"
+    assert reader.recv()["tipo"] == "resultado_iteracao"
+
+
+def test_reader_rejeita_json_invalido():
+    sock = MagicMock()
+    sock.recv.return_value = b'{"tipo": "registro", "node_id": "worker-1"'
+    with pytest.raises(json.JSONDecodeError):
+        MessageReader(sock).recv()
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_matriz_codificada_ida_e_volta(dtype):
+    matriz = np.random.default_rng(0).random((30, 30)).astype(dtype)
+    obj = json.loads(json.dumps(codificar_matriz(matriz)))
+    volta = decodificar_matriz(obj)
+    assert volta.dtype == dtype
+    assert np.array_equal(volta, matriz)
+
+
+def test_matriz_float32_ocupa_menos_que_lista_json():
+    matriz = np.random.default_rng(0).random((100, 100))
+    lista = len(json.dumps(matriz.tolist()))
+    f64 = len(json.dumps(codificar_matriz(matriz)))
+    f32 = len(json.dumps(codificar_matriz(matriz.astype(np.float32))))
+    assert f32 < f64 / 1.9 and f64 < lista / 1.5
+
+
+def test_decodificar_aceita_lista_aninhada():
+    assert decodificar_matriz([[1, 2], [3, 4]], np.float32).dtype == np.float32
@@ -0,0 +1,142 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from distributed_aco.network.aggregation import combinar_elites, combinar_resultados
+from distributed_aco.network.protocol import codificar_matriz, decodificar_matriz
+from distributed_aco.network.relay import Relay
+
+
+def _resultado(node_id, dist, valor, formigas=10, **extra):
+    return {"node_id": node_id, "melhor_distancia": dist, "melhor_caminho": [0, 1, 2],
+            "media_iteracao": dist + 1, "feromonios": codificar_matriz(np.full((3, 3), valor)),
+            "elite": [{"distancia": dist, "caminho": [0, 1, 2]}], "num_formigas": formigas, **extra}
+
+
+def test_combinar_em_arvore_igual_a_combinar_direto():
+    folhas = [_resultado(f"w{i}", 10 + i, float(i)) for i in range(5)]
+    direto = combinar_resultados(folhas)
+
+    grupo_a = combinar_resultados(folhas[:2])
+    grupo_b = combinar_resultados(folhas[2:])
+    for g in (grupo_a, grupo_b):
+        g["feromonios"] = codificar_matriz(g["feromonios"])
+    arvore = combinar_resultados([grupo_a, grupo_b])
+
+    assert np.allclose(arvore["feromonios"], direto["feromonios"])
+    assert np.allclose(direto["feromonios"], 2.0)
+    assert arvore["contribuintes"] == direto["contribuintes"] == 5
+    assert arvore["media_iteracao"] == pytest.approx(direto["media_iteracao"])
+    assert (arvore["node_id"], arvore["melhor_distancia"]) == ("w0", 10)
+    assert arvore["num_formigas"] == 50
+
+
+def test_combinar_sem_matrizes_e_elite_distinta():
+    r = combinar_resultados([{"node_id": "a", "melhor_distancia": 5, "melhor_caminho": [0],
+                              "feromonios": [], "elite": []}])
+    assert r["feromonios"] is None and r["num_formigas"] is None
+    elite = combinar_elites([[{"distancia": 3, "caminho": [0, 1]}, {"distancia": 1, "caminho": [1, 0]}],
+                             [{"distancia": 3, "caminho": [0, 1]}, {"distancia": 2, "caminho": [2, 0]}]], 2)
+    assert [e["distancia"] for e in elite] == [1, 2]
+    assert combinar_resultados([]) is None
+
+
+@pytest.fixture
+def relay():
+    r = Relay("sub", balancear=False)
+    r.running = True
+    r.upstream = MagicMock()
+    r.clients = {"w1": MagicMock(), "w2": MagicMock()}
+    for w, n in (("w1", 10), ("w2", 30)):
+        r._register_worker(w, {"num_formigas": n})
+    return r
+
+
+def _enviado(sock):
+    return json.loads(sock.sendall.call_args.args[0])
+
+
+def test_relay_combina_o_grupo_e_responde_uma_vez(relay):
+    def responder(*args):
+        relay.iter_results = {"w1": _resultado("w1", 20, 1.0, 10, tempo_iteracao=0.5),
+                              "w2": _resultado("w2", 15, 3.0, 30, tempo_iteracao=1.0)}
+
+    with patch.object(relay, "_broadcast") as mock_broadcast, \
+            patch.object(relay, "_wait_results", side_effect=responder):
+        relay._iteracao({"tipo": "executar_iteracao"})
+
+    mock_broadcast.assert_called_once_with({"tipo": "executar_iteracao"})
+    msg = _enviado(relay.upstream)
+    assert msg["tipo"] == "resultado_iteracao" and relay.upstream.sendall.call_count == 1
+    dados = msg["dados"]
+    assert (dados["node_id"], dados["melhor_distancia"]) == ("w2", 15)
+    assert dados["contribuintes"] == 2 and dados["num_formigas"] == 40
+    assert np.allclose(decodificar_matriz(dados["feromonios"]), 2.0)
+    # tempo de cálculo do grupo, não da rodada: 40 formigas a 20 + 30 formigas/s
+    assert dados["tempo_iteracao"] == pytest.approx(40 / 50)
+
+
+def test_relay_sem_respostas_nao_trava_o_superior(relay):
+    with patch.object(relay, "_broadcast"), patch.object(relay, "_wait_results"):
+        relay._iteracao({"tipo": "executar_iteracao"})
+    dados = _enviado(relay.upstream)["dados"]
+    assert dados["melhor_distancia"] == float("inf") and dados["contribuintes"] == 0
+    # o nó superior continua vendo as formigas do grupo, não 0
+    assert dados["num_formigas"] == 40
+
+
+def test_relay_divide_total_de_formigas(relay):
+    with patch.object(relay, "_send_to") as mock_send, patch.object(relay, "_broadcast") as mock_broadcast:
+        relay._ajustar({"tipo": "ajustar_parametros", "num_formigas": 80, "alpha": 2.0})
+    mock_broadcast.assert_called_once_with({"tipo": "ajustar_parametros", "alpha": 2.0})
+    enviados = {c.args[0]: c.args[1]["num_formigas"] for c in mock_send.call_args_list}
+    assert enviados == {"w1": 20, "w2": 60}
+
+
+def test_relay_repassa_configuracao_de_cima(relay):
+    cfg = {"tipo": "configuracao", "job_id": "j1", "cidades": [], "parametros": {"num_formigas": 5},
+           "precisao": "float32", "cooperacao": {"modo": "media", "tamanho_elite": 4}}
+    with patch.object(relay, "_broadcast") as mock_broadcast:
+        relay._configurar(cfg)
+    mock_broadcast.assert_called_once_with(cfg)
+    assert relay._config_msg() is cfg
+    assert (relay.job_id, relay.precisao, relay.tamanho_elite) == ("j1", "float32", 4)
+    assert relay._formigas == {"w1": 5, "w2": 5}
+
+
+def test_relay_divide_subproblemas_entre_o_grupo(relay):
+    relay.job_id = "j1"
+    lotes = {}
+
+    def enviar(node_id, msg):
+        lotes[node_id] = sorted(msg["subproblemas"])
+        relay.iter_results[node_id] = {"resultados": {i: {"caminho": [0], "distancia": 0.0}
+                                                      for i in msg["subproblemas"]}}
+        return True
+
+    msg = {"tipo": "resolver_subproblemas", "job_id": "j1", "iteracoes": 5,
+           "subproblemas": {str(i): {"cidades": []} for i in range(3)}}
+    with patch.object(relay, "_send_to", side_effect=enviar), patch.object(relay, "_wait_results"):
+        relay._repassar(msg, "subproblemas", "resultado_subproblemas")
+    assert lotes == {"w1": [0, 2], "w2": [1]}
+    resposta = _enviado(relay.upstream)
+    assert (resposta["tipo"], resposta["job_id"]) == ("resultado_subproblemas", "j1")
+    assert sorted(resposta["dados"]["resultados"]) == ["0", "1", "2"]
+
+
+def test_relay_em_pipeline_itera_a_cada_sincronizar(relay):
+    cfg = {"tipo": "configuracao", "job_id": "j1", "cidades": [], "pipeline": 2}
+    with patch.object(relay, "_broadcast") as mock_broadcast:
+        relay._configurar(cfg)
+    # o grupo abaixo continua em lock-step
+    assert "pipeline" not in mock_broadcast.call_args.args[0]
+    assert "pipeline" not in relay._config_msg()
+
+    relay.reader = MagicMock()
+    relay.reader.recv.side_effect = [{"tipo": "sincronizar", "incorporadas": {"sub": 1}},
+                                     {"tipo": "finalizar"}]
+    with patch.object(relay, "_iteracao") as mock_iteracao, patch.object(relay, "_broadcast"):
+        relay._loop()
+    mock_iteracao.assert_called_once_with({"tipo": "executar_iteracao"})
@@ -0,0 +1,48 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from distributed_aco.network.sharing import SharingPolicy
+from distributed_aco.network.worker import Worker
+
+
+def test_politica_intervalo_e_inalterado():
+    politica = SharingPolicy(peso=0.2, intervalo=2)
+    m = np.ones((3, 3))
+    assert politica.deve_enviar(1, m) is False
+    assert politica.deve_enviar(2, m) is True
+    assert politica.deve_enviar(4, m.copy()) is False  # não mudou
+    m[0, 1] = 2.0
+    assert politica.deve_enviar(6, m) is True
+
+
+def test_politica_sempre_enviar_e_validacao():
+    politica = SharingPolicy(pular_inalterado=False)
+    m = np.ones((2, 2))
+    assert politica.deve_enviar(1, m) and politica.deve_enviar(2, m)
+    assert SharingPolicy(peso=0.0).deve_enviar(1, m) is False
+    with pytest.raises(ValueError):
+        SharingPolicy(peso=1.5)
+    with pytest.raises(ValueError):
+        SharingPolicy(intervalo=0)
+
+
+@patch.object(Worker, 'connect', return_value=True)
+def test_worker_mistura_feromonio_antes_da_iteracao(mock_connect):
+    """Uma matriz recebida em executar_iteracao é integrada antes de rodar a iteração."""
+    sock = MagicMock()
+    worker = Worker("w1")
+    worker.sock = sock
+    worker.engine = MagicMock()
+    ordem = []
+    worker.engine.integrar_feromonio_externo.side_effect = lambda *a: ordem.append("integrar")
+    worker.engine.executar_iteracao.side_effect = lambda *a: ordem.append("executar") or {}
+    msg = {"tipo": "executar_iteracao", "feromonios": np.ones((3, 3)).tolist(), "peso": 0.3}
+    sock.recv.side_effect = [json.dumps(msg).encode(), b'']
+
+    worker.loop()
+
+    assert ordem == ["integrar", "executar"]
+    assert worker.engine.integrar_feromonio_externo.call_args.args[1] == 0.3
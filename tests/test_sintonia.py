@@ -0,0 +1,102 @@
+import json
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distributed_aco.core.cidade import Cidade
+from distributed_aco.core.sintonia import (ESPACO_PADRAO, Corrida, _postos,
+                                           amostrar_configuracoes, avaliar_configuracao)
+from distributed_aco.network.tuner import TuningCoordinator, carregar_classes
+
+
+def _cidades(n=6):
+    return [Cidade(i, (i * 37) % 100, (i * 61) % 100) for i in range(n)]
+
+
+def test_amostrar_configuracoes_respeita_o_espaco():
+    configs = amostrar_configuracoes(30, random.Random(1))
+    assert len(configs) == 30
+    for cfg in configs:
+        for nome, (lo, hi, escala) in ESPACO_PADRAO.items():
+            assert lo <= cfg[nome] <= hi
+        assert isinstance(cfg["num_formigas"], int)
+
+
+def test_postos_com_empate():
+    assert _postos([3.0, 1.0, 3.0, 2.0]) == [3.5, 1.0, 3.5, 2.0]
+
+
+def test_avaliar_configuracao_e_deterministica():
+    cfg = {"alpha": 1.0, "beta": 3.0, "rho": 0.1, "Q": 100.0, "num_formigas": 5}
+    a = avaliar_configuracao(_cidades(), cfg, 5, seed=3)
+    b = avaliar_configuracao(_cidades(), cfg, 5, seed=3)
+    assert a == b < float("inf")
+
+
+def test_corrida_elimina_configuracao_sempre_pior():
+    configs = [{"id": i} for i in range(4)]
+    corrida = Corrida(configs, min_instancias=3)
+    for _ in range(2):
+        assert corrida.registrar({0: 10.0, 1: 11.0, 2: 12.0, 3: 99.0}) == []
+    for _ in range(6):
+        corrida.registrar({0: 10.0, 1: 11.0, 2: 12.0, 3: 99.0})
+    assert 3 not in corrida.vivas
+    assert corrida.melhor() == (0, {"id": 0})
+
+
+def test_busca_aleatoria_nao_elimina():
+    corrida = Corrida([{}, {}], min_instancias=1, eliminar=False)
+    for _ in range(10):
+        corrida.registrar({0: 1.0, 1: 100.0})
+    assert corrida.vivas == [0, 1]
+
+
+def test_carregar_classes(tmp_path):
+    (tmp_path / "urbano").mkdir()
+    inst = {"cidades": [c.to_dict() for c in _cidades(5)]}
+    (tmp_path / "urbano" / "a.json").write_text(json.dumps(inst))
+    (tmp_path / "solto.json").write_text(json.dumps(inst))
+    (tmp_path / "rural.json").write_text(json.dumps({**inst, "classe": "rural"}))
+    classes = carregar_classes(str(tmp_path))
+    assert sorted(classes) == ["geral", "rural", "urbano"]
+    assert len(classes["urbano"][0][1]) == 5
+
+
+def test_tuning_coordinator_distribui_e_salva(tmp_path):
+    (tmp_path / "inst").mkdir()
+    for k in range(2):
+        (tmp_path / "inst" / f"i{k}.json").write_text(
+            json.dumps({"cidades": [c.to_dict() for c in _cidades(5 + k)]}))
+    saida = tmp_path / "saida.json"
+    coord = TuningCoordinator(str(tmp_path / "inst"), num_configs=3, orcamento=2,
+                              saida=str(saida), seed=7)
+    coord.running = True
+    coord.clients = {"w1": MagicMock(), "w2": MagicMock()}
+
+    enviados = []
+
+    def envia(node_id, msg):
+        enviados.append((node_id, msg))
+        res = {idx: float(int(idx) + 1) for idx in msg["configs"]}
+        coord.iter_results[node_id] = {"node_id": node_id, "resultados": res}
+        return True
+
+    with patch.object(coord, '_send_to', side_effect=envia), \
+         patch.object(coord, '_wait_results'):
+        coord._solve()
+
+    assert {n for n, _ in enviados} == {"w1", "w2"}
+    resultado = json.loads(saida.read_text())
+    assert resultado["geral"]["melhor"] == coord.resultado["geral"]["melhor"]
+    assert resultado["geral"]["passos"] == 2
+
+
+def test_tuning_coordinator_sem_workers_avalia_localmente(tmp_path):
+    (tmp_path / "inst").mkdir()
+    (tmp_path / "inst" / "i.json").write_text(json.dumps({"cidades": [c.to_dict() for c in _cidades(5)]}))
+    coord = TuningCoordinator(str(tmp_path / "inst"), num_configs=2, orcamento=2, seed=1)
+    coord.running = True
+    configs = {0: {"alpha": 1.0, "beta": 2.0}, 1: {"alpha": 2.0, "beta": 3.0}}
+    resultados = coord._avaliar(_cidades(5), configs, seed=3)
+    assert resultados == {i: avaliar_configuracao(_cidades(5), cfg, 2, seed=3) for i, cfg in configs.items()}
@@ -0,0 +1,67 @@
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distributed_aco.network.coordinator import Coordinator
+from distributed_aco.network.topology import origens
+
+WORKERS = ["w3", "w1", "w2", "w4"]
+
+
+def test_topologia_anel():
+    assert origens(WORKERS, "anel") == {"w1": ["w4"], "w2": ["w1"], "w3": ["w2"], "w4": ["w3"]}
+
+
+def test_topologia_completa_e_hub():
+    completa = origens(WORKERS, "completa")
+    assert completa["w1"] == ["w2", "w3", "w4"]
+    hub = origens(WORKERS, "hub")
+    assert hub["w1"] == ["w2", "w3", "w4"]
+    assert hub["w2"] == hub["w3"] == hub["w4"] == ["w1"]
+
+
+def test_topologia_aleatoria():
+    mapa = origens(WORKERS, "aleatoria", k=2, rng=random.Random(0))
+    for receptor, emissores in mapa.items():
+        assert len(emissores) == 2 and receptor not in emissores
+
+
+def test_topologia_invalida_e_worker_unico():
+    assert origens(["w1"], "anel") == {"w1": []}
+    with pytest.raises(ValueError):
+        origens(WORKERS, "estrela")
+
+
+def test_coordinator_migra_elite_pelo_anel():
+    coordinator = Coordinator(cooperacao="ilhas", topologia="anel", tamanho_elite=2)
+    rota = lambda d: {"distancia": d, "caminho": [0, 1, 2]}
+    coordinator.iter_results = {
+        "w1": {"elite": [rota(10), rota(12), rota(15)]},
+        "w2": {"elite": [rota(20)]},
+    }
+    with patch.object(coordinator, '_send_to') as mock_send:
+        coordinator._migrate()
+    enviados = {c.args[0]: c.args[1] for c in mock_send.call_args_list}
+    assert enviados["w2"] == {"tipo": "migracao", "rotas": [rota(10), rota(12)]}
+    assert enviados["w1"] == {"tipo": "migracao", "rotas": [rota(20)]}
+
+
+@patch('distributed_aco.network.coordinator.Coordinator._broadcast')
+def test_coordinator_ilhas_nao_envia_matriz(mock_broadcast):
+    coordinator = Coordinator(max_iters=2, cooperacao="ilhas", intervalo_migracao=1)
+    coordinator.running = True
+    coordinator.clients = {"w1": MagicMock(), "w2": MagicMock()}
+    resultado = lambda w, d: {'melhor_distancia': d, 'node_id': w, 'melhor_caminho': [0, 1],
+                              'feromonios': [], 'elite': [{"distancia": d, "caminho": [0, 1]}]}
+
+    def popula(*args, **kwargs):
+        coordinator.iter_results = {'w1': resultado('w1', 10), 'w2': resultado('w2', 20)}
+
+    with patch.object(coordinator, '_wait_results', side_effect=popula), \
+         patch.object(coordinator, '_send_to') as mock_send:
+        coordinator._run()
+
+    assert mock_broadcast.call_args_list[0].args[0] == {"tipo": "executar_iteracao"}
+    assert mock_send.call_count == 4  # 2 migrações x 2 workers
+    assert coordinator.global_best['distance'] == 10